@@ -0,0 +1,22 @@
+"""Accredify Suite certificate rendering engine (no GUI dependencies)"""
+from .records import CertificateRecord, RenderAssets
+
+__all__ = [
+    "CertificateRecord",
+    "RenderAssets",
+    "render_certificate",
+    "TEMPLATES",
+    "DEFAULT_TEMPLATE",
+]
+
+
+def __getattr__(name):
+    # The renderer pulls in reportlab and qrcode, so it is only imported on
+    # first use; importing the package (as the GUI does at startup) stays cheap
+    if name == "render_certificate":
+        from .render import render_certificate
+        return render_certificate
+    if name in ("TEMPLATES", "DEFAULT_TEMPLATE"):
+        from . import templates
+        return getattr(templates, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
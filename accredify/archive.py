@@ -0,0 +1,98 @@
+"""Streaming ZIP/TAR archives for batch output"""
+import io
+import os
+import tarfile
+import time
+import zipfile
+
+
+# PDFs are already compressed, so archives store them as-is unless asked otherwise
+DEFAULT_COMPRESSION = "store"
+
+ARCHIVE_EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz")
+
+
+def is_archive_path(path):
+    """True if the path names an archive format batches can write"""
+    return path.lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+def parse_compression(value):
+    """Compression setting from "store" or a level 0-9"""
+    if value in (None, "store"):
+        return "store"
+    level = int(value)
+    if not 0 <= level <= 9:
+        raise ValueError(f"Compression level must be 0-9 or 'store': {value}")
+    return "store" if level == 0 else level
+
+
+class ArchiveWriter:
+    """Appends members to a ZIP or TAR archive as they arrive
+
+    The format comes from the file extension: .zip, .tar, or .tar.gz/.tgz.
+    compression is "store" or a level 1-9: the deflate level for ZIP, the
+    gzip level for .tar.gz (which is always gzipped, at level 6 unless
+    given). A plain .tar can only store. Each member is written once,
+    straight from memory; nothing is staged on disk. Names already used
+    get a numbered suffix so no member shadows another.
+    """
+
+    def __init__(self, path, compression=DEFAULT_COMPRESSION, fmt_path=None):
+        self.path = path
+        self.compression = parse_compression(compression)
+        self._names = set()
+        # fmt_path names the final archive when path is a temporary file
+        lower = (fmt_path or path).lower()
+        if lower.endswith(".zip"):
+            self._tar = None
+            if self.compression == "store":
+                self._zip = zipfile.ZipFile(path, "w", zipfile.ZIP_STORED)
+            else:
+                self._zip = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED,
+                                            compresslevel=self.compression)
+        elif lower.endswith((".tar", ".tar.gz", ".tgz")):
+            self._zip = None
+            gzipped = lower.endswith((".tar.gz", ".tgz"))
+            if gzipped:
+                level = 6 if self.compression == "store" else self.compression
+                self._tar = tarfile.open(path, "w:gz", compresslevel=level)
+            elif self.compression == "store":
+                self._tar = tarfile.open(path, "w")
+            else:
+                raise ValueError("Compressed TAR archives need a .tar.gz or .tgz name")
+        else:
+            raise ValueError(f"Unsupported archive type: {fmt_path or path}")
+
+    def unique_name(self, name):
+        """name, or name with a _2, _3... suffix if it is already in the archive"""
+        stem, ext = os.path.splitext(name)
+        candidate, n = name, 1
+        while candidate in self._names:
+            n += 1
+            candidate = f"{stem}_{n}{ext}"
+        return candidate
+
+    def add(self, name, data):
+        """Write one member; returns the name it was stored under"""
+        name = self.unique_name(name)
+        self._names.add(name)
+        if self._zip is not None:
+            info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+            info.compress_type = self._zip.compression
+            self._zip.writestr(info, data, compresslevel=self._zip.compresslevel)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            self._tar.addfile(info, io.BytesIO(data))
+        return name
+
+    def close(self):
+        (self._zip or self._tar).close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
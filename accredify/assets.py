@@ -0,0 +1,122 @@
+"""Process-wide cache of decoded logo and signature images"""
+import os
+import threading
+from collections import OrderedDict
+
+from PIL import Image
+
+
+# Upper bound on decoded pixel data kept in memory
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def asset_fingerprint(path):
+    """Identify an uploaded file by path, modification time and size"""
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return (path, None, None)
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+
+class AssetCache:
+    """Thread-safe LRU of decoded images keyed by path, mtime and target size
+
+    Entries are decoded once and handed out for every certificate, so a
+    batch or a typing session in the preview stops re-reading the same
+    handful of files. A changed file gets a new mtime and so a new entry.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def image(self, path, size=None):
+        """Decoded PIL image, shrunk to fit size (w, h) pixels if given"""
+        return self._get("image", path, size, self._decode)
+
+    def reader(self, path, size=None):
+        """reportlab ImageReader ready to embed, shrunk to fit size if given"""
+        return self._get("reader", path, size, self._load_reader)
+
+    @staticmethod
+    def _needs_shrink(img, size):
+        return size and (img.width > size[0] or img.height > size[1])
+
+    def _decode(self, path, size):
+        img = Image.open(path)
+        img.load()
+        if self._needs_shrink(img, size):
+            img.thumbnail(size, Image.Resampling.LANCZOS)
+        return img
+
+    def _load_reader(self, path, size):
+        # reportlab is only needed once something is rendered, not for thumbnails
+        from reportlab.lib.utils import ImageReader
+
+        with Image.open(path) as img:
+            shrink = self._needs_shrink(img, size)
+        if shrink:
+            return ImageReader(self._decode(path, size))
+        # Read from the file so JPEGs are embedded as-is rather than re-encoded
+        reader = ImageReader(path)
+        reader.getRGBData()
+        return reader
+
+    def _get(self, kind, path, size, load):
+        stat = os.stat(path)
+        key = (kind, path, stat.st_mtime_ns, stat.st_size, tuple(size) if size else None)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = load(path, size)
+        nbytes = self._estimate_bytes(value)
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (value, nbytes)
+                self._bytes += nbytes
+                while self._bytes > self.max_bytes and len(self._entries) > 1:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self._bytes -= evicted
+                    self.evictions += 1
+        return value
+
+    @staticmethod
+    def _estimate_bytes(value):
+        if isinstance(value, Image.Image):
+            return value.width * value.height * len(value.getbands())
+        width, height = value.getSize()
+        return width * height * 4
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def clear(self):
+        """Drop every cached image and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+
+image_cache = AssetCache()
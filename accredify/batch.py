@@ -0,0 +1,397 @@
+"""Batch rendering: a pool of worker processes, one multi-page PDF, or an archive"""
+import json
+import os
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from reportlab.pdfgen import canvas
+
+from .archive import DEFAULT_COMPRESSION, ArchiveWriter
+from .manifest import BatchManifest, atomic_write, row_hash
+from .paths import OutputPaths
+from .records import RenderAssets, VerificationIdChecker, verification_id
+from .registry import output_hash
+from .render import render_certificate
+from .templates import TEMPLATES, DEFAULT_TEMPLATE
+from .timing import stage_timers, timed
+from .writer import DEFAULT_FSYNC_EVERY, DEFAULT_WRITE_QUEUE, DEFAULT_WRITERS, FileWriter
+
+
+# Outcome of a batch run; failures holds (row index, name, error message),
+# skipped counts rows a resumed run found already done (included in
+# success_count) and cancelled is set if the run was stopped early
+BatchResult = namedtuple(
+    "BatchResult", ["success_count", "total", "failures", "skipped", "cancelled"], defaults=(0, False)
+)
+
+# Rows handed to a worker per task, to keep inter-process chatter low
+DEFAULT_CHUNKSIZE = 8
+
+# Per-process render settings, set once by the pool initializer
+_worker_template = DEFAULT_TEMPLATE
+_worker_assets = RenderAssets()
+
+
+def default_workers():
+    """Number of worker processes used when none is configured"""
+    return os.cpu_count() or 1
+
+
+def _init_worker(template, assets):
+    """Remember the template and assets the worker entry points render with"""
+    global _worker_template, _worker_assets
+    _worker_template = template
+    _worker_assets = assets
+
+
+def _init_worker_process(template, assets):
+    """Pool initializer: set up a fresh worker process"""
+    _init_worker(template, assets)
+    # A forked worker starts with a copy of the parent's timings; only report its own
+    stage_timers.reset()
+
+
+def _render_row_bytes(index, record, output_name):
+    """Render one row in memory; returns (index, error message or None, PDF bytes, verification ID)"""
+    try:
+        pdf = render_certificate(record, template=_worker_template, assets=_worker_assets)
+        return index, None, pdf, verification_id(record)
+    except Exception as e:
+        return index, str(e), b"", None
+
+
+def _render_chunk_bytes(jobs):
+    """Render a chunk of (index, record, output path or member name) jobs in order, in memory"""
+    return [_render_row_bytes(*job) for job in jobs]
+
+
+def _timed_chunk(render_chunk, jobs):
+    """Run render_chunk in a worker process; returns (results, stage timings since the last chunk)"""
+    results = render_chunk(jobs)
+    return results, stage_timers.drain()
+
+
+def _checked(jobs):
+    """Pass (index, record, ...) jobs through, failing on the first verification ID collision"""
+    checker = VerificationIdChecker()
+    for job in jobs:
+        checker.check(job[0], job[1])
+        yield job
+
+
+def _chunks(jobs, size):
+    """Group jobs into lists of at most size items"""
+    chunk = []
+    for job in jobs:
+        chunk.append(job)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _run_in_order(jobs, render_chunk, template, assets, workers, chunksize, cancel=None):
+    """Yield (chunk, results) for every chunk of jobs, in input order
+
+    With one worker the chunks are rendered in this process, still through
+    the worker entry points; otherwise across a process pool with a
+    bounded window of chunks in flight. Once cancel (a threading.Event)
+    is set, no further chunks start: queued ones are cancelled and only
+    those already running are waited for. Stage timings from worker
+    processes are merged into this process's stage_timers.
+    """
+    def cancelled():
+        return cancel is not None and cancel.is_set()
+
+    def collect(future):
+        results, timings = future.result()
+        stage_timers.merge(timings)
+        return results
+
+    if workers == 1:
+        _init_worker(template, assets)
+        for chunk in _chunks(jobs, chunksize):
+            if cancelled():
+                return
+            yield chunk, render_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker_process,
+                             initargs=(template, assets)) as pool:
+        pending = deque()
+        for chunk in _chunks(jobs, chunksize):
+            if cancelled():
+                break
+            pending.append((chunk, pool.submit(_timed_chunk, render_chunk, chunk)))
+            if len(pending) >= workers * 2:
+                chunk, future = pending.popleft()
+                yield chunk, collect(future)
+        while pending:
+            if cancelled():
+                for _, future in pending:
+                    future.cancel()
+                return
+            chunk, future = pending.popleft()
+            yield chunk, collect(future)
+
+
+def render_batch(records, output_dir, template=DEFAULT_TEMPLATE, assets=None,
+                 workers=None, chunksize=DEFAULT_CHUNKSIZE, on_progress=None, total=None,
+                 resume=False, registry=None, cancel=None, paths=None,
+                 writers=DEFAULT_WRITERS, write_queue=DEFAULT_WRITE_QUEUE,
+                 fsync_every=DEFAULT_FSYNC_EVERY):
+    """Render every record into output_dir, fanning rows out to worker processes
+
+    File names are derived from the records alone, so output is the same
+    whatever the worker count. paths, an OutputPaths, lays files out in
+    subdirectories (by course, date or hash shard, say); each directory
+    is made once, here, before the first row in it is handed to a worker.
+    records may be any iterable (such as a streamed roster); it is consumed
+    as rendering proceeds, so only the chunks in flight are held in memory.
+    Verification IDs are checked as rows are read, and the first row whose
+    ID clashes with an earlier, different certificate stops the batch with
+    ValueError; rows before it are kept and can be resumed.
+    on_progress(done, total, record) is called in this process after each
+    row; total is len(records) if it has one, else the total passed in.
+
+    Workers only render: the PDFs come back to this process and a
+    FileWriter's writer threads put them on disk, so rendering carries on
+    while a slow share accepts each file. At most write_queue PDFs wait
+    for a writer before rendering pauses. Each PDF is written under a
+    temporary name and renamed into place, then recorded in the
+    directory's manifest; with fsync_every, files are synced in batches
+    of that many and only recorded once synced. With resume=True, rows
+    the manifest lists whose file is still intact are skipped, so an
+    interrupted batch picks up where it stopped. Certificates rendered are
+    recorded in registry, a VerificationRegistry, if one is given. Setting
+    cancel (a threading.Event) stops the batch after the rows in flight;
+    the files already written stay, and can be resumed later.
+    """
+    assets = assets or RenderAssets()
+    workers = workers or default_workers()
+    if total is None and hasattr(records, '__len__'):
+        total = len(records)
+
+    success_count = 0
+    skipped = 0
+    failures = []
+    done = 0
+
+    with BatchManifest(output_dir, resume=resume) as manifest, \
+            FileWriter(writers, write_queue, fsync_every) as writer:
+        def report(record):
+            nonlocal done
+            done += 1
+            if on_progress:
+                on_progress(done, total, record)
+
+        def pending_jobs():
+            nonlocal success_count, skipped
+            made = set()
+            for index, record, relpath in _checked((paths or OutputPaths()).assign(records)):
+                output_path = os.path.join(output_dir, relpath)
+                directory = os.path.dirname(output_path)
+                if directory not in made:
+                    os.makedirs(directory, exist_ok=True)
+                    made.add(directory)
+                if resume and manifest.is_done(row_hash(template, assets, record), output_path):
+                    success_count += 1
+                    skipped += 1
+                    report(record)
+                    continue
+                yield index, record, output_path
+
+        def written(results):
+            nonlocal success_count
+            for (index, record, cert_id), output_path, nbytes, digest, error in results:
+                if error is None:
+                    success_count += 1
+                    manifest.record(index, row_hash(template, assets, record), output_path, nbytes)
+                    if registry is not None:
+                        registry.add(cert_id, record, template, digest, manifest.relative(output_path))
+                else:
+                    failures.append((index, record.name, error))
+                report(record)
+            manifest.flush(sync=bool(fsync_every))
+
+        try:
+            for chunk, results in _run_in_order(pending_jobs(), _render_chunk_bytes, template, assets,
+                                                workers, chunksize, cancel):
+                for (index, record, output_path), (_, error, pdf, cert_id) in zip(chunk, results):
+                    if error is None:
+                        writer.submit(output_path, pdf, (index, record, cert_id))
+                    else:
+                        failures.append((index, record.name, error))
+                        report(record)
+                written(writer.completed())
+        finally:
+            # Files already on disk are recorded even if the batch stops with
+            # an error, so resuming skips them
+            written(writer.close())
+
+    if registry is not None:
+        registry.flush()
+    # Writes finish out of order; report failures in row order
+    failures.sort(key=lambda failure: failure[0])
+    return BatchResult(success_count, done, failures, skipped, bool(cancel and cancel.is_set()))
+
+
+def page_index_path(output_path):
+    """Sidecar index file written next to a multi-page batch PDF or archive
+
+    The extension is kept, so all.pdf and all.zip get indexes of their own.
+    """
+    return output_path + ".index.json"
+
+
+def render_batch_document(records, output_path, template=DEFAULT_TEMPLATE, assets=None,
+                          on_progress=None, total=None, registry=None, cancel=None):
+    """Render every record as one page of a single PDF
+
+    The static layer (including logo and signature) is embedded once and
+    painted on every page. A sidecar JSON index maps verification IDs and
+    recipient names to page numbers so one certificate can be found
+    without opening the PDF. records may be any iterable and is consumed
+    as pages are drawn; a verification ID collision raises ValueError and
+    no document is written. If registry is given, each page is recorded in
+    it with the hash of the finished document. If cancel (a
+    threading.Event) is set, the run stops and no document is written.
+    """
+    if template not in TEMPLATES:
+        raise ValueError(f"Unknown template: {template}")
+    certificate = TEMPLATES[template]
+    assets = assets or RenderAssets()
+    if total is None and hasattr(records, '__len__'):
+        total = len(records)
+
+    # Written under a temporary name and renamed once complete
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    c = canvas.Canvas(tmp_path, pagesize=certificate.pagesize)
+    success_count = 0
+    failures = []
+    pages = []
+    issued = []
+
+    for index, record in _checked(enumerate(records)):
+        if cancel is not None and cancel.is_set():
+            return BatchResult(0, success_count + len(failures), failures, cancelled=True)
+        mark = len(c._code)
+        c.saveState()
+        try:
+            certificate.draw_page(c, record, assets)
+            c.restoreState()
+            c.showPage()
+            success_count += 1
+            pages.append({"page": success_count, "name": record.name, "id": verification_id(record)})
+            if registry is not None:
+                issued.append((pages[-1]["id"], record))
+        except Exception as e:
+            # Drop the half-drawn page so the next record starts clean
+            c.restoreState()
+            del c._code[mark:]
+            failures.append((index, record.name, str(e)))
+        if on_progress:
+            on_progress(index + 1, total, record)
+
+    if success_count:
+        with timed("canvas_save"):
+            c.save()
+        os.replace(tmp_path, output_path)
+        if registry is not None:
+            with open(output_path, 'rb') as f:
+                digest = output_hash(f.read())
+            for cert_id, record in issued:
+                registry.add(cert_id, record, template, digest, os.path.basename(output_path))
+            registry.flush()
+
+        by_name = {}
+        for entry in pages:
+            by_name.setdefault(entry["name"], []).append(entry["page"])
+        atomic_write(page_index_path(output_path), json.dumps({
+            "file": os.path.basename(output_path),
+            "template": template,
+            "pages": pages,
+            "by_id": {entry["id"]: entry["page"] for entry in pages},
+            "by_name": by_name,
+        }).encode('utf-8'))
+
+    return BatchResult(success_count, success_count + len(failures), failures)
+
+
+def render_batch_archive(records, archive_path, template=DEFAULT_TEMPLATE, assets=None,
+                         workers=None, chunksize=DEFAULT_CHUNKSIZE, on_progress=None, total=None,
+                         compression=DEFAULT_COMPRESSION, registry=None, cancel=None, paths=None):
+    """Render every record straight into a ZIP or TAR archive
+
+    Workers render PDFs in memory and this process appends them to the
+    archive in input order, so each certificate is written to disk once.
+    compression is "store" (the default; PDFs are already compressed) or
+    a level 1-9. A sidecar JSON index maps verification IDs and recipient
+    names to archive members. Certificates are recorded in registry, if
+    given, with their member name as output. paths, an OutputPaths, sets
+    member names, which may include directories. A verification ID
+    collision raises ValueError and no archive is kept. If cancel (a
+    threading.Event) is set, the run stops after the rows in flight and
+    no archive is kept.
+    """
+    if template not in TEMPLATES:
+        raise ValueError(f"Unknown template: {template}")
+    assets = assets or RenderAssets()
+    workers = workers or default_workers()
+    if total is None and hasattr(records, '__len__'):
+        total = len(records)
+
+    success_count = 0
+    failures = []
+    members = []
+    issued = []
+    done = 0
+
+    jobs = _checked((paths or OutputPaths()).assign(records))
+    # Written under a temporary name and renamed once complete
+    tmp_path = f"{archive_path}.{os.getpid()}.tmp"
+    try:
+        with ArchiveWriter(tmp_path, compression, fmt_path=archive_path) as archive:
+            for chunk, results in _run_in_order(jobs, _render_chunk_bytes, template, assets,
+                                                workers, chunksize, cancel):
+                for (index, record, member_name), (_, error, pdf, cert_id) in zip(chunk, results):
+                    done += 1
+                    if error is None:
+                        success_count += 1
+                        member = archive.add(member_name, pdf)
+                        members.append({"member": member, "name": record.name, "id": cert_id})
+                        if registry is not None:
+                            issued.append((cert_id, record, output_hash(pdf), member))
+                    else:
+                        failures.append((index, record.name, error))
+                    if on_progress:
+                        on_progress(done, total, record)
+        if cancel is not None and cancel.is_set():
+            os.remove(tmp_path)
+            return BatchResult(0, done, failures, cancelled=True)
+        os.replace(tmp_path, archive_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    if registry is not None:
+        for cert_id, record, digest, member in issued:
+            registry.add(cert_id, record, template, digest, member)
+        registry.flush()
+
+    by_name = {}
+    for entry in members:
+        by_name.setdefault(entry["name"], []).append(entry["member"])
+    atomic_write(page_index_path(archive_path), json.dumps({
+        "file": os.path.basename(archive_path),
+        "template": template,
+        "members": members,
+        "by_id": {entry["id"]: entry["member"] for entry in members},
+        "by_name": by_name,
+    }).encode('utf-8'))
+
+    return BatchResult(success_count, done, failures)
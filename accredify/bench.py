@@ -0,0 +1,303 @@
+"""Headless performance benchmarks, with JSON results and baseline comparison"""
+import csv
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from io import BytesIO
+
+from PIL import Image, ImageDraw
+from reportlab.pdfgen import canvas
+
+from .batch import render_batch
+from .preview import (
+    PREVIEW_ZOOM_MAX, PREVIEW_ZOOM_MIN, PREVIEW_ZOOM_STEP, PreviewCache, PreviewRequest, render_preview
+)
+from .qr import draw_qr_code
+from .records import CertificateRecord, RenderAssets, verification_id
+from .render import render_certificate
+from .roster import open_roster
+from .templates import TEMPLATES, DEFAULT_TEMPLATE
+
+
+# Timed runs per measurement; the median is reported
+DEFAULT_REPEAT = 5
+
+# Synthetic roster sizes for the batch throughput runs
+DEFAULT_BATCH_SIZES = (1000, 10000, 100000)
+
+# Side of the QR code the templates draw, in points
+QR_SIZE = 80
+
+# Slowdown over the baseline, as a fraction, that counts as a regression
+DEFAULT_TOLERANCE = 0.15
+
+SUITES = ("startup", "templates", "qr", "preview", "batch")
+
+# Engine modules the GUI imports before its window appears
+STARTUP_MODULES = (
+    "accredify", "accredify.assets", "accredify.paths", "accredify.preview", "accredify.records",
+    "accredify.registry", "accredify.timing",
+)
+
+# Slow-loading dependencies none of STARTUP_MODULES may import
+HEAVY_MODULES = ("pandas", "openpyxl", "reportlab", "qrcode", "pdf2image", "pypdfium2")
+
+# Run in a fresh interpreter: import the startup modules, then render a first preview
+_STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+{imports}
+imported = time.perf_counter()
+heavy = [name for name in {heavy!r} if name in sys.modules]
+from accredify import CertificateRecord, RenderAssets
+from accredify.preview import PreviewCache, PreviewRequest, render_preview
+request = PreviewRequest(CertificateRecord(*{record!r}), {template!r}, RenderAssets(*{assets!r}), 1.0)
+render_preview(request, cache=PreviewCache())
+print(json.dumps([imported - start, time.perf_counter() - start, heavy]))
+"""
+
+BENCH_RECORD = CertificateRecord(
+    name="Alexandra Montgomery-Okafor",
+    course="Advanced Data Engineering and Distributed Systems",
+    date="2024-06-15",
+    description="Awarded for completing 40 hours of coursework",
+)
+
+
+def preview_zoom_levels():
+    """Every zoom level the preview offers, smallest first"""
+    steps = round((PREVIEW_ZOOM_MAX - PREVIEW_ZOOM_MIN) / PREVIEW_ZOOM_STEP)
+    return [round(PREVIEW_ZOOM_MIN + i * PREVIEW_ZOOM_STEP, 2) for i in range(steps + 1)]
+
+
+def _metric(value, unit, better="lower"):
+    return {"value": value, "unit": unit, "better": better}
+
+
+def _time_ms(func, repeat):
+    """Median wall time of func() in milliseconds, after one untimed warm-up call"""
+    result = func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def make_bench_assets(directory):
+    """Write a synthetic logo (PNG) and signature (JPEG) and return them as RenderAssets"""
+    logo_path = os.path.join(directory, "bench_logo.png")
+    logo = Image.new("RGBA", (600, 600), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(logo)
+    draw.ellipse((20, 20, 580, 580), fill=(26, 82, 118, 255))
+    draw.rectangle((200, 200, 400, 400), fill=(241, 196, 15, 255))
+    logo.save(logo_path)
+
+    signature_path = os.path.join(directory, "bench_signature.jpg")
+    signature = Image.new("RGB", (900, 300), "white")
+    draw = ImageDraw.Draw(signature)
+    draw.line([(40, 220), (200, 80), (330, 230), (480, 90), (650, 210), (860, 120)],
+              fill="black", width=8)
+    signature.save(signature_path, quality=90)
+    return RenderAssets(logo_path=logo_path, signature_path=signature_path)
+
+
+def write_synthetic_roster(path, rows):
+    """Write a CSV roster of rows distinct participants"""
+    courses = ["Data Science Fundamentals", "Project Management", "Cloud Architecture",
+               "Machine Learning in Practice", "Technical Writing"]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Name", "Course", "Date", "Description"])
+        for i in range(rows):
+            writer.writerow([
+                f"Participant {i + 1:06d}",
+                courses[i % len(courses)],
+                f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+                "Completed all modules" if i % 3 else "",
+            ])
+
+
+def bench_startup(assets, repeat=DEFAULT_REPEAT, template=DEFAULT_TEMPLATE):
+    """Cold import time of the GUI's startup modules, and time to the first preview, in a fresh process"""
+    script = _STARTUP_SCRIPT.format(
+        imports="\n".join(f"import {module}" for module in STARTUP_MODULES),
+        heavy=HEAVY_MODULES,
+        record=tuple(BENCH_RECORD),
+        template=template,
+        assets=tuple(assets),
+    )
+    env = dict(os.environ)
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+    imports, previews, heavy = [], [], []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", script], env=env, check=True,
+                                capture_output=True, text=True).stdout
+        imported, previewed, heavy = json.loads(output.splitlines()[-1])
+        imports.append(imported * 1000)
+        previews.append(previewed * 1000)
+    return {
+        "startup/import_ms": _metric(statistics.median(imports), "ms"),
+        "startup/first_preview_ms": _metric(statistics.median(previews), "ms"),
+        "startup/heavy_modules": _metric(len(heavy), "modules"),
+    }
+
+
+def bench_templates(assets, repeat=DEFAULT_REPEAT):
+    """Render time and PDF size for every template"""
+    results = {}
+    for name in TEMPLATES:
+        ms, pdf = _time_ms(lambda: render_certificate(BENCH_RECORD, template=name, assets=assets), repeat)
+        results[f"templates/{name}/render_ms"] = _metric(ms, "ms")
+        results[f"templates/{name}/pdf_bytes"] = _metric(len(pdf), "bytes")
+    return results
+
+
+def _qr_pdf(data, logo_path=None):
+    """A page holding only a QR code, drawn by draw_qr_code as the templates draw it"""
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=(QR_SIZE, QR_SIZE))
+    draw_qr_code(c, data, 0, 0, QR_SIZE, logo_path=logo_path)
+    c.save()
+    return buffer.getvalue()
+
+
+def bench_qr(assets, repeat=DEFAULT_REPEAT):
+    """draw_qr_code latency, page saved, and PDF size, with and without a centre logo"""
+    data = f"Verify at: https://accredify.com/verify/{verification_id(BENCH_RECORD)}"
+    plain, plain_pdf = _time_ms(lambda: _qr_pdf(data), repeat)
+    with_logo, logo_pdf = _time_ms(lambda: _qr_pdf(data, assets.logo_path), repeat)
+    return {
+        "qr/plain_ms": _metric(plain, "ms"),
+        "qr/plain_pdf_bytes": _metric(len(plain_pdf), "bytes"),
+        "qr/logo_ms": _metric(with_logo, "ms"),
+        "qr/logo_pdf_bytes": _metric(len(logo_pdf), "bytes"),
+    }
+
+
+def bench_preview(assets, repeat=DEFAULT_REPEAT, zooms=None, template=DEFAULT_TEMPLATE):
+    """End-to-end preview latency (render and rasterise, no cache) at each zoom level"""
+    results = {}
+    for zoom in zooms or preview_zoom_levels():
+        request = PreviewRequest(BENCH_RECORD, template, assets, zoom)
+        # A fresh cache per call, so every run renders and rasterises
+        ms, _ = _time_ms(lambda: render_preview(request, cache=PreviewCache()), repeat)
+        results[f"preview/{zoom:g}x_ms"] = _metric(ms, "ms")
+    return results
+
+
+def bench_batch(assets, sizes=DEFAULT_BATCH_SIZES, workers=None, template=DEFAULT_TEMPLATE):
+    """Batch throughput, roster read to PDFs on disk, for synthetic rosters of each size"""
+    results = {}
+    for rows in sizes:
+        directory = tempfile.mkdtemp(prefix="accredify-bench-")
+        try:
+            roster_path = os.path.join(directory, "roster.csv")
+            output_dir = os.path.join(directory, "out")
+            os.makedirs(output_dir)
+            write_synthetic_roster(roster_path, rows)
+            start = time.perf_counter()
+            result = render_batch(open_roster(roster_path), output_dir, template=template,
+                                  assets=assets, workers=workers, total=rows)
+            seconds = time.perf_counter() - start
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        if result.failures:
+            raise RuntimeError(f"Batch benchmark had {len(result.failures)} failed rows: "
+                               f"{result.failures[0][2]}")
+        results[f"batch/{rows}/seconds"] = _metric(seconds, "s")
+        results[f"batch/{rows}/certs_per_sec"] = _metric(rows / seconds, "certs/s", better="higher")
+    return results
+
+
+def run_benchmarks(suites=SUITES, repeat=DEFAULT_REPEAT, batch_sizes=DEFAULT_BATCH_SIZES,
+                   workers=None, zooms=None):
+    """Run the chosen suites and return a JSON-serialisable report"""
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        raise ValueError(f"Unknown benchmark suite: {', '.join(sorted(unknown))}")
+    metrics = {}
+    directory = tempfile.mkdtemp(prefix="accredify-bench-")
+    try:
+        assets = make_bench_assets(directory)
+        if "startup" in suites:
+            metrics.update(bench_startup(assets, repeat))
+        if "templates" in suites:
+            metrics.update(bench_templates(assets, repeat))
+        if "qr" in suites:
+            metrics.update(bench_qr(assets, repeat))
+        if "preview" in suites:
+            metrics.update(bench_preview(assets, repeat, zooms))
+        if "batch" in suites:
+            metrics.update(bench_batch(assets, batch_sizes, workers))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "repeat": repeat,
+        "metrics": metrics,
+    }
+
+
+def compare(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Metrics that got worse than the baseline by more than tolerance
+
+    Returns (name, baseline value, current value, change) tuples, where
+    change is the fractional slowdown (or shrinkage, for metrics where
+    higher is better). Metrics missing from either report are skipped.
+    """
+    regressions = []
+    for name, current in report["metrics"].items():
+        previous = baseline.get("metrics", {}).get(name)
+        if previous is None:
+            continue
+        if not previous["value"]:
+            # Nothing to scale against: any growth from zero is a regression
+            if current["value"] > 0 and current.get("better", "lower") == "lower":
+                regressions.append((name, previous["value"], current["value"], float("inf")))
+            continue
+        change = current["value"] / previous["value"] - 1
+        if current.get("better", "lower") == "higher":
+            change = -change
+        if change > tolerance:
+            regressions.append((name, previous["value"], current["value"], change))
+    return regressions
+
+
+def format_report(report, baseline=None):
+    """Human-readable table of a report, with the change against baseline if given"""
+    lines = []
+    previous = (baseline or {}).get("metrics", {})
+    width = max((len(name) for name in report["metrics"]), default=0)
+    for name, metric in report["metrics"].items():
+        value = metric["value"]
+        value = f"{value:>12d}" if isinstance(value, int) else f"{value:>12.2f}"
+        line = f"{name:<{width}}  {value} {metric['unit']}"
+        if name in previous and previous[name]["value"]:
+            line += f"  ({metric['value'] / previous[name]['value'] - 1:+.1%})"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def load_report(path):
+    """Read a report written by save_report"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_report(report, path):
+    """Write a report as JSON"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
@@ -0,0 +1,299 @@
+"""Command-line interface: python -m accredify <command>"""
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime
+
+from .archive import DEFAULT_COMPRESSION, parse_compression
+from .bench import (
+    DEFAULT_BATCH_SIZES, DEFAULT_REPEAT, DEFAULT_TOLERANCE, SUITES,
+    compare, format_report, load_report, run_benchmarks, save_report
+)
+from .batch import (
+    default_workers, page_index_path, render_batch, render_batch_archive, render_batch_document
+)
+from .paths import DEFAULT_PATH_TEMPLATE, DEFAULT_SHARD_DEPTH, DEFAULT_SHARD_FANOUT, OutputPaths
+from .preflight import describe_issue, preflight_roster
+from .records import CertificateRecord, RenderAssets, verification_id
+from .registry import VerificationRegistry, default_registry_path, output_hash
+from .render import render_certificate
+from .roster import missing_columns, open_roster
+from .templates import TEMPLATES, DEFAULT_TEMPLATE
+from .timing import stage_timers
+from .writer import DEFAULT_FSYNC_EVERY, DEFAULT_WRITERS
+
+
+def cmd_render(args):
+    """Render one certificate to a PDF file"""
+    record = CertificateRecord(
+        name=args.name,
+        course=args.course,
+        date=args.date,
+        description=args.description,
+    )
+    assets = RenderAssets(logo_path=args.logo, signature_path=args.signature)
+    pdf = render_certificate(record, template=args.template, assets=assets)
+
+    output_path = args.output or f"Certificate_{args.name.replace(' ', '_')}.pdf"
+    with open(output_path, 'wb') as f:
+        f.write(pdf)
+    print(f"Certificate saved: {os.path.abspath(output_path)}")
+
+    if args.registry:
+        with VerificationRegistry(args.registry) as registry:
+            registry.add(verification_id(record), record, args.template, output_hash(pdf),
+                         os.path.basename(output_path))
+    return 0
+
+
+def open_registry(args):
+    """The registry named on the command line, or None for --no-registry"""
+    return VerificationRegistry(args.registry) if args.registry else None
+
+
+def report_preflight(roster, template):
+    """Run the pre-flight check and print its issues; True if the roster is clean"""
+    report = preflight_roster(roster, template)
+    for issue in report.issues:
+        print(describe_issue(issue), file=sys.stderr)
+    rows = len({issue.row for issue in report.issues})
+    if rows:
+        print(f"Pre-flight check: {rows} of {report.rows} rows have problems.", file=sys.stderr)
+    else:
+        print(f"Pre-flight check: all {report.rows} rows OK.")
+    return not rows
+
+
+def cmd_preflight(args):
+    """Check a roster against a template without rendering anything"""
+    roster = open_roster(args.roster)
+    missing_cols = missing_columns(roster)
+    if missing_cols:
+        print(f"Error: Missing required columns: {', '.join(missing_cols)}", file=sys.stderr)
+        return 1
+    return 0 if report_preflight(roster, args.template) else 1
+
+
+def cmd_batch(args):
+    """Render one certificate per roster row into a directory"""
+    roster = open_roster(args.roster)
+    missing_cols = missing_columns(roster)
+    if missing_cols:
+        print(f"Error: Missing required columns: {', '.join(missing_cols)}", file=sys.stderr)
+        return 1
+    if args.preflight and not report_preflight(roster, args.template):
+        print("Nothing rendered; fix the roster or run without --preflight.", file=sys.stderr)
+        return 1
+
+    assets = RenderAssets(logo_path=args.logo, signature_path=args.signature)
+    paths = OutputPaths(args.path_template, args.shard_fanout, args.shard_depth)
+    registry = open_registry(args)
+    try:
+        if args.single_file:
+            result = render_batch_document(
+                roster,
+                args.single_file,
+                template=args.template,
+                assets=assets,
+                registry=registry,
+            )
+            if result.success_count:
+                print(f"Page index saved: {os.path.abspath(page_index_path(args.single_file))}")
+        elif args.archive:
+            result = render_batch_archive(
+                roster,
+                args.archive,
+                template=args.template,
+                assets=assets,
+                workers=args.workers,
+                compression=args.compression,
+                registry=registry,
+                paths=paths,
+            )
+            print(f"Archive saved: {os.path.abspath(args.archive)}")
+            print(f"Archive index saved: {os.path.abspath(page_index_path(args.archive))}")
+        else:
+            os.makedirs(args.output_dir, exist_ok=True)
+            result = render_batch(
+                roster,
+                args.output_dir,
+                template=args.template,
+                assets=assets,
+                workers=args.workers,
+                resume=args.resume,
+                registry=registry,
+                paths=paths,
+                writers=args.writers,
+                fsync_every=args.fsync_every,
+            )
+    finally:
+        if registry is not None:
+            registry.close()
+    if args.timings:
+        stage_timers.write(args.timings)
+        print(f"Stage timings saved: {os.path.abspath(args.timings)}")
+    for index, name, error in result.failures:
+        print(f"Error processing row {index + 1} ({name}): {error}", file=sys.stderr)
+    if result.skipped:
+        print(f"Skipped {result.skipped} certificates already generated by a previous run.")
+    print(f"Successfully generated {result.success_count} of {result.total} certificates.")
+    return 0 if not result.failures else 1
+
+
+def cmd_verify(args):
+    """Look certificates up in the verification registry"""
+    if not args.cert_id and not args.name:
+        print("Error: give a verification ID or --name", file=sys.stderr)
+        return 1
+    with VerificationRegistry(args.registry) as registry:
+        entries = registry.lookup(args.cert_id) if args.cert_id else registry.find_by_name(args.name)
+    if not entries:
+        print("No matching certificate found.")
+        return 1
+    for entry in entries:
+        print(f"{entry.cert_id}  {entry.name}  {entry.course}  {entry.date}  "
+              f"{entry.template}  {entry.output}  sha256:{entry.output_hash}  issued {entry.issued_at}")
+    return 0
+
+
+def cmd_bench(args):
+    """Run the performance benchmarks, optionally against a saved baseline"""
+    report = run_benchmarks(
+        suites=args.suites,
+        repeat=args.repeat,
+        batch_sizes=args.batch_sizes,
+        workers=args.workers,
+    )
+    baseline = load_report(args.baseline) if args.baseline else None
+    print(format_report(report, baseline))
+    if args.json:
+        save_report(report, args.json)
+        print(f"Results saved: {os.path.abspath(args.json)}")
+    if baseline is None:
+        return 0
+    regressions = compare(report, baseline, args.tolerance)
+    for name, before, after, change in regressions:
+        print(f"REGRESSION {name}: {before:.2f} -> {after:.2f} ({change:+.1%} worse)")
+    return 1 if regressions else 0
+
+
+def _comma_list(convert):
+    return lambda value: [convert(item) for item in value.split(",") if item]
+
+
+def add_registry_arguments(parser):
+    """--registry / --no-registry options shared by the rendering commands"""
+    parser.add_argument("--registry", default=default_registry_path(),
+                        help="verification registry database (default: %(default)s)")
+    parser.add_argument("--no-registry", dest="registry", action="store_const", const=None,
+                        help="do not record issued certificates")
+
+
+def build_parser():
+    """Build the argument parser for all subcommands"""
+    parser = argparse.ArgumentParser(
+        prog="accredify",
+        description="Accredify Suite - headless certificate generator",
+    )
+    parser.add_argument("--log-level", default="WARNING",
+                        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="logging verbosity (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    render = commands.add_parser("render", help="render a single certificate")
+    render.add_argument("--name", required=True, help="recipient name")
+    render.add_argument("--course", required=True, help="course or program title")
+    render.add_argument("--date", default=datetime.now().strftime("%Y-%m-%d"),
+                        help="completion date, yyyy-mm-dd (default: today)")
+    render.add_argument("--description", default="", help="optional description or credits")
+    render.add_argument("--template", default=DEFAULT_TEMPLATE, choices=list(TEMPLATES),
+                        help=f"template style (default: {DEFAULT_TEMPLATE})")
+    render.add_argument("--logo", default="", help="organization logo image")
+    render.add_argument("--signature", default="", help="signature image")
+    render.add_argument("-o", "--output", help="output PDF path (default: Certificate_<Name>.pdf)")
+    add_registry_arguments(render)
+    render.set_defaults(func=cmd_render)
+
+    batch = commands.add_parser("batch", help="render a certificate for every roster row")
+    batch.add_argument("roster", help="CSV or Excel file with Name, Course, Date[, Description] columns")
+    batch.add_argument("-o", "--output-dir", default=".", help="directory for the generated PDFs")
+    batch.add_argument("--template", default=DEFAULT_TEMPLATE, choices=list(TEMPLATES),
+                       help=f"template style (default: {DEFAULT_TEMPLATE})")
+    batch.add_argument("--logo", default="", help="organization logo image")
+    batch.add_argument("--signature", default="", help="signature image")
+    batch.add_argument("-j", "--workers", type=int, default=default_workers(),
+                       help="worker processes (default: one per CPU)")
+    batch.add_argument("--writers", type=int, default=DEFAULT_WRITERS, metavar="N",
+                       help="threads writing finished PDFs to disk while rendering continues "
+                            "(default: %(default)s)")
+    batch.add_argument("--fsync-every", type=int, default=DEFAULT_FSYNC_EVERY, metavar="N",
+                       help="sync written PDFs to disk in batches of N, recording them as done only "
+                            "once synced; 0 leaves it to the OS (default: %(default)s)")
+    batch.add_argument("--resume", action="store_true",
+                       help="skip rows a previous, interrupted run already rendered into the output directory")
+    batch.add_argument("--path-template", default=DEFAULT_PATH_TEMPLATE, metavar="TEMPLATE",
+                       help="where each PDF goes under the output directory or archive, built from "
+                            "{name}, {course}, {description}, {date}, {id}, {shard} and {file}, "
+                            "e.g. '{course}/{date:%%Y}/{id[:2]}/{name}.pdf' (default: %(default)s)")
+    batch.add_argument("--shard-fanout", type=int, default=DEFAULT_SHARD_FANOUT, metavar="N",
+                       help="directories per level of {shard} (default: %(default)s)")
+    batch.add_argument("--shard-depth", type=int, default=DEFAULT_SHARD_DEPTH, metavar="N",
+                       help="levels of {shard} directories (default: %(default)s)")
+    batch.add_argument("--single-file", metavar="PDF",
+                       help="write every certificate as a page of one PDF, with a .index.json page index")
+    batch.add_argument("--archive", metavar="FILE",
+                       help="stream every certificate into a .zip, .tar or .tar.gz archive, "
+                            "with a .index.json member index")
+    batch.add_argument("--compression", type=parse_compression, default=DEFAULT_COMPRESSION,
+                       help="archive compression: 'store' or a level 1-9 (default: store)")
+    batch.add_argument("--preflight", action="store_true",
+                       help="check every row against the template first and render nothing if any fail")
+    batch.add_argument("--timings", metavar="FILE",
+                       help="write per-stage render timings when the batch ends: "
+                            "JSON for a .json file, Prometheus text otherwise")
+    add_registry_arguments(batch)
+    batch.set_defaults(func=cmd_batch)
+
+    preflight = commands.add_parser("preflight", help="check a roster for rows that will not render cleanly")
+    preflight.add_argument("roster", help="CSV or Excel file with Name, Course, Date[, Description] columns")
+    preflight.add_argument("--template", default=DEFAULT_TEMPLATE, choices=list(TEMPLATES),
+                           help=f"template to check against (default: {DEFAULT_TEMPLATE})")
+    preflight.set_defaults(func=cmd_preflight)
+
+    verify = commands.add_parser("verify", help="look up issued certificates in the registry")
+    verify.add_argument("cert_id", nargs="?", help="verification ID printed on the certificate")
+    verify.add_argument("--name", help="look up by recipient name instead")
+    verify.add_argument("--registry", default=default_registry_path(),
+                        help="verification registry database (default: %(default)s)")
+    verify.set_defaults(func=cmd_verify)
+
+    bench = commands.add_parser("bench", help="measure rendering, preview and batch performance")
+    bench.add_argument("--suites", type=_comma_list(str), default=list(SUITES),
+                       help=f"comma-separated suites to run (default: {','.join(SUITES)})")
+    bench.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                       help="timed runs per measurement; the median is reported (default: %(default)s)")
+    bench.add_argument("--batch-sizes", type=_comma_list(int), default=list(DEFAULT_BATCH_SIZES),
+                       help="synthetic roster sizes for batch throughput "
+                            f"(default: {','.join(map(str, DEFAULT_BATCH_SIZES))})")
+    bench.add_argument("-j", "--workers", type=int, default=default_workers(),
+                       help="worker processes for the batch runs (default: one per CPU)")
+    bench.add_argument("--json", metavar="FILE", help="write the results as JSON")
+    bench.add_argument("--baseline", metavar="FILE",
+                       help="JSON results of an earlier run; exits 1 if any metric regressed")
+    bench.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                       help="fractional slowdown that counts as a regression (default: %(default)s)")
+    bench.set_defaults(func=cmd_bench)
+
+    return parser
+
+
+def main(argv=None):
+    """Run the command line interface"""
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=args.log_level, format="%(levelname)s %(name)s: %(message)s")
+    try:
+        return args.func(args)
+    except Exception as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
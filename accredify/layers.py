@@ -0,0 +1,128 @@
+"""Static template layers compiled once and reused as form XObjects"""
+import copy
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+from reportlab.pdfgen import canvas
+from reportlab.pdfbase.pdfdoc import (
+    PDFFormXObject, PDFObjectReference, PDFResourceDictionary, xObjectName
+)
+
+from .assets import asset_fingerprint
+
+
+# Compiled layers kept per process; one per template/asset combination in use
+STATIC_LAYER_CACHE_SIZE = 16
+
+
+class StaticLayer:
+    """Recorded drawing ops for the parts of a template that never change per record"""
+
+    def __init__(self, form_name, pagesize, code, fonts, forms, shadings, objects):
+        self.form_name = form_name
+        self.pagesize = pagesize
+        self.code = code            # content stream operators
+        self.fonts = fonts          # (font name used in code, postscript font name)
+        self.forms = forms          # XObjects the code paints with Do
+        self.shadings = shadings    # shading names the code paints with sh
+        self.objects = objects      # (name, unregistered PDF object) the layer depends on
+
+    def draw(self, c):
+        """Paint the layer onto a page, adding it to the document on first use"""
+        doc = c._doc
+        if not doc.hasForm(self.form_name):
+            # Objects the layer depends on (images, patterns, nested forms, shadings);
+            # reportlab objects belong to one document, so each gets a fresh copy
+            for name, obj in self.objects:
+                if name not in doc.idToObject:
+                    doc.Reference(copy.deepcopy(obj), name)
+            doc.shadingCounter += len(self.shadings)
+
+            # The form gets its own resource dict, so the font names recorded in
+            # the code stay valid whatever names this document hands out
+            resources = PDFResourceDictionary()
+            resources.allProcs()
+            resources.Font = {
+                recorded: PDFObjectReference(doc.getInternalFontName(psname)[1:])
+                for recorded, psname in self.fonts
+            }
+            resources.XObject = {
+                xObjectName(name): PDFObjectReference(xObjectName(name)) for name in self.forms
+            }
+            resources.Shading = {name: PDFObjectReference(name) for name in self.shadings}
+
+            width, height = self.pagesize
+            form = PDFFormXObject(0, 0, width, height)
+            form.compression = c._pageCompression
+            form.setStreamList([c._preamble] + self.code)
+            form.Resources = resources
+            doc.addForm(self.form_name, form)
+        c.doForm(self.form_name)
+
+
+def compile_static_layer(template, assets):
+    """Record a template's static layer on a scratch canvas"""
+    scratch = canvas.Canvas(BytesIO(), pagesize=template.pagesize)
+    doc = scratch._doc
+    existing = set(doc.idToObject)
+    width, height = template.pagesize
+
+    scratch.beginForm("StaticLayer")
+    template.draw_static(scratch, width, height, assets)
+
+    font_names = {internal[1:] for internal in doc.fontMapping.values()}
+    objects = []
+    for name, obj in doc.idToObject.items():
+        if name not in existing and name not in font_names:
+            # Forget the scratch document so the object can be registered elsewhere
+            obj.__dict__.pop("__InternalName__", None)
+            objects.append((name, obj))
+    layer = StaticLayer(
+        form_name="StaticLayer." + "".join(template.name.split()),
+        pagesize=template.pagesize,
+        code=list(scratch._code),
+        fonts=[(internal[1:], psname) for psname, internal in doc.fontMapping.items()],
+        forms=list(dict.fromkeys(scratch._formsinuse)),
+        shadings=list(scratch._shadingUsed),
+        objects=objects,
+    )
+    scratch.endForm()
+    return layer
+
+
+class StaticLayerCache:
+    """Thread-safe LRU of compiled static layers keyed by template and assets"""
+
+    def __init__(self, maxsize=STATIC_LAYER_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._layers = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, template, assets):
+        """Return the compiled layer, compiling it if the template or assets changed"""
+        key = (
+            template.name,
+            asset_fingerprint(assets.logo_path),
+            asset_fingerprint(assets.signature_path),
+        )
+        with self._lock:
+            layer = self._layers.get(key)
+            if layer is not None:
+                self._layers.move_to_end(key)
+                return layer
+
+        layer = compile_static_layer(template, assets)
+        with self._lock:
+            self._layers[key] = layer
+            while len(self._layers) > self.maxsize:
+                self._layers.popitem(last=False)
+        return layer
+
+    def clear(self):
+        """Drop every compiled layer"""
+        with self._lock:
+            self._layers.clear()
+
+
+static_layers = StaticLayerCache()
@@ -0,0 +1,192 @@
+"""Memoised text measurement, wrapping and auto-fit for certificate text"""
+from collections import namedtuple
+from functools import lru_cache
+
+from reportlab.lib.colors import black
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+
+# Distinct (text, font) measurements and layouts kept per process
+TEXT_CACHE_SIZE = 4096
+
+# Auto-fitted text is never shrunk below this fraction of its design size
+MIN_FIT_RATIO = 0.6
+
+# Line spacing of wrapped fields, as a multiple of the font size
+FIT_LEADING = 1.2
+
+# Lines a wrapped field may take before it is shrunk further
+FIT_MAX_LINES = 2
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def _unit_width(text, font):
+    return stringWidth(text, font, 1)
+
+
+def text_width(text, font, size):
+    """Width in points of text set in font at size
+
+    Widths of the standard fonts scale linearly with size, so each
+    (text, font) is measured once and reused at every size.
+    """
+    return _unit_width(text, font) * size
+
+
+def widest_line(lines, font, size):
+    """Width in points of the widest of lines, 0 for none"""
+    return max((_unit_width(line, font) for line in lines), default=0.0) * size
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def wrap_text(text, font, size, max_width):
+    """Greedy word wrap into lines no wider than max_width, as a tuple
+
+    A single word wider than max_width gets a line to itself. Words are
+    measured individually, so names and phrases that recur across a
+    roster cost nothing after the first time.
+    """
+    space = text_width(" ", font, size)
+    lines, line, line_width = [], [], 0.0
+    for word in text.split():
+        word_width = text_width(word, font, size)
+        if line and line_width + space + word_width > max_width + 1e-6:
+            lines.append(" ".join(line))
+            line, line_width = [word], word_width
+        else:
+            line_width += word_width + (space if line else 0.0)
+            line.append(word)
+    if line:
+        lines.append(" ".join(line))
+    return tuple(lines)
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def fit_text(text, font, size, max_width, min_size=None, max_lines=FIT_MAX_LINES):
+    """(size, lines) that fit text into max_width
+
+    Text that fits is kept at size on one line. Otherwise it is shrunk
+    just enough to fit, which is computed directly because width is
+    linear in size. If that would take it below min_size (by default
+    MIN_FIT_RATIO of size), it is wrapped at min_size instead, shrinking
+    further while it would need more than max_lines lines or a word too
+    long to break is still wider than max_width.
+    """
+    min_size = min_size or size * MIN_FIT_RATIO
+    width = text_width(text, font, size)
+    if width <= max_width:
+        return size, (text,)
+    shrunk = size * max_width / width
+    if shrunk >= min_size:
+        return shrunk, (text,)
+    size = min_size
+    lines = wrap_text(text, font, size, max_width)
+    while size > 1:
+        widest = widest_line(lines, font, size)
+        if len(lines) > max_lines:
+            size *= 0.95
+        elif widest > max_width + 1e-6:
+            # Only a single long word is left over; shrink it straight to the width
+            size = max(1, size * max_width / widest)
+        else:
+            break
+        lines = wrap_text(text, font, size, max_width)
+    return size, lines
+
+
+def draw_fitted(c, x, y, text, font, size, max_width, min_size=None):
+    """Draw text centred on x with its last baseline at y, auto-fitted to max_width
+
+    Wrapped lines are FIT_LEADING * size apart and stack upwards from y,
+    so a long name takes the space above it rather than running into the
+    field below. Leaves font set on the canvas, as setFont would.
+    """
+    size, lines = fit_text(text, font, size, max_width, min_size)
+    leading = size * FIT_LEADING
+    c.setFont(font, size)
+    y += (len(lines) - 1) * leading
+    for line in lines:
+        c.drawCentredString(x, y, line)
+        y -= leading
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def fit_paragraph(text, font, size, leading, width, max_height=None):
+    """(size, leading, lines) of text wrapped to width, shrunk until it fits max_height"""
+    lines = wrap_text(text, font, size, width)
+    while max_height and len(lines) * leading > max_height + 1e-6 and size > 1:
+        size, leading = size * 0.95, leading * 0.95
+        lines = wrap_text(text, font, size, width)
+    return size, leading, lines
+
+
+def draw_paragraph(c, x, y, width, text, size, leading, font="Helvetica", color=black,
+                   max_height=None):
+    """Draw text wrapped to width and centred, with the bottom of the block at y
+
+    Lays text out as a centred reportlab Paragraph in its default style
+    would, but from cached line breaks, and treats text as plain text
+    rather than paragraph markup. Given max_height, text and leading
+    shrink together until the block fits. Canvas font and colour are
+    left as they were.
+    """
+    size, leading, lines = fit_paragraph(text, font, size, leading, width, max_height)
+    baseline = y + len(lines) * leading - size
+    centre = x + width / 2
+    c.saveState()
+    c.setFillColor(color)
+    c.setFont(font, size)
+    for line in lines:
+        c.drawCentredString(centre, baseline, line)
+        baseline -= leading
+    c.restoreState()
+
+
+class FitBox(namedtuple("FitBox", ["fields", "text", "font", "size", "width", "min_size"],
+                        defaults=(None,))):
+    """A line of dynamic text, auto-fitted into width by draw_fitted
+
+    text(record) gives what is drawn; fields names the record fields it
+    reads, so a roster can be checked one distinct value at a time.
+    """
+    __slots__ = ()
+
+    def draw(self, c, x, y, record):
+        """Draw the record's text centred on x, last baseline at y"""
+        draw_fitted(c, x, y, self.text(record), self.font, self.size, self.width, self.min_size)
+
+    @property
+    def max_unit_width(self):
+        """Width at 1pt up to which text is sure to fit at or above its minimum size"""
+        return self.width / (self.min_size or self.size * MIN_FIT_RATIO)
+
+    def overflows(self, text):
+        """True if text only fits by going below the minimum size, or does not fit at all"""
+        size, lines = fit_text(text, self.font, self.size, self.width, self.min_size)
+        return (size < (self.min_size or self.size * MIN_FIT_RATIO) - 1e-6
+                or len(lines) > FIT_MAX_LINES
+                or widest_line(lines, self.font, size) > self.width + 1e-6)
+
+
+class ParagraphBox(namedtuple("ParagraphBox",
+                              ["fields", "text", "font", "size", "leading", "width", "max_height"])):
+    """A wrapped block of dynamic text, shrunk to fit max_height by draw_paragraph"""
+    __slots__ = ()
+
+    def draw(self, c, x, y, record):
+        """Draw the record's text in the box whose bottom-left corner is (x, y)"""
+        draw_paragraph(c, x, y, self.width, self.text(record), self.size, self.leading,
+                       font=self.font, max_height=self.max_height)
+
+    @property
+    def max_unit_width(self):
+        """Width at 1pt up to which text fits on one line at full size"""
+        return self.width / self.size
+
+    def overflows(self, text):
+        """True if text only fits by shrinking below MIN_FIT_RATIO of its size, or does not fit at all"""
+        size, leading, lines = fit_paragraph(text, self.font, self.size, self.leading, self.width,
+                                             self.max_height)
+        return (size < self.size * MIN_FIT_RATIO - 1e-6
+                or widest_line(lines, self.font, size) > self.width + 1e-6
+                or bool(self.max_height) and len(lines) * leading > self.max_height + 1e-6)
@@ -0,0 +1,117 @@
+"""Append-only checkpoint manifest that lets an interrupted batch resume"""
+import hashlib
+import json
+import os
+import threading
+
+from .assets import asset_fingerprint
+
+
+# Manifest file kept in a batch's output directory
+MANIFEST_NAME = ".accredify-manifest.jsonl"
+
+
+def row_hash(template, assets, record):
+    """Stable digest of everything that determines a row's certificate"""
+    payload = json.dumps([
+        template,
+        asset_fingerprint(assets.logo_path),
+        asset_fingerprint(assets.signature_path),
+        # display_date and filename follow from these; the output path is checked separately
+        *(str(value) for value in (record.name, record.course, record.date, record.description)),
+    ], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def atomic_write(path, data):
+    """Write bytes to path via a temporary file and rename, so a crash never leaves half a file"""
+    # Unique per thread as well as per process: FileWriter threads can write the same path at once
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return len(data)
+
+
+class BatchManifest:
+    """One JSON line per finished row: row index, row hash, output path, byte size and mtime
+
+    Lines are only appended after the output file has been renamed into
+    place, so every complete line describes a whole file. A line torn by
+    a crash is ignored when the manifest is read back. Finished rows are
+    keyed by row hash and output path together, since repeated roster
+    rows share a hash but are written to files of their own. A file
+    counts as intact while its size and modification time are as
+    recorded, so one truncated or rewritten since is rendered again.
+    """
+
+    def __init__(self, output_dir, resume=False):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self.completed = self._load() if resume else {}
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+
+    def _load(self):
+        completed = {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        completed[entry["hash"], entry["path"]] = (entry["bytes"], entry["mtime"])
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except FileNotFoundError:
+            pass
+        return completed
+
+    def relative(self, output_path):
+        """output_path relative to the output directory, with / separators"""
+        return os.path.relpath(output_path, self.output_dir).replace(os.sep, '/')
+
+    def is_done(self, digest, output_path):
+        """True if this row was finished before and its file is still intact"""
+        expected = self.completed.get((digest, self.relative(output_path)))
+        if expected is None:
+            return False
+        try:
+            stat = os.stat(output_path)
+        except OSError:
+            return False
+        return (stat.st_size, stat.st_mtime_ns) == expected
+
+    def record(self, index, digest, output_path, nbytes):
+        """Append a finished row; one whose file has already gone is left out"""
+        try:
+            mtime = os.stat(output_path).st_mtime_ns
+        except OSError:
+            return
+        self._file.write(json.dumps({
+            "row": index,
+            "hash": digest,
+            "path": self.relative(output_path),
+            "bytes": nbytes,
+            "mtime": mtime,
+        }) + "\n")
+
+    def flush(self, sync=False):
+        """Push appended lines to the OS, and with sync=True on to the disk"""
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
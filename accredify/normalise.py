@@ -0,0 +1,179 @@
+"""Whole-roster clean-up before rendering: text, dates and output file names
+
+Rosters are normalised a chunk at a time, column by column, and each
+distinct value is cleaned once however many rows share it, so templates
+get ready-to-draw records and never tidy or parse a row themselves.
+pandas is imported on first use, as in roster.py.
+"""
+import re
+import warnings
+
+from .records import DATE_FORMAT, DISPLAY_DATE_FORMAT
+
+
+# Columns of a normalised roster chunk, in CertificateRecord field order
+NORMALISED_COLUMNS = ['Name', 'Course', 'Date', 'Description', 'DisplayDate', 'Filename']
+
+# Zero-width characters and byte order marks that creep in from spreadsheets and web forms
+_INVISIBLE = r'[\u200b-\u200d\u2060\ufeff]'
+
+# Characters that are not allowed in file names on Windows, macOS or Linux
+_UNSAFE_FILENAME = r'[<>:"/\\|?*\x00-\x1f]'
+
+# A date that is not yyyy-mm-dd is only guessed at if it has day, month and year parts
+_DATE_PARTS = r'[A-Za-z]+|\d+'
+
+FILENAME_PREFIX = "Certificate_"
+FILENAME_EXTENSION = ".pdf"
+
+# Longest recipient-name part of a file name, in UTF-8 bytes, which keeps
+# the whole name (with prefix, duplicate suffix and extension) under 255
+MAX_FILENAME_BYTES = 200
+
+
+def _by_value(series, clean):
+    """Run clean over each distinct value of series once and spread the results back over its rows"""
+    import pandas as pd
+
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    result = clean(pd.Series(uniques, dtype=object)).take(codes)
+    result.index = series.index
+    return result
+
+
+def _clean_text(values):
+    return (values.fillna('').astype(str)
+            .str.normalize('NFC')
+            .str.replace(_INVISIBLE, '', regex=True)
+            .str.replace(r'\s+', ' ', regex=True)
+            .str.strip())
+
+
+def parse_dates(text):
+    """Timestamps for a Series of date strings, NaT where a date cannot be read
+
+    yyyy-mm-dd is tried first. The rest are parsed in the format pandas
+    infers from the first of them, then one by one in whatever format
+    each is in.
+    """
+    import pandas as pd
+
+    parsed = pd.to_datetime(text, format=DATE_FORMAT, errors='coerce')
+    for fmt in (None, 'mixed'):
+        rest = parsed.isna() & (text.str.count(_DATE_PARTS) >= 3)
+        if not rest.any():
+            break
+        with warnings.catch_warnings():
+            # "Could not infer format": expected for the rows the next pass picks up
+            warnings.simplefilter('ignore', UserWarning)
+            parsed[rest] = pd.to_datetime(text[rest], format=fmt, errors='coerce')
+    return parsed
+
+
+def _dates(values):
+    """Stored (yyyy-mm-dd) and printed forms of dates, both as typed if unreadable"""
+    import pandas as pd
+
+    text = _clean_text(values)
+    parsed = parse_dates(text)
+    readable = parsed.notna()
+    stored, display = text.copy(), text.copy()
+    stored[readable] = parsed[readable].dt.strftime(DATE_FORMAT)
+    display[readable] = parsed[readable].dt.strftime(DISPLAY_DATE_FORMAT)
+    return pd.DataFrame({'Date': stored, 'DisplayDate': display})
+
+
+def _truncate_utf8(text):
+    return text.encode('utf-8')[:MAX_FILENAME_BYTES].decode('utf-8', 'ignore').rstrip('_')
+
+
+def safe_name(text):
+    """text made usable as (part of) a file or directory name on any filesystem"""
+    return _truncate_utf8(re.sub(_UNSAFE_FILENAME, '', str(text)).replace(' ', '_').strip('._'))
+
+
+def filename_stem(name):
+    """File name, without extension, for one recipient name"""
+    body = safe_name(name)
+    return FILENAME_PREFIX + body if body else FILENAME_PREFIX.rstrip('_')
+
+
+def _filename_stems(names):
+    """filename_stem for a Series of cleaned names"""
+    body = names.str.replace(_UNSAFE_FILENAME, '', regex=True).str.replace(' ', '_').str.strip('._')
+    # Only a name of more than a quarter of the limit in characters can be over it in bytes
+    long = body.str.len() * 4 > MAX_FILENAME_BYTES
+    if long.any():
+        body[long] = body[long].map(_truncate_utf8)
+    return (FILENAME_PREFIX + body).where(body != '', FILENAME_PREFIX.rstrip('_'))
+
+
+class FilenameAllocator:
+    """Hands out unique file names in roster order: repeats get _2, _3...
+
+    Names are compared ignoring case, as they are on Windows and macOS
+    disks. One allocator covers a whole roster, so duplicates are caught
+    whichever chunks they fall in, and the same roster always gets the
+    same names.
+    """
+
+    def __init__(self, extension=FILENAME_EXTENSION):
+        self.extension = extension
+        self._seen = {}
+        self._taken = set()
+
+    def name(self, stem):
+        """A unique file name for stem"""
+        key = stem.lower()
+        n = self._seen.get(key, 0)
+        while True:
+            n += 1
+            candidate = stem + (f"_{n}" if n > 1 else "") + self.extension
+            if candidate.lower() not in self._taken:
+                break
+        self._seen[key] = n
+        self._taken.add(candidate.lower())
+        return candidate
+
+    def allocate(self, stems):
+        """Unique file names for a Series of stems, in order, the same as name() gives one by one"""
+        keys = stems.str.lower()
+        occurrence = keys.map(self._seen).fillna(0).astype(int) + keys.groupby(keys, sort=False).cumcount()
+        suffixes = ('_' + (occurrence + 1).astype(str)).where(occurrence > 0, '')
+        names = stems + suffixes + self.extension
+
+        # A suffixed name can clash with a name that was given, say
+        # "Jane Doe 2"; chunks with one are named a row at a time instead
+        lowered = names.str.lower().tolist()
+        if len(set(lowered)) < len(lowered) or not self._taken.isdisjoint(lowered):
+            return stems.map(self.name)
+        self._taken.update(lowered)
+        seen = self._seen
+        counts = keys.value_counts(sort=False)
+        for key, count in zip(counts.index.tolist(), counts.tolist()):
+            seen[key] = seen.get(key, 0) + count
+        return names
+
+
+def normalise_frame(frame, filenames=None):
+    """A normalised copy of a roster chunk, with NORMALISED_COLUMNS
+
+    frame has the roster's Name, Course, Date and Description columns;
+    cells may be of any type, and blank ones NaN or None. Text gets
+    composed Unicode (NFC), no invisible characters and single spaces.
+    Dates are stored as yyyy-mm-dd and their printed form is added as
+    DisplayDate; a date that cannot be read is kept as typed. Filename
+    is unique and safe on any filesystem; pass the same filenames (a
+    FilenameAllocator) for every chunk of a roster.
+    """
+    import pandas as pd
+
+    filenames = filenames or FilenameAllocator()
+    out = pd.DataFrame(index=frame.index)
+    for column in ('Name', 'Course', 'Description'):
+        out[column] = _by_value(frame[column], _clean_text)
+    dates = _by_value(frame['Date'], _dates)
+    out['Date'] = dates['Date']
+    out['DisplayDate'] = dates['DisplayDate']
+    out['Filename'] = filenames.allocate(_by_value(out['Name'], _filename_stems))
+    return out[NORMALISED_COLUMNS]
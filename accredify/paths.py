@@ -0,0 +1,152 @@
+"""Where batch certificates are written: output path templates and hash-sharded directories"""
+import hashlib
+import re
+import string
+from datetime import date
+
+from .normalise import FILENAME_EXTENSION, FilenameAllocator, filename_stem, safe_name
+from .records import CertificateRecord, verification_id
+
+
+# Every certificate straight in the output directory, as Certificate_<Name>.pdf
+DEFAULT_PATH_TEMPLATE = "{file}"
+
+# Directories per level of {shard}, and levels of them
+DEFAULT_SHARD_FANOUT = 256
+DEFAULT_SHARD_DEPTH = 1
+
+# A template field with an optional index or slice, as in {id[:2]}
+_FIELD = re.compile(r"^(\w+)(?:\[(-?\d*)(?::(-?\d*))?\])?$")
+
+_SAMPLE_RECORD = CertificateRecord(name="Jane Doe", course="Sample Course", date="2024-01-01")
+
+
+class _Undated(str):
+    """An unreadable date: used as typed, whatever date format the template asks for"""
+
+    def __format__(self, spec):
+        return str(self)
+
+
+def _compile(template):
+    """template as (literal text, field name, slice, format spec) parts, checking its syntax
+
+    The index or slice of a field like {id[:2]} becomes a slice object; an
+    index is a one-character slice, so past the end it gives '' rather
+    than failing the row.
+    """
+    parts = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        if field is None:
+            parts.append((literal, None, None, ""))
+            continue
+        match = _FIELD.match(field)
+        if match is None or conversion or "{" in spec:
+            raise ValueError(f"Cannot build output paths from {template!r}: unsupported field {{{field}}}")
+        name, start, stop = match.groups()
+        if start is None:
+            part = None
+        elif stop is None:
+            index = int(start)
+            part = slice(index, index + 1 or None)
+        else:
+            part = slice(int(start) if start else None, int(stop) if stop else None)
+        parts.append((literal, name, part, spec))
+    return parts
+
+
+class OutputPaths:
+    """Relative output paths for batch certificates, built from a path template
+
+    template is a str.format pattern, with / between directories, over
+    these fields:
+
+        name, course, description   the record's text, made safe for paths
+        date                        a datetime.date for yyyy-mm-dd dates, so
+                                    {date:%Y} works; other dates as typed
+        id                          the verification ID
+        shard                       hash-sharded directories, such as 3f/a2:
+                                    shard_depth levels of shard_fanout each
+        file                        the usual file name, Certificate_<Name>.pdf
+
+    Fields take an index or slice, as in {id[:2]}. A path not ending in
+    .pdf gets it added, and paths that come out the same are numbered
+    like repeated file names. A certificate's shard depends only on its
+    verification ID, so shard(cert_id) finds its directory directly.
+    """
+
+    def __init__(self, template=DEFAULT_PATH_TEMPLATE, shard_fanout=DEFAULT_SHARD_FANOUT,
+                 shard_depth=DEFAULT_SHARD_DEPTH):
+        if shard_fanout < 2 or shard_depth < 1:
+            raise ValueError("Shard fan-out must be at least 2 and depth at least 1")
+        parts = template.replace("\\", "/").split("/")
+        if not parts[0] or ".." in parts or re.match(r"^[A-Za-z]:", template):
+            raise ValueError(f"Output path template must stay inside the output directory: {template}")
+        self.template = template
+        self.shard_fanout = shard_fanout
+        self.shard_depth = shard_depth
+        self._digits = len(f"{shard_fanout - 1:x}")
+        self._parts = _compile(template)
+        self._uses = {name for _, name, _, _ in self._parts if name}
+        self._file_only = template in ("{file}", "{file}.pdf")
+        # A bad template fails here, before any row is rendered
+        self._render(_SAMPLE_RECORD)
+
+    def shard(self, cert_id):
+        """Shard directories for a verification ID, such as 3f/a2"""
+        value = int.from_bytes(hashlib.blake2b(cert_id.encode('utf-8'), digest_size=8).digest(), 'big')
+        levels = []
+        for _ in range(self.shard_depth):
+            value, level = divmod(value, self.shard_fanout)
+            levels.append(f"{level:0{self._digits}x}")
+        return "/".join(levels)
+
+    def _fields(self, record):
+        """The template's fields for record; only those it uses are worked out"""
+        uses = self._uses
+        fields = {}
+        for name in ("name", "course", "description"):
+            if name in uses:
+                fields[name] = safe_name(getattr(record, name))
+        if "file" in uses:
+            fields["file"] = record.filename or filename_stem(record.name) + FILENAME_EXTENSION
+        if "date" in uses:
+            try:
+                fields["date"] = date.fromisoformat(record.date)
+            except (TypeError, ValueError):
+                fields["date"] = _Undated(safe_name(record.date))
+        if uses & {"id", "shard"}:
+            fields["id"] = verification_id(record)
+            fields["shard"] = self.shard(fields["id"])
+        return fields
+
+    def _render(self, record):
+        """record's relative path, without the .pdf extension"""
+        if self._file_only:
+            # The default flat layout: no formatting needed
+            path = record.filename or filename_stem(record.name)
+            return path[:-len(FILENAME_EXTENSION)] if path.endswith(FILENAME_EXTENSION) else path
+        fields = self._fields(record)
+        pieces = []
+        try:
+            for literal, name, part, spec in self._parts:
+                pieces.append(literal)
+                if name is not None:
+                    value = fields[name]
+                    pieces.append(format(value if part is None else value[part], spec))
+        except KeyError as e:
+            raise ValueError(f"Cannot build output paths from {self.template!r}: "
+                             f"unknown field {{{e.args[0]}}}") from e
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Cannot build output paths from {self.template!r}: {e}") from e
+        path = "".join(pieces)
+        if path.lower().endswith(FILENAME_EXTENSION):
+            path = path[:-len(FILENAME_EXTENSION)]
+        # An empty field would leave a nameless directory or file
+        return "/".join(part or "_" for part in path.split("/"))
+
+    def assign(self, records):
+        """(index, record, relative path) for each record, in order, every path unique"""
+        allocator = FilenameAllocator()
+        for index, record in enumerate(records):
+            yield index, record, allocator.name(self._render(record))
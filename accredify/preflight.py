@@ -0,0 +1,152 @@
+"""Roster pre-flight check: find rows that will not render cleanly, without rendering"""
+import re
+from collections import namedtuple
+
+from .layout import text_width
+from .normalise import normalise_frame
+from .records import DATE_FORMAT, CertificateRecord, VerificationIdChecker
+from .roster import RECORD_COLUMNS, REQUIRED_COLUMNS
+from .templates import TEMPLATES, DEFAULT_TEMPLATE
+
+
+# One problem with one roster row; row counts data rows from 0, field is
+# the template's text box (or roster column) and problem one of
+# "missing", "overflow", "glyphs" or "date"
+PreflightIssue = namedtuple("PreflightIssue", ["row", "field", "problem", "value"])
+
+# Outcome of a pre-flight check: rows checked and every issue found, in row order
+PreflightReport = namedtuple("PreflightReport", ["rows", "issues"])
+
+_BLANK_RECORD = CertificateRecord(name="", course="", date="")
+
+
+def _winansi_characters():
+    # The standard PDF fonts draw text in WinAnsi (cp1252) encoding, which has no other glyphs
+    chars = []
+    for code in range(256):
+        try:
+            chars.append(bytes([code]).decode('cp1252'))
+        except UnicodeDecodeError:
+            continue
+    return "".join(chars)
+
+
+_UNSUPPORTED_GLYPH = re.compile("[^" + re.escape(_winansi_characters()) + "]")
+
+
+def unsupported_glyphs(text):
+    """Characters in text that the standard PDF fonts cannot draw, in order of appearance"""
+    return "".join(dict.fromkeys(_UNSUPPORTED_GLYPH.findall(text)))
+
+
+def _check_missing(frame, offset, issues):
+    for column in REQUIRED_COLUMNS:
+        blank = frame[column].str.strip() == ''
+        for position in blank.to_numpy().nonzero()[0]:
+            issues.append(PreflightIssue(offset + position, column.lower(), "missing", ''))
+
+
+def _check_glyphs(frame, offset, issues):
+    for column in ('Name', 'Course', 'Description'):
+        values = frame[column]
+        bad = values.str.contains(_UNSUPPORTED_GLYPH, regex=True)
+        for position in bad.to_numpy().nonzero()[0]:
+            issues.append(PreflightIssue(offset + position, column.lower(), "glyphs",
+                                         unsupported_glyphs(values.iat[position])))
+
+
+def _check_dates(frame, offset, issues):
+    import pandas as pd
+
+    # Normalised dates are yyyy-mm-dd unless they could not be read
+    dates = frame['Date']
+    parsed = pd.to_datetime(dates, format=DATE_FORMAT, errors="coerce")
+    bad = parsed.isna() & (dates != '')
+    for position in bad.to_numpy().nonzero()[0]:
+        issues.append(PreflightIssue(offset + position, "date", "date", dates.iat[position]))
+
+
+def _check_ids(frame, offset, checker):
+    """Raise ValueError on the first verification ID collision, as a batch would"""
+    rows = frame[['Name', 'Course', 'Date']].itertuples(index=False, name=None)
+    for position, (name, course, date) in enumerate(rows):
+        checker.check(offset + position, CertificateRecord(name, course, date))
+
+
+def _check_box(frame, offset, field, box, issues):
+    """Flag rows whose text in box can only fit below its minimum size, or not at all
+
+    Each distinct value is measured once, from cached font metrics; only
+    values too wide for one line of the box at its minimum size are laid
+    out in full.
+    """
+    import numpy as np
+
+    columns = [name.capitalize() for name in box.fields]
+    groups = frame.groupby(columns, sort=False).ngroup().to_numpy()
+    distinct = frame[columns].drop_duplicates()
+    texts = [
+        box.text(_BLANK_RECORD._replace(**dict(zip(box.fields, values))))
+        for values in distinct.itertuples(index=False, name=None)
+    ]
+    widths = np.fromiter((text_width(text, box.font, 1) for text in texts), float, len(texts))
+    overflowing = np.zeros(len(texts), dtype=bool)
+    for i in (widths > box.max_unit_width).nonzero()[0]:
+        overflowing[i] = box.overflows(texts[i])
+    for position in overflowing[groups].nonzero()[0]:
+        issues.append(PreflightIssue(offset + position, field, "overflow", texts[groups[position]]))
+
+
+def _frames(roster):
+    if hasattr(roster, 'frames'):
+        yield from roster.frames()
+        return
+    # A DataFrame read some other way
+    yield normalise_frame(roster.reindex(columns=RECORD_COLUMNS))
+
+
+def preflight_roster(roster, template=DEFAULT_TEMPLATE):
+    """Check every row of a roster against a template, producing no PDFs
+
+    roster is a RosterStream (see open_roster) or a DataFrame with the
+    roster columns. Rows are checked a chunk at a time, column by column,
+    for blank required fields, text that overflows the template's boxes
+    even at its minimum size, characters the standard fonts cannot draw
+    and dates that cannot be read (which would be printed as typed).
+    Rows are checked as normalise_frame leaves them, which is how they
+    are rendered. Two different certificates that would share a
+    verification ID stop the check with ValueError, before any batch
+    output is written.
+    """
+    if template not in TEMPLATES:
+        raise ValueError(f"Unknown template: {template}")
+    boxes = TEMPLATES[template].text_boxes
+    checker = VerificationIdChecker()
+    issues = []
+    rows = 0
+    for frame in _frames(roster):
+        frame = frame.reset_index(drop=True)
+        _check_ids(frame, rows, checker)
+        chunk_issues = []
+        _check_missing(frame, rows, chunk_issues)
+        for field, box in boxes.items():
+            _check_box(frame, rows, field, box, chunk_issues)
+        _check_glyphs(frame, rows, chunk_issues)
+        _check_dates(frame, rows, chunk_issues)
+        chunk_issues.sort(key=lambda issue: issue.row)
+        issues.extend(chunk_issues)
+        rows += len(frame)
+    return PreflightReport(rows, issues)
+
+
+def describe_issue(issue):
+    """One line describing an issue, numbering rows from 1"""
+    if issue.problem == "missing":
+        detail = f"{issue.field} is empty"
+    elif issue.problem == "overflow":
+        detail = f"{issue.field} does not fit the template even at its smallest size: {issue.value!r}"
+    elif issue.problem == "glyphs":
+        detail = f"{issue.field} has characters the certificate fonts cannot show: {issue.value!r}"
+    else:
+        detail = f"date {issue.value!r} cannot be read as a date and will be printed as typed"
+    return f"Row {issue.row + 1}: {detail}"
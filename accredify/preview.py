@@ -0,0 +1,283 @@
+"""Live preview rendering on a background thread
+
+The renderer (reportlab, qrcode) is imported by the first render rather
+than with this module, so that cost lands on the preview thread and not
+on the GUI's startup.
+"""
+import queue
+import threading
+from collections import OrderedDict, namedtuple
+from io import BytesIO
+
+from PIL import Image
+
+from .assets import asset_fingerprint
+from .raster import PREVIEW_DPI, rasterise_pdf, rasterise_regions
+
+
+# Quiet period after the last keystroke before a preview is rendered
+PREVIEW_DEBOUNCE_MS = 150
+
+# Quiet period after which an overlay preview is replaced by a full render
+PREVIEW_IDLE_MS = 800
+
+# Zoom range and step offered by the preview
+PREVIEW_ZOOM_MIN = 0.5
+PREVIEW_ZOOM_MAX = 2.0
+PREVIEW_ZOOM_STEP = 0.1
+
+# Memory budget for cached preview rasters (a 200% A4 page is about 12MB)
+PREVIEW_CACHE_BYTES = 128 * 1024 * 1024
+STATIC_PREVIEW_CACHE_BYTES = 64 * 1024 * 1024
+
+# What to preview; zoom scales PREVIEW_DPI. An overlay preview composites
+# the record onto a cached raster of the template's static layer
+PreviewRequest = namedtuple(
+    "PreviewRequest", ["record", "template", "assets", "zoom", "overlay"], defaults=(False,)
+)
+
+# A finished render: image is None when error is set
+PreviewResult = namedtuple("PreviewResult", ["generation", "request", "image", "error"])
+
+
+def preview_key(request):
+    """Cache key for what a preview shows, independent of zoom"""
+    return (
+        request.template,
+        tuple(request.record),
+        asset_fingerprint(request.assets.logo_path),
+        asset_fingerprint(request.assets.signature_path),
+    )
+
+
+class PreviewCache:
+    """Thread-safe LRU of preview rasters, one per template/fields/assets combination
+
+    Each entry keeps the highest-resolution raster rendered so far. A
+    request at that zoom or below is served by scaling it down, so zooming
+    out, switching appearance or returning to a recent template does not
+    render again. Zooming in past the cached resolution is a miss.
+    """
+
+    def __init__(self, max_bytes=PREVIEW_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, dpi):
+        """The preview at dpi, scaled from a cached raster, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < dpi:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        cached_dpi, image, _ = entry
+        if cached_dpi == dpi:
+            return image
+        factor = cached_dpi / dpi
+        if factor.is_integer():
+            return image.reduce(int(factor))
+        # Area averaging: close to the rasteriser's own anti-aliasing, and cheap
+        size = (max(1, round(image.width / factor)), max(1, round(image.height / factor)))
+        return image.resize(size, Image.Resampling.BOX)
+
+    def put(self, key, dpi, image):
+        """Store a raster unless a sharper one is already cached"""
+        nbytes = image.width * image.height * len(image.getbands())
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                if entry[0] > dpi:
+                    self._entries[key] = entry
+                    return
+                self._bytes -= entry[2]
+            self._entries[key] = (dpi, image, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def clear(self):
+        """Drop every cached raster"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+preview_cache = PreviewCache()
+
+# Static layer rasters, keyed by resolution too so they are never rescaled
+static_previews = PreviewCache(max_bytes=STATIC_PREVIEW_CACHE_BYTES)
+
+
+def _render_layer(template, layer, request):
+    buffer = BytesIO()
+    template.render_layer(buffer, layer, record=request.record, assets=request.assets)
+    return buffer.getvalue()
+
+
+def _static_background(template, request, dpi):
+    """The template's static layer rasterised at dpi, from static_previews if there"""
+    key = (
+        request.template,
+        asset_fingerprint(request.assets.logo_path),
+        asset_fingerprint(request.assets.signature_path),
+        dpi,
+    )
+    background = static_previews.get(key, dpi)
+    if background is None:
+        background = rasterise_pdf(_render_layer(template, "static", request), dpi=dpi).convert("RGB")
+        static_previews.put(key, dpi, background)
+    return background
+
+
+def warm_up_preview(template, assets, zoom=1.0):
+    """Import the renderer and rasteriser and cache a template's static layer raster
+
+    Meant for a background thread at startup: the window does not wait for
+    it, and the first overlay preview then only draws the record's fields.
+    """
+    from .templates import TEMPLATES
+
+    request = PreviewRequest(None, template, assets, zoom)
+    _static_background(TEMPLATES[template], request, PREVIEW_DPI * zoom)
+
+
+def render_overlay_preview(request):
+    """Paste the record's dynamic layer onto the template's cached static raster
+
+    Only the name, course, date, description and QR are drawn per call,
+    and only the rectangles around them are rasterised, on a transparent
+    background, by the same renderer. They are pasted onto a copy of the
+    static raster, so the result matches a full render to within
+    anti-aliasing rounding.
+    """
+    from .templates import TEMPLATES
+
+    if request.template not in TEMPLATES:
+        raise ValueError(f"Unknown template: {request.template}")
+    template = TEMPLATES[request.template]
+    dpi = PREVIEW_DPI * request.zoom
+    background = _static_background(template, request, dpi)
+
+    image = background.copy()
+    for position, region in rasterise_regions(_render_layer(template, "dynamic", request), dpi=dpi):
+        image.paste(region, position, region)
+    return image
+
+
+def render_preview(request, cache=preview_cache):
+    """Render a request to a PIL image at its zoom level, reusing cached rasters
+
+    Overlay requests are composited (see render_overlay_preview) unless a
+    full render of the same state is already cached; their results are not
+    cached, so the follow-up full render still happens.
+    """
+    key = preview_key(request)
+    dpi = PREVIEW_DPI * request.zoom
+    image = cache.get(key, dpi)
+    if image is not None:
+        return image
+    if request.overlay:
+        return render_overlay_preview(request)
+    from .render import render_certificate
+
+    pdf = render_certificate(request.record, template=request.template, assets=request.assets)
+    image = rasterise_pdf(pdf, dpi=dpi)
+    cache.put(key, dpi, image)
+    return image
+
+
+class PreviewRenderer:
+    """Renders previews one at a time on a worker thread, newest request wins
+
+    submit() replaces whatever is still waiting, so a burst of edits
+    renders at most the one in flight plus the latest. A render that is
+    overtaken while running is dropped rather than reported. The worker
+    never touches the UI: call poll() from the UI thread to collect the
+    latest result.
+    """
+
+    def __init__(self, render=render_preview):
+        self._render = render
+        self._generation = 0
+        self._pending = None
+        self._busy = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._results = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="preview-renderer", daemon=True)
+        self._thread.start()
+
+    def submit(self, request):
+        """Queue a render, superseding any request not yet started"""
+        with self._condition:
+            self._generation += 1
+            self._pending = (self._generation, request)
+            self._condition.notify()
+            return self._generation
+
+    def cancel(self):
+        """Drop the waiting request and any result still in flight"""
+        with self._condition:
+            self._generation += 1
+            self._pending = None
+
+    @property
+    def busy(self):
+        """True while a render is waiting, running or uncollected"""
+        with self._condition:
+            return self._pending is not None or self._busy or not self._results.empty()
+
+    def poll(self):
+        """Latest result of the newest request, or None; stale results are discarded"""
+        latest = None
+        while True:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if result.generation == self._generation:
+                latest = result
+        return latest
+
+    def close(self):
+        """Stop the worker thread once the current render finishes"""
+        with self._condition:
+            self._closed = True
+            self._pending = None
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                generation, request = self._pending
+                self._pending = None
+                self._busy = True
+            try:
+                image, error = self._render(request), None
+            except Exception as e:
+                image, error = None, e
+            with self._condition:
+                self._busy = False
+                if generation == self._generation:
+                    self._results.put(PreviewResult(generation, request, image, error))
@@ -0,0 +1,188 @@
+"""QR code generation for certificate verification data"""
+import logging
+
+import qrcode
+from reportlab.lib.rl_accel import fp_str
+from reportlab.pdfbase.pdfdoc import BasicFonts, PDFArray, PDFDictionary, PDFName, PDFStream
+
+from .assets import image_cache
+
+logger = logging.getLogger(__name__)
+
+
+# The centre logo covers a quarter of the code, so it never needs more than this
+QR_LOGO_MAX_PIXELS = (256, 256)
+QR_LOGO_RATIO = 0.25
+
+# Dark modules are glyphs of a Type3 font, one per shape, so each row of a
+# code is one string. A module's shape depends only on which of its four
+# neighbours are dark, one bit each, and its glyph is _FIRST_SHAPE plus
+# those bits; _LIGHT is a blank glyph for a light module
+_UP, _RIGHT, _DOWN, _LEFT = 1, 2, 4, 8
+_LIGHT = "@"
+_FIRST_SHAPE = ord("A")
+_MODULE_FONT = "QRModuleFont"
+_MODULE_FONT_RESOURCE = "FQRModules"
+
+# Sides facing a dark neighbour reach this far (in modules) into it, so
+# anti-aliasing leaves no hairline seams between neighbouring modules
+_SEAM_OVERLAP = 0.05
+
+# Rounded corners are quarter circles of half a module: the arc ends half a
+# module from the corner and its Bezier handles a further 0.5 * kappa back
+_ARC_END = 0.5
+_ARC_HANDLE = 0.5 - 0.5 * 0.5522847498
+
+
+def _build_qr(data, logo_path=None):
+    """QR code for data; a centre logo needs the highest error correction"""
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=(qrcode.constants.ERROR_CORRECT_H if logo_path
+                          else qrcode.constants.ERROR_CORRECT_L),
+        box_size=10,
+        border=4,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr
+
+
+def _module_shape(neighbours):
+    """Fill-path operators for a module in a unit square, y growing downwards
+
+    A corner is rounded when both modules next to it are light, as
+    qrcode's RoundedModuleDrawer draws it, and sides facing a dark
+    module overlap it.
+    """
+    up, right, down, left = (bool(neighbours & side) for side in (_UP, _RIGHT, _DOWN, _LEFT))
+    x0, y0 = -_SEAM_OVERLAP * left, -_SEAM_OVERLAP * up
+    x1, y1 = 1 + _SEAM_OVERLAP * right, 1 + _SEAM_OVERLAP * down
+    a, b = _ARC_END, _ARC_HANDLE
+    ops = []
+    if not (up or left):
+        ops.append(f"{fp_str(x0, y0 + a)} m {fp_str(x0, y0 + b, x0 + b, y0, x0 + a, y0)} c")
+    else:
+        ops.append(f"{fp_str(x0, y0)} m")
+    if not (up or right):
+        ops.append(f"{fp_str(x1 - a, y0)} l {fp_str(x1 - b, y0, x1, y0 + b, x1, y0 + a)} c")
+    else:
+        ops.append(f"{fp_str(x1, y0)} l")
+    if not (down or right):
+        ops.append(f"{fp_str(x1, y1 - a)} l {fp_str(x1, y1 - b, x1 - b, y1, x1 - a, y1)} c")
+    else:
+        ops.append(f"{fp_str(x1, y1)} l")
+    if not (down or left):
+        ops.append(f"{fp_str(x0 + a, y1)} l {fp_str(x0 + b, y1, x0, y1 - b, x0, y1 - a)} c")
+    else:
+        ops.append(f"{fp_str(x0, y1)} l")
+    return " ".join(ops) + " h f"
+
+
+def qr_modules(matrix):
+    """(column, row, neighbours) for each dark module of a matrix, row by row
+
+    neighbours has a bit set for each of the module's dark neighbours.
+    """
+    n = len(matrix)
+    empty = [False] * n
+    for row, cells in enumerate(matrix):
+        above = matrix[row - 1] if row else empty
+        below = matrix[row + 1] if row + 1 < n else empty
+        for col, dark in enumerate(cells):
+            if dark:
+                yield col, row, (
+                    _UP * above[col]
+                    | _RIGHT * (col + 1 < n and cells[col + 1])
+                    | _DOWN * below[col]
+                    | _LEFT * (col > 0 and cells[col - 1])
+                )
+
+
+def qr_code_rows(matrix):
+    """The rows of a matrix as strings of module glyphs, trailing light modules dropped"""
+    n = len(matrix)
+    rows = [[_LIGHT] * n for _ in range(n)]
+    for col, row, neighbours in qr_modules(matrix):
+        rows[row][col] = chr(_FIRST_SHAPE + neighbours)
+    return ["".join(cells).rstrip(_LIGHT) for cells in rows]
+
+
+def _glyph(doc, name, content):
+    stream = PDFStream(content=content)
+    stream.filters = []
+    return doc.Reference(stream, f"{_MODULE_FONT}.{name}")
+
+
+def _add_module_font(c):
+    """Add the module glyph font to the canvas's document, once
+
+    Glyphs use d1, so they take the current fill colour and viewers can
+    cache them as masks. Every glyph extracts as a space, so the code
+    never turns up as text in a copy or search.
+    """
+    doc = c._doc
+    if _MODULE_FONT in doc.idToObject:
+        return
+    bbox = [-_SEAM_OVERLAP, -_SEAM_OVERLAP, 1 + _SEAM_OVERLAP, 1 + _SEAM_OVERLAP]
+    procs = {"light": _glyph(doc, "light", "1 0 0 0 0 0 d1")}
+    names = [PDFName("light")]
+    for neighbours in range(16):
+        name = f"m{neighbours}"
+        procs[name] = _glyph(doc, name, f"1 0 {fp_str(*bbox)} d1 {_module_shape(neighbours)}")
+        names.append(PDFName(name))
+    first = ord(_LIGHT)
+    to_unicode = PDFStream(content=(
+        "/CIDInit /ProcSet findresource begin 12 dict begin begincmap "
+        "/CMapName /QRModules def /CMapType 2 def "
+        "1 begincodespacerange <00> <FF> endcodespacerange "
+        f"1 beginbfrange <{first:02X}> <{first + 16:02X}> [{' '.join(['<0020>'] * 17)}] endbfrange "
+        "endcmap CMapName currentdict /CMap defineresource pop end end"
+    ))
+    font = PDFDictionary({
+        "Type": PDFName("Font"),
+        "Subtype": PDFName("Type3"),
+        "FontBBox": PDFArray(bbox),
+        "FontMatrix": PDFArray([1, 0, 0, 1, 0, 0]),
+        "CharProcs": PDFDictionary(procs),
+        "Encoding": PDFDictionary({
+            "Type": PDFName("Encoding"),
+            "Differences": PDFArray([first] + names),
+        }),
+        "FirstChar": first,
+        "LastChar": first + 16,
+        "Widths": PDFArray([1] * 17),
+        "Resources": PDFDictionary({}),
+        "ToUnicode": doc.Reference(to_unicode, f"{_MODULE_FONT}.ToUnicode"),
+    })
+    # Pages share the document's font dictionary, so every page can use it
+    doc.idToObject[BasicFonts].dict[_MODULE_FONT_RESOURCE] = doc.Reference(font, _MODULE_FONT)
+
+
+def draw_qr_code(c, data, x, y, size, logo_path=None):
+    """Draw a QR code onto a reportlab canvas as vector glyphs, a row of modules per line of text
+
+    The code sits on a white square of the given size, modules in black,
+    with the logo (if any) over the centre quarter.
+    """
+    qr = _build_qr(data, logo_path)
+    matrix = qr.get_matrix()
+    module = size / len(matrix)
+    _add_module_font(c)
+    # One module per text space unit, rows running down the page a line at a time
+    rows = " ".join(f"({row}) '" for row in qr_code_rows(matrix))
+    c.addLiteral(
+        f"q 1 g {fp_str(x, y, size, size)} re f "
+        f"{fp_str(module, 0, 0, -module, x, y + size)} cm "
+        f"0 g BT /{_MODULE_FONT_RESOURCE} 1 Tf 0 Tc 100 Tz 0 Tr -1 TL 0 -1 Td {rows} ET Q"
+    )
+
+    if logo_path:
+        logo_size = size * QR_LOGO_RATIO
+        try:
+            logo = image_cache.reader(logo_path, QR_LOGO_MAX_PIXELS)
+            c.drawImage(logo, x + (size - logo_size) / 2, y + (size - logo_size) / 2,
+                        width=logo_size, height=logo_size, preserveAspectRatio=True,
+                        anchor='c', mask='auto')
+        except Exception as e:
+            logger.warning("QR code logo error: %s", e)
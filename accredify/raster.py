@@ -0,0 +1,181 @@
+"""In-memory PDF rasterisation for the live preview"""
+import math
+import threading
+from collections import OrderedDict
+
+from .timing import timed
+
+
+# Preview resolution at 100% zoom
+PREVIEW_DPI = 100
+
+# Points kept around each painted object when only parts of a page are
+# rendered. Object bounds can be a little tight for glyphs, and pdfium
+# places a glyph that touches the edge of a crop slightly differently
+REGION_PADDING = 3
+
+
+def _merge_boxes(boxes):
+    """Pixel boxes (left, top, right, bottom) with every overlapping pair merged into one"""
+    merged = []
+    for box in boxes:
+        while True:
+            for i, other in enumerate(merged):
+                if box[0] < other[2] and other[0] < box[2] and box[1] < other[3] and other[1] < box[3]:
+                    del merged[i]
+                    box = (min(box[0], other[0]), min(box[1], other[1]),
+                           max(box[2], other[2]), max(box[3], other[3]))
+                    break
+            else:
+                break
+        merged.append(box)
+    return merged
+
+
+class PdfiumRasteriser:
+    """Renders in process with pypdfium2: no temp file, no subprocess"""
+
+    name = "pypdfium2"
+
+    def __init__(self):
+        import pypdfium2
+        self._pdfium = pypdfium2
+
+    def render(self, pdf, dpi, transparent=False):
+        """First page of the PDF bytes as a PIL image at the given resolution"""
+        document = self._pdfium.PdfDocument(pdf)
+        try:
+            page = document[0]
+            try:
+                fill = (255, 255, 255, 0) if transparent else (255, 255, 255, 255)
+                return page.render(scale=dpi / 72, fill_color=fill).to_pil()
+            finally:
+                page.close()
+        finally:
+            document.close()
+
+
+    def render_regions(self, pdf, dpi):
+        """The painted parts of the first page as ((left, top), RGBA image) pairs, in page pixels
+
+        Each page object's bounds, padded by REGION_PADDING and merged
+        where they overlap, are rendered on a transparent background. The
+        crops sit on the same pixel grid as a full render, so they can be
+        pasted onto one.
+        """
+        document = self._pdfium.PdfDocument(pdf)
+        try:
+            page = document[0]
+            try:
+                scale = dpi / 72
+                pad = math.ceil(REGION_PADDING * scale)
+                page_height = page.get_height()
+                width = math.ceil(page.get_width() * scale)
+                height = math.ceil(page_height * scale)
+                boxes = []
+                for obj in page.get_objects(max_depth=0):
+                    left, bottom, right, top = obj.get_bounds()
+                    boxes.append((
+                        max(0, math.floor(left * scale) - pad),
+                        max(0, math.floor((page_height - top) * scale) - pad),
+                        min(width, math.ceil(right * scale) + pad),
+                        min(height, math.ceil((page_height - bottom) * scale) + pad),
+                    ))
+                regions = []
+                for left, top, right, bottom in _merge_boxes(boxes):
+                    if right <= left or bottom <= top:
+                        continue
+                    # pdfium rounds crop margins up to whole pixels; half a pixel
+                    # less than the margin wanted rounds up to exactly it
+                    crop = [(margin - 0.5) / scale
+                            for margin in (left, height - bottom, width - right, top)]
+                    image = page.render(scale=scale, crop=crop, fill_color=(255, 255, 255, 0))
+                    regions.append(((left, top), image.to_pil()))
+                return regions
+            finally:
+                page.close()
+        finally:
+            document.close()
+
+
+class Pdf2ImageRasteriser:
+    """Fallback through pdf2image; avoids the temp file but still runs poppler"""
+
+    name = "pdf2image"
+
+    def __init__(self):
+        from pdf2image import convert_from_bytes
+        self._convert = convert_from_bytes
+
+    def render(self, pdf, dpi, transparent=False):
+        """First page of the PDF bytes as a PIL image at the given resolution"""
+        images = self._convert(pdf, dpi=dpi, first_page=1, last_page=1,
+                               fmt="png" if transparent else "ppm", transparent=transparent)
+        if not images:
+            raise ValueError("Failed to convert PDF to image - no images returned")
+        return images[0]
+
+
+# Backends in order of preference; register_backend adds more
+BACKENDS = OrderedDict((cls.name, cls) for cls in (PdfiumRasteriser, Pdf2ImageRasteriser))
+
+_rasterisers = {}
+
+# pdfium is not thread-safe, and the preview worker and the startup
+# warm-up can both rasterise; backends are created and run under this lock
+_lock = threading.RLock()
+
+
+def register_backend(name, factory, first=False):
+    """Make a rasteriser available
+
+    factory() returns an object with render(pdf, dpi, transparent=False);
+    transparent=True leaves unpainted areas with zero alpha. It may also
+    have render_regions(pdf, dpi), as PdfiumRasteriser does.
+    """
+    with _lock:
+        BACKENDS[name] = factory
+        if first:
+            BACKENDS.move_to_end(name, last=False)
+        _rasterisers.pop(name, None)
+
+
+def get_rasteriser(backend=None):
+    """The named rasteriser, or the first backend whose dependencies import"""
+    with _lock:
+        names = [backend] if backend else list(BACKENDS)
+        errors = []
+        for name in names:
+            if name not in BACKENDS:
+                raise ValueError(f"Unknown rasteriser: {name}")
+            if name not in _rasterisers:
+                try:
+                    _rasterisers[name] = BACKENDS[name]()
+                except ImportError as e:
+                    errors.append(f"{name}: {e}")
+                    continue
+            return _rasterisers[name]
+    raise RuntimeError("No PDF rasteriser available (" + "; ".join(errors) + ")")
+
+
+def rasterise_pdf(pdf, dpi=PREVIEW_DPI, backend=None, transparent=False):
+    """Render the first page of a PDF held in memory to a PIL image; one thread at a time"""
+    with _lock:
+        rasteriser = get_rasteriser(backend)
+        with timed("rasterise"):
+            return rasteriser.render(pdf, dpi, transparent=transparent)
+
+
+def rasterise_regions(pdf, dpi=PREVIEW_DPI, backend=None):
+    """The painted parts of a PDF's first page, as ((left, top), RGBA image) pairs in page pixels
+
+    Only the areas the page paints are rendered, on a transparent
+    background; a backend that cannot do that renders the whole page as
+    one region.
+    """
+    with _lock:
+        rasteriser = get_rasteriser(backend)
+        with timed("rasterise"):
+            if hasattr(rasteriser, "render_regions"):
+                return rasteriser.render_regions(pdf, dpi)
+            return [((0, 0), rasteriser.render(pdf, dpi, transparent=True).convert("RGBA"))]
@@ -0,0 +1,109 @@
+"""Plain data passed into the rendering engine"""
+import hashlib
+import os
+from collections import namedtuple
+from datetime import datetime
+
+
+# One certificate's worth of field values, as typed in the UI or read from a roster row.
+# A roster fills in display_date (the date as printed) and filename (a unique
+# output file name) up front; left empty, they are worked out per record
+CertificateRecord = namedtuple(
+    "CertificateRecord",
+    ["name", "course", "date", "description", "display_date", "filename"],
+    defaults=("", "", ""),
+)
+
+# Uploaded images shared by every certificate in a run
+RenderAssets = namedtuple(
+    "RenderAssets",
+    ["logo_path", "signature_path"],
+    defaults=("", ""),
+)
+
+
+# Dates as stored and as printed on certificates
+DATE_FORMAT = "%Y-%m-%d"
+DISPLAY_DATE_FORMAT = "%B %d, %Y"
+
+
+def format_date(raw_date):
+    """Turn a yyyy-mm-dd date into its display form, leaving anything else as-is"""
+    try:
+        date_obj = datetime.strptime(raw_date, DATE_FORMAT)
+        return date_obj.strftime(DISPLAY_DATE_FORMAT)
+    except (TypeError, ValueError):
+        return raw_date
+
+
+# Verification IDs are a keyed hash of the recipient, course and date, so the
+# same certificate gets the same ID in every process, run and machine. Set
+# ACCREDIFY_ID_KEY to make IDs unguessable without the key.
+ID_KEY_ENV = "ACCREDIFY_ID_KEY"
+DEFAULT_ID_KEY = "accredify-suite"
+
+# 12 Crockford base32 characters (the digest's first 60 bits), shown as XXXX-XXXX-XXXX
+ID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+# Every two-character combination, so an ID is six table lookups
+_ID_PAIRS = [a + b for a in ID_ALPHABET for b in ID_ALPHABET]
+
+
+def _id_key(key=None):
+    key = key or os.environ.get(ID_KEY_ENV) or DEFAULT_ID_KEY
+    return key.encode('utf-8') if isinstance(key, str) else key
+
+
+def _identity_digests(records, key):
+    """128-bit keyed digest of each record's name, course and date"""
+    blake2b = hashlib.blake2b
+    return [
+        blake2b(
+            f"{record.name}\x1f{record.course}\x1f{record.date}".encode('utf-8'),
+            key=key, digest_size=16,
+        ).digest()
+        for record in records
+    ]
+
+
+def _format_id(digest):
+    value = int.from_bytes(digest[:8], 'big') >> 4
+    pairs = _ID_PAIRS
+    return (f"{pairs[value >> 50]}{pairs[(value >> 40) & 1023]}-"
+            f"{pairs[(value >> 30) & 1023]}{pairs[(value >> 20) & 1023]}-"
+            f"{pairs[(value >> 10) & 1023]}{pairs[value & 1023]}")
+
+
+def verification_id(record, key=None):
+    """Build the verification ID shown in the footer and QR payload"""
+    return _format_id(_identity_digests([record], _id_key(key))[0])
+
+
+class VerificationIdChecker:
+    """Catches verification ID collisions a row at a time, as a roster streams past
+
+    Only the digests seen so far are kept, so a roster can be checked
+    while it is being rendered instead of in a pass of its own.
+    """
+
+    def __init__(self, key=None):
+        self._key = _id_key(key)
+        self._seen = {}
+
+    def check(self, index, record):
+        """Index of an earlier row with the same ID, or None; ValueError on a collision
+
+        Two rows for the same recipient, course and date share an ID by
+        design. Two different certificates sharing an ID are a collision.
+        """
+        digest = _identity_digests([record], self._key)[0]
+        # The ID is the digest's first 60 bits
+        first = self._seen.setdefault(int.from_bytes(digest[:8], 'big') >> 4, (digest, index))
+        if first[1] == index:
+            return None
+        if first[0] != digest:
+            raise ValueError(
+                f"Verification ID collision between rows {first[1] + 1} and {index + 1} "
+                f"({_format_id(digest)}); set a different {ID_KEY_ENV}"
+            )
+        return first[1]
+
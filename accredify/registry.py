@@ -0,0 +1,108 @@
+"""SQLite registry of issued certificates, for verification lookups"""
+import hashlib
+import os
+import sqlite3
+from collections import namedtuple
+from datetime import datetime
+
+
+# Rows buffered before they are written in one transaction
+REGISTRY_BATCH_SIZE = 1000
+
+# One issued certificate; output is the file (or archive member) it was written to
+RegistryEntry = namedtuple(
+    "RegistryEntry", ["cert_id", "name", "course", "date", "template", "output_hash", "output", "issued_at"]
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS certificates (
+    cert_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    course TEXT NOT NULL,
+    date TEXT NOT NULL,
+    template TEXT NOT NULL,
+    output_hash TEXT NOT NULL,
+    output TEXT NOT NULL,
+    issued_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS certificates_cert_id ON certificates (cert_id);
+CREATE INDEX IF NOT EXISTS certificates_name ON certificates (name);
+"""
+
+
+def default_registry_path():
+    """Registry used when none is given: $ACCREDIFY_REGISTRY or ~/.accredify/registry.db"""
+    return os.environ.get("ACCREDIFY_REGISTRY") or os.path.join(
+        os.path.expanduser("~"), ".accredify", "registry.db"
+    )
+
+
+def output_hash(pdf):
+    """Digest recorded for a certificate's PDF bytes"""
+    return hashlib.sha256(pdf).hexdigest()
+
+
+class VerificationRegistry:
+    """Issued certificates, looked up by verification ID or recipient name
+
+    add() only buffers; rows reach the database REGISTRY_BATCH_SIZE at a
+    time in a single transaction, and on flush() or close(), so recording
+    a batch costs next to nothing per certificate. Use it from one thread.
+    """
+
+    def __init__(self, path=None, batch_size=REGISTRY_BATCH_SIZE):
+        self.path = path or default_registry_path()
+        self.batch_size = batch_size
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._pending = []
+
+    def add(self, cert_id, record, template, output_hash, output=""):
+        """Queue one issued certificate"""
+        self._pending.append(RegistryEntry(
+            str(cert_id), str(record.name), str(record.course), str(record.date),
+            template, output_hash, output, datetime.now().isoformat(timespec="seconds"),
+        ))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write every queued certificate in one transaction"""
+        if not self._pending:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO certificates VALUES (?, ?, ?, ?, ?, ?, ?, ?)", self._pending
+            )
+        self._pending = []
+
+    def _select(self, where, value):
+        self.flush()
+        rows = self._conn.execute(
+            f"SELECT {', '.join(RegistryEntry._fields)} FROM certificates WHERE {where} = ?"
+            " ORDER BY rowid", (value,)
+        )
+        return [RegistryEntry(*row) for row in rows]
+
+    def lookup(self, cert_id):
+        """Certificates issued under a verification ID"""
+        return self._select("cert_id", cert_id)
+
+    def find_by_name(self, name):
+        """Certificates issued to a recipient"""
+        return self._select("name", name)
+
+    def close(self):
+        """Flush and close the database"""
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
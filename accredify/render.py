@@ -0,0 +1,18 @@
+"""Headless entry point: one record in, PDF bytes out"""
+from io import BytesIO
+
+from .records import RenderAssets
+from .templates import TEMPLATES, DEFAULT_TEMPLATE
+
+
+def render_certificate(record, template=DEFAULT_TEMPLATE, assets=None):
+    """Render a single certificate and return the PDF bytes
+
+    Safe to call from several threads at once: every call builds its own
+    canvas and touches no shared state.
+    """
+    if template not in TEMPLATES:
+        raise ValueError(f"Unknown template: {template}")
+    buffer = BytesIO()
+    TEMPLATES[template](buffer, record, assets or RenderAssets())
+    return buffer.getvalue()
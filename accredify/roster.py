@@ -0,0 +1,122 @@
+"""Reading participant rosters (CSV/Excel) into certificate records
+
+pandas is imported when a roster is first read, not with this module,
+so importing it costs nothing until a batch actually runs.
+"""
+from itertools import islice
+
+from .normalise import FilenameAllocator, normalise_frame
+from .records import CertificateRecord
+
+
+REQUIRED_COLUMNS = ['Name', 'Course', 'Date']
+RECORD_COLUMNS = REQUIRED_COLUMNS + ['Description']
+
+# Rows parsed per CSV chunk when streaming a roster
+ROSTER_CHUNKSIZE = 10000
+
+
+def read_roster(path):
+    """Load a CSV or Excel roster into a DataFrame"""
+    import pandas as pd
+
+    if _is_csv(path):
+        return pd.read_csv(path)
+    return pd.read_excel(path)
+
+
+def missing_columns(df):
+    """List the required columns the roster does not have"""
+    return [col for col in REQUIRED_COLUMNS if col not in df.columns]
+
+
+def _is_csv(path):
+    return path.lower().endswith('.csv')
+
+
+def _is_xlsx(path):
+    return path.lower().endswith(('.xlsx', '.xlsm'))
+
+
+class RosterStream:
+    """A roster read lazily, one bounded chunk at a time
+
+    Iterating yields CertificateRecords in file order without ever holding
+    the whole file: CSV is parsed ROSTER_CHUNKSIZE rows at a time, XLSX
+    through openpyxl's read-only row iterator. Other Excel formats have
+    no streaming reader and are loaded whole. Every chunk is normalised
+    (see normalise_frame) before any record is built, so records arrive
+    with tidy text, readable dates pre-formatted for printing and a
+    unique output file name.
+    """
+
+    def __init__(self, path, chunksize=ROSTER_CHUNKSIZE):
+        self.path = path
+        self.chunksize = chunksize
+        self.columns = self._read_header()
+
+    def _read_header(self):
+        if _is_csv(self.path):
+            import pandas as pd
+            return list(pd.read_csv(self.path, nrows=0).columns)
+        if _is_xlsx(self.path):
+            return list(next(self._xlsx_rows(), ()))
+        return list(read_roster(self.path).columns)
+
+    def _xlsx_rows(self):
+        from openpyxl import load_workbook
+        workbook = load_workbook(self.path, read_only=True, data_only=True)
+        try:
+            yield from workbook.worksheets[0].iter_rows(values_only=True)
+        finally:
+            workbook.close()
+
+    def _raw_frames(self):
+        """The roster's RECORD_COLUMNS as read, up to chunksize rows at a time"""
+        import pandas as pd
+
+        if _is_csv(self.path):
+            has_description = 'Description' in self.columns
+            usecols = RECORD_COLUMNS if has_description else REQUIRED_COLUMNS
+            for chunk in pd.read_csv(self.path, usecols=usecols, dtype=str,
+                                     keep_default_na=False, chunksize=self.chunksize):
+                if not has_description:
+                    chunk['Description'] = ''
+                yield chunk[RECORD_COLUMNS]
+        elif _is_xlsx(self.path):
+            rows = self._xlsx_rows()
+            header = list(next(rows, ()))
+            positions = [header.index(col) if col in header else None for col in RECORD_COLUMNS]
+            records = (
+                tuple(None if pos is None or pos >= len(row) else row[pos] for pos in positions)
+                for row in rows
+                if any(value is not None for value in row)
+            )
+            while True:
+                batch = list(islice(records, self.chunksize))
+                if not batch:
+                    return
+                yield pd.DataFrame(batch, columns=RECORD_COLUMNS, dtype=object)
+        else:
+            frame = read_roster(self.path).reindex(columns=RECORD_COLUMNS)
+            for start in range(0, len(frame), self.chunksize):
+                yield frame.iloc[start:start + self.chunksize]
+
+    def frames(self):
+        """The roster as normalised DataFrames of up to chunksize rows, with NORMALISED_COLUMNS
+
+        Cells are strings, '' where empty. For checks that run column-wise
+        rather than record by record.
+        """
+        filenames = FilenameAllocator()
+        for frame in self._raw_frames():
+            yield normalise_frame(frame, filenames)
+
+    def __iter__(self):
+        for frame in self.frames():
+            yield from map(CertificateRecord._make, frame.itertuples(index=False, name=None))
+
+
+def open_roster(path, chunksize=ROSTER_CHUNKSIZE):
+    """Open a roster for streaming; check missing_columns(roster) before iterating"""
+    return RosterStream(path, chunksize=chunksize)
@@ -0,0 +1,707 @@
+"""Certificate templates drawn straight onto a reportlab canvas"""
+import logging
+from datetime import datetime
+
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.pdfgen import canvas
+from reportlab.lib.colors import HexColor
+from reportlab.lib.rl_accel import fp_str
+from reportlab.pdfbase.pdfdoc import (
+    PDFArray, PDFDictionary, PDFName, PDFObjectReference, PDFResourceDictionary, PDFStream
+)
+
+from .assets import image_cache
+from .qr import draw_qr_code
+from .layers import static_layers
+from .layout import FitBox, ParagraphBox, draw_paragraph
+from .records import RenderAssets, format_date, verification_id
+from .timing import timed
+
+logger = logging.getLogger(__name__)
+
+
+# Academic parchment texture: 2pt dots on a 3pt grid wherever (x + y) % 6 == 0,
+# which repeats every 6pt in both directions
+PARCHMENT_TILE_SIZE = 6
+PARCHMENT_TEXTURE_COLOR = HexColor("#FAEBD7")
+
+_parchment_tile = None
+
+# Logos and signatures are embedded at no more than this resolution
+EMBED_DPI = 300
+
+
+def _parchment_tile_stream():
+    """Content stream for one texture tile, built once per process"""
+    global _parchment_tile
+    if _parchment_tile is None:
+        color = PARCHMENT_TEXTURE_COLOR
+        _parchment_tile = (
+            f"{fp_str(color.red, color.green, color.blue)} rg "
+            f"0 0 2 2 re 3 3 2 2 re f"
+        )
+    return _parchment_tile
+
+
+def _draw_parchment_texture(c, width, height):
+    """Fill the page with the parchment texture as a tiling pattern
+
+    The pattern and the form XObject that paints it are added to each
+    document once; every page then references the form.
+    """
+    form_name = "ParchmentTexture"
+    if not c._doc.hasForm(form_name):
+        tile = PARCHMENT_TILE_SIZE
+        pattern = PDFStream(PDFDictionary({
+            "Type": PDFName("Pattern"),
+            "PatternType": 1,
+            "PaintType": 1,
+            "TilingType": 1,
+            "BBox": PDFArray([0, 0, tile, tile]),
+            "XStep": tile,
+            "YStep": tile,
+            "Resources": PDFDictionary({}),
+        }), content=_parchment_tile_stream())
+        c._doc.Reference(pattern, "ParchmentTile")
+
+        resources = PDFResourceDictionary()
+        resources.Pattern = {"ParchmentTile": PDFObjectReference("ParchmentTile")}
+        c.beginForm(form_name)
+        c.addLiteral(f"/Pattern cs /ParchmentTile scn 0 0 {fp_str(width, height)} re f")
+        c.endForm(Resources=resources)
+    c.doForm(form_name)
+
+
+def _embed_image(path, width, height):
+    """Cached image reader for a width x height pt box, shrunk to EMBED_DPI"""
+    size = (round(width * EMBED_DPI / 72), round(height * EMBED_DPI / 72))
+    with timed("image_load"):
+        return image_cache.reader(path, size)
+
+
+def _image_loads(path, width, height):
+    """True if the static layer could embed the image at path (it logs any error)"""
+    if not path:
+        return False
+    try:
+        _embed_image(path, width, height)
+        return True
+    except Exception:
+        return False
+
+
+def _draw_qr(c, verification_data, x, y, size, logo_path):
+    """Draw a QR code for the verification data at the given position"""
+    try:
+        with timed("qr"):
+            draw_qr_code(c, verification_data, x, y, size, logo_path=logo_path)
+    except Exception as e:
+        logger.warning("QR code generation error: %s", e)
+
+
+class CertificateTemplate:
+    """A certificate layout split into a static layer and a per-record layer
+
+    The static layer (backgrounds, borders, fixed wording, logo and signature)
+    is compiled once per template and asset set and painted as a form XObject;
+    only the dynamic layer (name, course, date, description, QR) is drawn for
+    each record.
+    """
+
+    def __init__(self, name, pagesize, draw_static, draw_dynamic, text_boxes=None):
+        self.name = name
+        self.pagesize = pagesize
+        self.draw_static = draw_static
+        self.draw_dynamic = draw_dynamic
+        # Field name -> FitBox/ParagraphBox the dynamic layer fits that text into
+        self.text_boxes = text_boxes or {}
+
+    def draw_page(self, c, record, assets=RenderAssets()):
+        """Draw one certificate onto the current page of a canvas"""
+        width, height = self.pagesize
+        with timed("canvas_draw"):
+            static_layers.get(self, assets).draw(c)
+            self.draw_dynamic(c, width, height, record, assets)
+
+    def __call__(self, output, record, assets=RenderAssets()):
+        """Render a single-page certificate into output"""
+        c = canvas.Canvas(output, pagesize=self.pagesize)
+        self.draw_page(c, record, assets)
+        with timed("canvas_save"):
+            c.save()
+
+    def render_layer(self, output, layer, record=None, assets=RenderAssets()):
+        """Render just the "static" or the "dynamic" layer as a one-page PDF
+
+        The live preview rasterises the two separately and composites them;
+        together they draw exactly what draw_page does.
+        """
+        width, height = self.pagesize
+        if layer not in ("static", "dynamic"):
+            raise ValueError(f"Unknown layer: {layer}")
+        c = canvas.Canvas(output, pagesize=self.pagesize)
+        with timed("canvas_draw"):
+            if layer == "static":
+                static_layers.get(self, assets).draw(c)
+            else:
+                self.draw_dynamic(c, width, height, record, assets)
+        with timed("canvas_save"):
+            c.save()
+
+
+def _classic_static(c, width, height, assets):
+    """Classic Elegance: background, border, fixed wording, logo and signature"""
+    # Background design with subtle texture
+    c.setFillColor(HexColor("#F9F5E8"))
+    c.rect(0, 0, width, height, fill=True, stroke=False)
+
+    # Add decorative border elements
+    border_color = HexColor("#8B7355")
+    c.setStrokeColor(border_color)
+    c.setLineWidth(10)
+    c.roundRect(30, 30, width-60, height-60, radius=10, fill=False, stroke=True)
+
+    # Add subtle watermark
+    c.setFillColor(HexColor("#F0E6D2"))
+    c.setFont("Helvetica-Bold", 120)
+    c.drawCentredString(width//2, height//2-60, "CERTIFICATE")
+    c.setFillColor(HexColor("#333333"))
+
+    # Header with elegant typography
+    c.setFont("Helvetica-Bold", 42)
+    c.setFillColor(HexColor("#2C3E50"))
+    c.drawCentredString(width//2, height-120, "CERTIFICATE OF ACHIEVEMENT")
+
+    # Decorative line with accent
+    c.setStrokeColor(HexColor("#E74C3C"))
+    c.setLineWidth(3)
+    c.line(width//2-180, height-150, width//2+180, height-150)
+
+    # Main content
+    c.setFont("Helvetica", 20)
+    c.drawCentredString(width//2, height-200, "This is to certify that")
+
+    # Course description
+    c.setFont("Helvetica", 18)
+    c.setFillColor(HexColor("#333333"))
+
+    text = f"has successfully completed the course of study in"
+    draw_paragraph(c, 100, height-320, width-200, text, 18, 22)
+
+    # Logo and signature area; their captions are drawn with the record (see _classic_dynamic)
+    y_pos = height-550
+    if assets.logo_path:
+        try:
+            logo = _embed_image(assets.logo_path, 150, 100)
+            c.drawImage(logo, 100, y_pos, width=150, height=100, preserveAspectRatio=True, mask='auto')
+            c.setStrokeColor(border_color)
+            c.setLineWidth(0.5)
+            c.line(100, y_pos-10, 250, y_pos-10)
+        except Exception as e:
+            logger.warning("Error loading logo: %s", e)
+
+    if assets.signature_path:
+        try:
+            signature = _embed_image(assets.signature_path, 150, 80)
+            c.drawImage(signature, width-250, y_pos, width=150, height=80, preserveAspectRatio=True, mask='auto')
+            c.setStrokeColor(border_color)
+            c.setLineWidth(0.5)
+            c.line(width-250, y_pos-10, width-100, y_pos-10)
+        except Exception as e:
+            logger.warning("Error loading signature: %s", e)
+
+    # Footer
+    c.setFont("Helvetica", 10)
+    c.setFillColor(HexColor("#666666"))
+    c.drawCentredString(width//2, 50, "This certificate is awarded as recognition of professional achievement")
+
+
+# Boxes the record's text is fitted into; the roster pre-flight check measures against these too
+_CLASSIC_BOXES = {
+    "name": FitBox(("name",), lambda r: r.name.upper(), "Times-BoldItalic", 36, landscape(A4)[0]-200),
+    "course": FitBox(("course",), lambda r: f"«{r.course}»", "Helvetica-Bold", 22, landscape(A4)[0]-200),
+    "description": ParagraphBox(("description",), lambda r: r.description, "Helvetica", 16, 20,
+                                landscape(A4)[0]-200, 40),
+}
+
+
+def _classic_dynamic(c, width, height, record, assets):
+    """Classic Elegance: recipient, course, description, date and QR"""
+    name = record.name
+    course = record.course
+    date = record.display_date or format_date(record.date)
+    description = record.description
+
+    # Recipient name with elegant styling
+    c.setFillColor(HexColor("#8B7355"))
+    _CLASSIC_BOXES["name"].draw(c, width//2, height-260, record)
+
+    c.setFillColor(HexColor("#2C3E50"))
+    _CLASSIC_BOXES["course"].draw(c, width//2, height-360, record)
+
+    if description:
+        c.setFont("Helvetica", 16)
+        c.setFillColor(HexColor("#555555"))
+        _CLASSIC_BOXES["description"].draw(c, 100, height-400, record)
+
+    # Date
+    c.setFont("Helvetica-Oblique", 16)
+    c.drawCentredString(width//2, height-450, f"Awarded this {date}")
+
+    # Seal and signature captions share the date's colour, so they are drawn
+    # here rather than in the static layer; only under images that loaded
+    y_pos = height-550
+    c.setFont("Helvetica", 10)
+    if _image_loads(assets.logo_path, 150, 100):
+        c.drawString(100, y_pos-25, "Official Seal")
+    if _image_loads(assets.signature_path, 150, 80):
+        c.drawCentredString(width-175, y_pos-25, "Authorized Signature")
+
+    # Generate verification data
+    verification_data = f"""
+    Certificate Verification
+    Name: {name}
+    Course: {course}
+    Date: {date}
+    ID: {verification_id(record)}
+    """
+
+    # Generate and add QR code
+    _draw_qr(c, verification_data, width-120, 50, 80, assets.logo_path)
+
+
+def _modern_static(c, width, height, assets):
+    """Modern Professional: gradient, header block, fixed wording, logo and signature"""
+    # Convert all dimensions to integers
+    width = int(width)
+    height = int(height)
+
+    # Modern gradient background
+    c.linearGradient(
+        x0=0, y0=0,
+        x1=width, y1=height,
+        colors=[HexColor("#FFFFFF"), HexColor("#F8F9FA")],
+        positions=[0, 1]
+    )
+
+    # Header with color block - ensure integer dimensions
+    header_height = 150
+    c.setFillColor(HexColor("#2C3E50"))
+    c.rect(0, height-header_height, width, header_height, fill=True, stroke=False)
+
+    # Decorative accent
+    c.setFillColor(HexColor("#E74C3C"))
+    c.rect(0, height-header_height, width, 8, fill=True, stroke=False)
+
+    # Title with modern typography
+    c.setFont("Helvetica-Bold", 34)
+    c.setFillColor(HexColor("#FFFFFF"))
+    c.drawCentredString(width//2, height-80, "CERTIFICATE")
+
+    # Subtitle
+    c.setFont("Helvetica", 14)
+    c.setFillColor(HexColor("#BDC3C7"))
+    c.drawCentredString(width//2, height-110, "OF PROFESSIONAL ACHIEVEMENT")
+
+    # Main content area with subtle shadow - ensure integer dimensions
+    content_x = 40
+    content_y = 180
+    content_width = width-80
+    content_height = height-380
+    c.setFillColor(HexColor("#FFFFFF"))
+    c.rect(content_x, content_y, content_width, content_height, fill=True, stroke=False)
+
+    # Achievement statement
+    c.setFont("Helvetica", 14)
+    c.setFillColor(HexColor("#7F8C8D"))
+    c.drawCentredString(width//2, height-350, "in recognition of outstanding performance and dedication")
+
+    # Logo and signature, captioned in the accent colour
+    c.setFillColor(HexColor("#E74C3C"))
+    y_pos = height-480
+    if assets.logo_path:
+        try:
+            logo = _embed_image(assets.logo_path, 120, 80)
+            c.drawImage(logo, 100, y_pos, width=120, height=80, preserveAspectRatio=True, mask='auto')
+            c.setStrokeColor(HexColor("#BDC3C7"))
+            c.setLineWidth(0.5)
+            c.line(100, y_pos-10, 220, y_pos-10)
+            c.setFont("Helvetica", 10)
+            c.drawString(100, y_pos-25, "Issuing Organization")
+        except Exception as e:
+            logger.warning("Error loading logo: %s", e)
+
+    if assets.signature_path:
+        try:
+            signature = _embed_image(assets.signature_path, 150, 60)
+            c.drawImage(signature, width-250, y_pos, width=150, height=60, preserveAspectRatio=True, mask='auto')
+            c.setStrokeColor(HexColor("#BDC3C7"))
+            c.setLineWidth(0.5)
+            c.line(width-250, y_pos-10, width-100, y_pos-10)
+            c.setFont("Helvetica", 10)
+            c.drawCentredString(width-175, y_pos-25, "Authorized Signatory")
+        except Exception as e:
+            logger.warning("Error loading signature: %s", e)
+
+    # Footer
+    c.setFont("Helvetica", 9)
+    c.setFillColor(HexColor("#7F8C8D"))
+    c.drawCentredString(width//2, 30, "© " + datetime.now().strftime("%Y") + " Professional Certification Board. All rights reserved.")
+
+
+def _modern_statement(record):
+    text = f"has successfully completed the {record.course} program"
+    if record.description:
+        text += f" with demonstrated excellence in {record.description}"
+    return text
+
+
+_MODERN_BOXES = {
+    "name": FitBox(("name",), lambda r: r.name, "Helvetica-Bold", 28, int(A4[0])-200),
+    "course": ParagraphBox(("course", "description"), _modern_statement, "Helvetica", 16, 22,
+                           int(A4[0])-200, 66),
+}
+
+
+def _modern_dynamic(c, width, height, record, assets):
+    """Modern Professional: recipient, course paragraph, date, ID and QR"""
+    width = int(width)
+    height = int(height)
+    name = record.name
+    course = record.course
+    date = record.display_date or format_date(record.date)
+    description = record.description
+
+    # Recipient name
+    c.setFillColor(HexColor("#2C3E50"))
+    _MODERN_BOXES["name"].draw(c, width//2, height-200, record)
+
+    # Course description
+    c.setFont("Helvetica", 16)
+    c.setFillColor(HexColor("#333333"))
+    _MODERN_BOXES["course"].draw(c, 100, height-280, record)
+
+    # Date
+    c.setFont("Helvetica-Bold", 14)
+    c.setFillColor(HexColor("#E74C3C"))
+    c.drawCentredString(width//2, height-390, f"Completed on: {date}")
+
+    # Verification ID
+    cert_id = verification_id(record)
+    c.setFont("Helvetica", 8)
+    c.setFillColor(HexColor("#95A5A6"))
+    c.drawRightString(width-40, 40, f"ID: {cert_id}")
+
+    # Generate verification data
+    verification_data = f"""
+    Certificate Verification
+    Name: {name}
+    Course: {course}
+    Date: {date}
+    ID: {cert_id}
+    """
+
+    # Generate and add QR code
+    _draw_qr(c, verification_data, width-120, 50, 80, assets.logo_path)
+
+
+def _academic_static(c, width, height, assets):
+    """Academic Diploma: parchment, border, seal, fixed wording and signature lines"""
+    # Parchment-style background
+    c.setFillColor(HexColor("#FDF5E6"))
+    c.rect(0, 0, width, height, fill=True, stroke=False)
+
+    # Add subtle texture
+    _draw_parchment_texture(c, width, height)
+
+    # Ornate border
+    border_color = HexColor("#8B4513")
+    c.setStrokeColor(border_color)
+    c.setLineWidth(8)
+    c.roundRect(40, 40, width-80, height-80, radius=15, fill=False, stroke=True)
+
+    # University-style seal at top
+    c.setFillColor(HexColor("#8B4513"))
+    c.circle(width//2, height-100, 50, fill=True, stroke=False)
+    c.setFillColor(HexColor("#FDF5E6"))
+    c.setFont("Times-Bold", 16)
+    c.drawCentredString(width//2, height-100, "SEAL")
+
+    # Title with academic styling
+    c.setFillColor(HexColor("#8B4513"))
+    c.setFont("Times-Bold", 36)
+    c.drawCentredString(width//2, height-180, "DIPLOMA")
+
+    # Latin motto
+    c.setFont("Times-Italic", 12)
+    c.drawCentredString(width//2, height-210, "Scientia est potentia")
+
+    # Main content
+    c.setFont("Times-Roman", 18)
+    c.setFillColor(HexColor("#000000"))
+    c.drawCentredString(width//2, height-270, "This certifies that")
+
+    text = f"has satisfactorily completed all requirements for"
+    draw_paragraph(c, 100, height-370, width-200, text, 18, 22)
+
+    # Signature lines
+    c.setStrokeColor(border_color)
+    c.setLineWidth(1)
+    c.line(width//4, height-550, width//4+200, height-550)
+    c.line(3*width//4-200, height-550, 3*width//4, height-550)
+
+    c.setFont("Times-Roman", 12)
+    c.drawCentredString(width//4+100, height-570, "Dean of Studies")
+    c.drawCentredString(3*width//4-100, height-570, "University President")
+
+
+_ACADEMIC_BOXES = {
+    "name": FitBox(("name",), lambda r: r.name.upper(), "Times-Bold", 28, landscape(A4)[0]-200),
+    "course": FitBox(("course",), lambda r: r.course, "Times-Bold", 22, landscape(A4)[0]-200),
+    "description": ParagraphBox(("description",), lambda r: r.description, "Helvetica", 16, 20,
+                                landscape(A4)[0]-200, 40),
+}
+
+
+def _academic_dynamic(c, width, height, record, assets):
+    """Academic Diploma: recipient, program, description, date and QR"""
+    name = record.name
+    course = record.course
+    date = record.display_date or format_date(record.date)
+    description = record.description
+
+    c.setFillColor(HexColor("#8B4513"))
+    _ACADEMIC_BOXES["name"].draw(c, width//2, height-320, record)
+
+    c.setFillColor(HexColor("#000000"))
+    _ACADEMIC_BOXES["course"].draw(c, width//2, height-410, record)
+
+    if description:
+        c.setFont("Times-Roman", 16)
+        _ACADEMIC_BOXES["description"].draw(c, 100, height-450, record)
+
+    # Date and signatures
+    c.setFont("Times-Roman", 16)
+    c.drawCentredString(width//2, height-500, f"Given this {date}")
+
+    # Generate verification data
+    verification_data = f"""
+    Diploma Verification
+    Name: {name}
+    Program: {course}
+    Date: {date}
+    ID: {verification_id(record)}
+    """
+
+    # Generate and add QR code
+    _draw_qr(c, verification_data, width-120, 50, 80, assets.logo_path)
+
+
+def _corporate_static(c, width, height, assets):
+    """Corporate Achievement: header branding, fixed wording, signature lines and footer"""
+    # Corporate blue background
+    c.setFillColor(HexColor("#E6F2FF"))
+    c.rect(0, 0, width, height, fill=True, stroke=False)
+
+    # Header with company branding
+    c.setFillColor(HexColor("#003366"))
+    c.rect(0, height-100, width, 100, fill=True, stroke=False)
+
+    # Logo area
+    if assets.logo_path:
+        try:
+            logo = _embed_image(assets.logo_path, 120, 80)
+            c.drawImage(logo, width-150, height-90, width=120, height=80, preserveAspectRatio=True, mask='auto')
+        except Exception as e:
+            logger.warning("Error loading logo: %s", e)
+
+    c.setFont("Helvetica-Bold", 24)
+    c.setFillColor(HexColor("#FFFFFF"))
+    c.drawString(50, height-60, "CORPORATE TRAINING CERTIFICATION")
+
+    # Main content
+    c.setFillColor(HexColor("#000000"))
+    c.setFont("Helvetica", 16)
+    c.drawCentredString(width//2, height-180, "This is to certify that")
+
+    text = f"has successfully completed the corporate training program:"
+    draw_paragraph(c, 100, height-280, width-200, text, 16, 20)
+
+    # Signature area
+    c.setStrokeColor(HexColor("#003366"))
+    c.setLineWidth(1)
+    c.line(width//3, height-480, width//3+200, height-480)
+    c.line(2*width//3-200, height-480, 2*width//3, height-480)
+
+    c.setFont("Helvetica", 12)
+    c.drawCentredString(width//3+100, height-500, "Training Manager")
+    c.drawCentredString(2*width//3-100, height-500, "HR Director")
+
+    # Footer
+    c.setFont("Helvetica", 10)
+    c.setFillColor(HexColor("#666666"))
+    c.drawCentredString(width//2, 50, "This certificate verifies completion of required training hours")
+    c.drawCentredString(width//2, 30, "and demonstration of competency in the subject matter.")
+
+
+_CORPORATE_BOXES = {
+    "name": FitBox(("name",), lambda r: r.name.upper(), "Helvetica-Bold", 24, A4[0]-200),
+    "course": FitBox(("course",), lambda r: r.course, "Helvetica-Bold", 20, A4[0]-200),
+    "description": ParagraphBox(("description",), lambda r: r.description, "Helvetica", 14, 18,
+                                A4[0]-200, 36),
+}
+
+
+def _corporate_dynamic(c, width, height, record, assets):
+    """Corporate Achievement: certificate number, recipient, program, date and QR"""
+    name = record.name
+    course = record.course
+    date = record.display_date or format_date(record.date)
+    description = record.description
+
+    # Certificate number
+    cert_id = verification_id(record)
+    c.setFont("Helvetica", 10)
+    c.setFillColor(HexColor("#FFFFFF"))
+    c.drawRightString(width-50, height-70, f"CERT-{cert_id}")
+
+    c.setFillColor(HexColor("#003366"))
+    _CORPORATE_BOXES["name"].draw(c, width//2, height-230, record)
+
+    c.setFillColor(HexColor("#000000"))
+    _CORPORATE_BOXES["course"].draw(c, width//2, height-320, record)
+
+    if description:
+        c.setFont("Helvetica", 14)
+        _CORPORATE_BOXES["description"].draw(c, 100, height-360, record)
+
+    # Completion details
+    c.setFont("Helvetica", 14)
+    c.drawCentredString(width//2, height-420, f"Date of Completion: {date}")
+
+    # Generate verification data
+    verification_data = f"""
+    Corporate Certification
+    Name: {name}
+    Training: {course}
+    Completed: {date}
+    ID: {cert_id}
+    """
+
+    # Generate and add QR code
+    _draw_qr(c, verification_data, width-120, 50, 80, assets.logo_path)
+
+
+def _workshop_static(c, width, height, assets):
+    """Workshop Completion: colour bands, content card, fixed wording and signature"""
+    # Colorful modern background
+    colors = [HexColor("#FF9AA2"), HexColor("#FFB7B2"), HexColor("#FFDAC1"),
+              HexColor("#E2F0CB"), HexColor("#B5EAD7"), HexColor("#C7CEEA")]
+
+    for i in range(6):
+        c.setFillColor(colors[i])
+        c.rect(0, height//6*i, width, height//6, fill=True, stroke=False)
+
+    # White content area
+    c.setFillColor(HexColor("#FFFFFF"))
+    c.setStrokeColor(HexColor("#DDDDDD"))
+    c.setLineWidth(1)
+    c.roundRect(40, 40, width-80, height-80, 10, fill=True, stroke=True)
+
+    # Title
+    c.setFillColor(HexColor("#333333"))
+    c.setFont("Helvetica-Bold", 28)
+    c.drawCentredString(width//2, height-100, "WORKSHOP PARTICIPATION")
+
+    # Main content
+    c.setFont("Helvetica", 16)
+    c.drawCentredString(width//2, height-160, "This certificate is presented to")
+
+    text = f"for active participation in the workshop:"
+    draw_paragraph(c, 100, height-260, width-200, text, 16, 20)
+
+    # Signature area
+    if assets.signature_path:
+        try:
+            signature = _embed_image(assets.signature_path, 150, 60)
+            c.drawImage(signature, width//2-75, height-450, width=150, height=60, preserveAspectRatio=True, mask='auto')
+        except Exception as e:
+            logger.warning("Error loading signature: %s", e)
+
+    c.setStrokeColor(HexColor("#AAAAAA"))
+    c.setLineWidth(0.5)
+    c.line(width//2-100, height-450, width//2+100, height-450)
+    c.setFont("Helvetica", 12)
+    c.drawCentredString(width//2, height-480, "Workshop Facilitator")
+
+    # Verification QR code placeholder
+    c.setFillColor(HexColor("#EEEEEE"))
+    c.rect(width-100, 50, 80, 80, fill=True, stroke=False)
+    c.setFillColor(HexColor("#999999"))
+    c.setFont("Helvetica", 8)
+    c.drawCentredString(width-60, 70, "VERIFICATION")
+    c.drawCentredString(width-60, 60, "QR CODE")
+
+
+_WORKSHOP_BOXES = {
+    "name": FitBox(("name",), lambda r: r.name, "Helvetica-Bold", 24, A4[0]-200),
+    "course": FitBox(("course",), lambda r: r.course, "Helvetica-Bold", 20, A4[0]-200),
+    "description": ParagraphBox(("description",), lambda r: r.description, "Helvetica", 14, 18,
+                                A4[0]-200, 36),
+}
+
+
+def _workshop_dynamic(c, width, height, record, assets):
+    """Workshop Completion: recipient, workshop, description, date and QR"""
+    name = record.name
+    course = record.course
+    date = record.display_date or format_date(record.date)
+    description = record.description
+
+    c.setFillColor(HexColor("#FF6B6B"))
+    _WORKSHOP_BOXES["name"].draw(c, width//2, height-210, record)
+
+    c.setFillColor(HexColor("#333333"))
+    _WORKSHOP_BOXES["course"].draw(c, width//2, height-300, record)
+
+    if description:
+        c.setFont("Helvetica", 14)
+        _WORKSHOP_BOXES["description"].draw(c, 100, height-340, record)
+
+    # Date and location
+    c.setFont("Helvetica", 14)
+    c.drawCentredString(width//2, height-390, f"Completed on {date}")
+
+    # Generate and add actual QR code
+    verification_data = f"""
+    Workshop Certificate Verification
+    Name: {name}
+    Workshop: {course}
+    Date: {date}
+    """
+    _draw_qr(c, verification_data, width-100, 50, 80, assets.logo_path)
+
+
+generate_classic_certificate = CertificateTemplate(
+    "Classic Elegance", landscape(A4), _classic_static, _classic_dynamic, _CLASSIC_BOXES)
+generate_modern_certificate = CertificateTemplate(
+    "Modern Professional", A4, _modern_static, _modern_dynamic, _MODERN_BOXES)
+generate_academic_diploma = CertificateTemplate(
+    "Academic Diploma", landscape(A4), _academic_static, _academic_dynamic, _ACADEMIC_BOXES)
+generate_corporate_certificate = CertificateTemplate(
+    "Corporate Achievement", A4, _corporate_static, _corporate_dynamic, _CORPORATE_BOXES)
+generate_workshop_certificate = CertificateTemplate(
+    "Workshop Completion", A4, _workshop_static, _workshop_dynamic, _WORKSHOP_BOXES)
+
+# Template names as shown in the UI, in display order
+TEMPLATES = {
+    template.name: template for template in (
+        generate_classic_certificate,
+        generate_modern_certificate,
+        generate_academic_diploma,
+        generate_corporate_certificate,
+        generate_workshop_certificate,
+    )
+}
+
+DEFAULT_TEMPLATE = "Modern Professional"
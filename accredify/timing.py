@@ -0,0 +1,116 @@
+"""Lightweight per-stage timers, aggregated into histograms"""
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+
+# Histogram bucket upper bounds in seconds; a final +Inf bucket catches the rest
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Stages of the render path. canvas_draw includes the qr and image_load
+# time spent while drawing; file_write and fsync run on writer threads,
+# alongside the rendering; the others do not overlap
+STAGES = ("field_read", "qr", "image_load", "canvas_draw", "canvas_save", "rasterise", "canvas_update",
+          "file_write", "fsync")
+
+
+class StageTimers:
+    """Thread-safe histograms of how long each named stage takes
+
+    Timing a stage costs two clock reads and a short locked update, cheap
+    enough to leave on in every render. A snapshot is plain lists and
+    dicts, so worker processes can send theirs back to be merged.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {}
+
+    def observe(self, stage, seconds):
+        """Record one run of stage that took seconds"""
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = [0, 0.0, [0] * (len(STAGE_BUCKETS) + 1)]
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2][bisect_left(STAGE_BUCKETS, seconds)] += 1
+
+    @contextmanager
+    def stage(self, name):
+        """Time the body of a with block as one run of the named stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def snapshot(self):
+        """{stage: [count, total seconds, per-bucket counts]}"""
+        with self._lock:
+            return {stage: [count, total, list(counts)]
+                    for stage, (count, total, counts) in self._stages.items()}
+
+    def drain(self):
+        """Snapshot and reset in one step"""
+        with self._lock:
+            stages, self._stages = self._stages, {}
+        return stages
+
+    def merge(self, snapshot):
+        """Add a snapshot taken elsewhere (such as in a worker process)"""
+        with self._lock:
+            for stage, (count, total, counts) in snapshot.items():
+                entry = self._stages.get(stage)
+                if entry is None:
+                    self._stages[stage] = [count, total, list(counts)]
+                    continue
+                entry[0] += count
+                entry[1] += total
+                entry[2] = [a + b for a, b in zip(entry[2], counts)]
+
+    def reset(self):
+        with self._lock:
+            self._stages = {}
+
+    def to_json(self):
+        """Per-stage count, total and mean time and cumulative bucket counts, as JSON"""
+        report = {}
+        for stage, (count, total, counts) in self.snapshot().items():
+            cumulative, buckets = 0, {}
+            for bound, n in zip(STAGE_BUCKETS + ("+Inf",), counts):
+                cumulative += n
+                buckets[str(bound)] = cumulative
+            report[stage] = {
+                "count": count,
+                "total_seconds": total,
+                "mean_ms": total / count * 1000 if count else 0.0,
+                "buckets": buckets,
+            }
+        return json.dumps(report, indent=2)
+
+    def to_prometheus(self, metric="accredify_stage_seconds"):
+        """The histograms in the Prometheus text exposition format"""
+        lines = [f"# HELP {metric} Time spent in each certificate render stage.",
+                 f"# TYPE {metric} histogram"]
+        for stage, (count, total, counts) in sorted(self.snapshot().items()):
+            cumulative = 0
+            for bound, n in zip(STAGE_BUCKETS + ("+Inf",), counts):
+                cumulative += n
+                lines.append(f'{metric}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{stage="{stage}"}} {total!r}')
+            lines.append(f'{metric}_count{{stage="{stage}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Dump to path: JSON for a .json file, Prometheus text otherwise"""
+        text = self.to_json() if path.lower().endswith(".json") else self.to_prometheus()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+# Shared timers for the render path
+stage_timers = StageTimers()
+timed = stage_timers.stage
@@ -0,0 +1,138 @@
+"""Background file writers, so rendering never waits on a slow disk or network share"""
+import os
+import queue
+import threading
+from collections import namedtuple
+
+from .manifest import atomic_write
+from .registry import output_hash
+from .timing import timed
+
+
+# PDFs waiting for a writer before whoever submits them has to wait too
+DEFAULT_WRITE_QUEUE = 64
+
+# Writer threads; more help on network shares, where each write mostly waits
+DEFAULT_WRITERS = 2
+
+# Files each writer puts on disk between durability syncs; 0 leaves flushing to the OS
+DEFAULT_FSYNC_EVERY = 0
+
+# One finished write: token is whatever was submitted with the file,
+# digest the PDF's output_hash and error a message if the write failed
+WriteResult = namedtuple("WriteResult", ["token", "path", "nbytes", "digest", "error"])
+
+
+def _fsync_path(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def sync_files(paths):
+    """fsync each file, then each directory they were renamed into"""
+    for path in paths:
+        _fsync_path(path)
+    for directory in {os.path.dirname(os.path.abspath(path)) for path in paths}:
+        try:
+            _fsync_path(directory)
+        except OSError:
+            # Directories cannot be opened for syncing on Windows; the rename is durable there
+            pass
+
+
+class FileWriter:
+    """A bounded queue of files drained to disk by writer threads
+
+    submit() hands a file over and returns at once, unless queue_size
+    files are already waiting, in which case it blocks until a writer
+    catches up. That caps the memory held in waiting PDFs however far
+    rendering runs ahead. Each file is written under a temporary name
+    and renamed into place, as atomic_write does.
+
+    With fsync_every set, each writer fsyncs its files (and their
+    directories) in batches of that many, and only reports them as
+    written once they are synced, so a caller recording finished files
+    never records one a crash could still lose. Finished writes are
+    collected with completed(), and the rest by close().
+    """
+
+    def __init__(self, threads=DEFAULT_WRITERS, queue_size=DEFAULT_WRITE_QUEUE,
+                 fsync_every=DEFAULT_FSYNC_EVERY):
+        self.fsync_every = fsync_every
+        self._queue = queue.Queue(maxsize=max(1, queue_size))
+        self._done = queue.Queue()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"accredify-writer-{i}", daemon=True)
+            for i in range(max(1, threads))
+        ]
+        self._closed = False
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, path, data, token=None):
+        """Queue data to be written to path, blocking while the queue is full"""
+        if self._closed:
+            raise RuntimeError("FileWriter is closed")
+        self._queue.put((path, data, token))
+
+    def completed(self):
+        """WriteResults for the files finished since the last call, without waiting"""
+        results = []
+        try:
+            while True:
+                results.append(self._done.get_nowait())
+        except queue.Empty:
+            return results
+
+    def _flush(self, unsynced):
+        if not unsynced:
+            return
+        paths = [result.path for result in unsynced if result.error is None]
+        try:
+            with timed("fsync"):
+                sync_files(paths)
+        except OSError as e:
+            unsynced = [result._replace(error=result.error or f"fsync failed: {e}") for result in unsynced]
+        for result in unsynced:
+            self._done.put(result)
+        del unsynced[:]
+
+    def _run(self):
+        unsynced = []
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._flush(unsynced)
+                return
+            path, data, token = item
+            try:
+                with timed("file_write"):
+                    nbytes = atomic_write(path, data)
+                result = WriteResult(token, path, nbytes, output_hash(data), None)
+            except Exception as e:
+                result = WriteResult(token, path, 0, None, str(e))
+            if not self.fsync_every:
+                self._done.put(result)
+                continue
+            unsynced.append(result)
+            if len(unsynced) >= self.fsync_every:
+                self._flush(unsynced)
+
+    def close(self):
+        """Wait for every queued file to be written (and synced); returns the WriteResults not yet collected"""
+        if not self._closed:
+            self._closed = True
+            for _ in self._threads:
+                self._queue.put(None)
+            for thread in self._threads:
+                thread.join()
+        return self.completed()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,22 +1,52 @@
+import logging
 import os
+import queue
+import threading
+import time
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from tkcalendar import DateEntry
 from PIL import Image, ImageTk
-import pandas as pd
-from reportlab.lib.pagesizes import letter, A4, landscape
-from reportlab.pdfgen import canvas
-from reportlab.lib.utils import ImageReader
-from reportlab.lib.colors import HexColor
-from reportlab.lib.styles import ParagraphStyle
-from reportlab.platypus import Paragraph
-from io import BytesIO
 from datetime import datetime
 import customtkinter as ctk
 import webbrowser
-import qrcode
-from qrcode.image.styledpil import StyledPilImage
-from qrcode.image.styles.moduledrawers import RoundedModuleDrawer
+# Only light engine modules are imported at startup; the renderer (reportlab,
+# qrcode) loads on the preview thread, and batch support (pandas) on first use
+from accredify import CertificateRecord, RenderAssets
+from accredify.records import verification_id
+from accredify.registry import VerificationRegistry, output_hash
+from accredify.assets import image_cache
+from accredify.paths import DEFAULT_PATH_TEMPLATE, DEFAULT_SHARD_FANOUT, OutputPaths
+from accredify.timing import stage_timers, timed
+from accredify.preview import (
+    PREVIEW_DEBOUNCE_MS, PREVIEW_IDLE_MS, PREVIEW_ZOOM_MAX, PREVIEW_ZOOM_MIN, PREVIEW_ZOOM_STEP,
+    PreviewRenderer, PreviewRequest, warm_up_preview
+)
+
+# How often the UI checks the background renderer for a finished preview
+PREVIEW_POLL_MS = 30
+
+# How often the batch progress window reads the worker thread's updates
+BATCH_POLL_MS = 100
+
+# Pre-flight issues listed in the batch confirmation dialog; the rest are logged
+PREFLIGHT_SHOWN = 10
+
+# If set, per-stage render timings are written here after every batch
+# (JSON for a .json file, Prometheus text otherwise)
+TIMINGS_ENV = "ACCREDIFY_TIMINGS"
+
+logger = logging.getLogger("accredify.app")
+
+
+def format_duration(seconds):
+    """Seconds as m:ss, or h:mm:ss for an hour or more"""
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
 
 class CertificateGenerator(ctk.CTk):
     """Modern certificate generator application"""
@@ -48,6 +78,10 @@ class CertificateGenerator(ctk.CTk):
         self.batch_mode = False
         self.batch_file_path = ""
         self.preview_zoom = 1.0
+        self.preview_renderer = PreviewRenderer()
+        self.preview_after_id = None
+        self.preview_idle_id = None
+        self.preview_polling = False
 
         self.interaction_mode = None  # 'move', 'resize', 'rotate'
         self.current_element = None
@@ -122,7 +156,7 @@ class CertificateGenerator(ctk.CTk):
             placeholder_text="Full Name"
         )
         self.name_entry.grid(row=1, column=0, padx=10, pady=(0, 10))
-        self.name_entry.bind("<KeyRelease>", lambda e: self.generate_preview())
+        self.name_entry.bind("<KeyRelease>", lambda e: self.schedule_preview())
         
         self.course_label = ctk.CTkLabel(
             self.tabview.tab("Content"), 
@@ -138,7 +172,7 @@ class CertificateGenerator(ctk.CTk):
             placeholder_text="Course/Program Name"
         )
         self.course_entry.grid(row=3, column=0, padx=10, pady=(0, 10))
-        self.course_entry.bind("<KeyRelease>", lambda e: self.generate_preview())
+        self.course_entry.bind("<KeyRelease>", lambda e: self.schedule_preview())
         
         self.date_label = ctk.CTkLabel(
             self.tabview.tab("Content"), 
@@ -173,7 +207,7 @@ class CertificateGenerator(ctk.CTk):
             placeholder_text="Optional description or credits"
         )
         self.desc_entry.grid(row=7, column=0, padx=10, pady=(0, 10))
-        self.desc_entry.bind("<KeyRelease>", lambda e: self.generate_preview())
+        self.desc_entry.bind("<KeyRelease>", lambda e: self.schedule_preview())
         
 
         # Auto-fill dummy data
@@ -252,6 +286,76 @@ class CertificateGenerator(ctk.CTk):
         )
         self.batch_status.grid(row=2, column=0, padx=10, pady=(0, 20))
         
+        self.workers_label = ctk.CTkLabel(
+            self.tabview.tab("Batch"),
+            text="Worker Processes:",
+            anchor="w"
+        )
+        self.workers_label.grid(row=3, column=0, padx=10, pady=(0, 0))
+        
+        self.workers_var = ctk.StringVar(value="Auto")
+        self.workers_dropdown = ctk.CTkOptionMenu(
+            self.tabview.tab("Batch"),
+            values=["Auto", "1", "2", "4", "8", "16", "32"],
+            variable=self.workers_var
+        )
+        self.workers_dropdown.grid(row=4, column=0, padx=10, pady=(0, 10))
+        
+        self.output_mode_label = ctk.CTkLabel(
+            self.tabview.tab("Batch"),
+            text="Batch Output:",
+            anchor="w"
+        )
+        self.output_mode_label.grid(row=5, column=0, padx=10, pady=(0, 0))
+        
+        self.output_mode_var = ctk.StringVar(value="One PDF per certificate")
+        self.output_mode_dropdown = ctk.CTkOptionMenu(
+            self.tabview.tab("Batch"),
+            values=["One PDF per certificate", "Single multi-page PDF", "ZIP archive"],
+            variable=self.output_mode_var
+        )
+        self.output_mode_dropdown.grid(row=6, column=0, padx=10, pady=(0, 10))
+        
+        self.resume_var = ctk.BooleanVar(value=False)
+        self.resume_check = ctk.CTkCheckBox(
+            self.tabview.tab("Batch"),
+            text="Resume previous run",
+            variable=self.resume_var
+        )
+        self.resume_check.grid(row=7, column=0, padx=10, pady=(0, 10))
+        
+        self.path_template_label = ctk.CTkLabel(
+            self.tabview.tab("Batch"),
+            text="Output Path:",
+            anchor="w"
+        )
+        self.path_template_label.grid(row=8, column=0, padx=10, pady=(0, 0))
+        
+        # Editable: the presets are examples of the {field} template syntax
+        self.path_template_var = ctk.StringVar(value=DEFAULT_PATH_TEMPLATE)
+        self.path_template_combo = ctk.CTkComboBox(
+            self.tabview.tab("Batch"),
+            values=[DEFAULT_PATH_TEMPLATE, "{shard}/{file}", "{course}/{date:%Y}/{file}",
+                    "{course}/{date:%Y}/{id[:2]}/{name}.pdf"],
+            variable=self.path_template_var
+        )
+        self.path_template_combo.grid(row=9, column=0, padx=10, pady=(0, 10))
+        
+        self.shard_fanout_label = ctk.CTkLabel(
+            self.tabview.tab("Batch"),
+            text="Folders per {shard} level:",
+            anchor="w"
+        )
+        self.shard_fanout_label.grid(row=10, column=0, padx=10, pady=(0, 0))
+        
+        self.shard_fanout_var = ctk.StringVar(value=str(DEFAULT_SHARD_FANOUT))
+        self.shard_fanout_dropdown = ctk.CTkOptionMenu(
+            self.tabview.tab("Batch"),
+            values=["16", "64", "256", "1024", "4096"],
+            variable=self.shard_fanout_var
+        )
+        self.shard_fanout_dropdown.grid(row=11, column=0, padx=10, pady=(0, 10))
+        
         # Action buttons
         self.generate_preview_btn = ctk.CTkButton(
             self.sidebar_frame,
@@ -309,7 +413,7 @@ class CertificateGenerator(ctk.CTk):
             self.zoom_frame,
             text="-",
             width=30,
-            command=lambda: self.adjust_zoom(-0.1)
+            command=lambda: self.adjust_zoom(-PREVIEW_ZOOM_STEP)
         )
         self.zoom_out_btn.pack(side="left", padx=(0, 5))
         
@@ -324,7 +428,7 @@ class CertificateGenerator(ctk.CTk):
             self.zoom_frame,
             text="+",
             width=30,
-            command=lambda: self.adjust_zoom(0.1)
+            command=lambda: self.adjust_zoom(PREVIEW_ZOOM_STEP)
         )
         self.zoom_in_btn.pack(side="left", padx=(5, 0))
         
@@ -378,8 +482,23 @@ class CertificateGenerator(ctk.CTk):
         # self.preview_canvas.bind("<ButtonRelease-1>", self.end_drag)
 
         
-        # Generate initial preview
-        self.generate_preview()
+        # Warm up the renderer off the UI thread so the window appears at once
+        self.after_idle(self.start_first_preview)
+
+    def start_first_preview(self):
+        """Preview the form if it is filled in, else just load the renderer in the background"""
+        if self.name_var.get().strip() and self.course_var.get().strip() and self.date_var.get().strip():
+            self.generate_preview()
+            return
+        template, assets, zoom = self.template_var.get(), self.current_assets(), self.preview_zoom
+
+        def warm_up():
+            try:
+                warm_up_preview(template, assets, zoom)
+            except Exception as e:
+                logger.warning("Preview warm-up failed: %s", e)
+
+        threading.Thread(target=warm_up, name="preview-warm-up", daemon=True).start()
     
     def change_appearance_mode(self, new_appearance_mode):
         """Change appearance mode (light/dark)"""
@@ -391,7 +510,7 @@ class CertificateGenerator(ctk.CTk):
     
     def adjust_zoom(self, change):
         """Adjust preview zoom level"""
-        self.preview_zoom = max(0.5, min(2.0, self.preview_zoom + change))
+        self.preview_zoom = max(PREVIEW_ZOOM_MIN, min(PREVIEW_ZOOM_MAX, self.preview_zoom + change))
         self.zoom_label.configure(text=f"{self.preview_zoom * 100}%")
         self.generate_preview()
 
@@ -412,8 +531,7 @@ class CertificateGenerator(ctk.CTk):
                 self.logo_path = file_path
                 
                 # Display preview
-                preview_img = Image.open(file_path)
-                preview_img.thumbnail((200, 100))
+                preview_img = image_cache.image(file_path, (200, 100))
                 photo = ImageTk.PhotoImage(preview_img)
                 
                 self.logo_preview.configure(image=photo, text="")
@@ -438,8 +556,7 @@ class CertificateGenerator(ctk.CTk):
                 self.signature_path = file_path
                 
                 # Display preview
-                preview_img = Image.open(file_path)
-                preview_img.thumbnail((200, 60))
+                preview_img = image_cache.image(file_path, (200, 60))
                 photo = ImageTk.PhotoImage(preview_img)
                 
                 self.signature_preview.configure(image=photo, text="")
@@ -470,6 +587,13 @@ class CertificateGenerator(ctk.CTk):
             self.batch_status.configure(text=f"Loaded: {filename}")
             self.status_bar.configure(text=f"Batch file loaded: {filename}")
     
+    def batch_workers(self):
+        """Number of worker processes chosen for batch mode"""
+        if self.workers_var.get() == "Auto":
+            from accredify.batch import default_workers
+            return default_workers()
+        return int(self.workers_var.get())
+    
     def validate_fields(self):
         """Validate all required fields"""
         if not self.name_var.get().strip():
@@ -486,144 +610,93 @@ class CertificateGenerator(ctk.CTk):
             return False
         return True
     
-    def generate_qr_code(self, data, size=100):
-        """Generate a styled QR code image"""
-        try:
-            qr = qrcode.QRCode(
-                version=1,
-                error_correction=qrcode.constants.ERROR_CORRECT_L,
-                box_size=10,
-                border=4,
-            )
-            qr.add_data(data)
-            qr.make(fit=True)
-            
-            # Create a styled QR code
-            img = qr.make_image(
-                image_factory=StyledPilImage,
-                module_drawer=RoundedModuleDrawer(),
-                eye_drawer=qrcode.image.styles.moduledrawers.RoundedModuleDrawer(),
-                embeded_image_path=self.logo_path if self.logo_path else None
-            )
-            
-            # Resize if needed
-            if size:
-                img = img.resize((size, size), Image.Resampling.LANCZOS)
-                
-            return img
-        except Exception as e:
-            print(f"QR code generation error: {str(e)}")
-            return None
-    
-    def generate_preview(self):
-        """Generate a preview of the certificate"""
-        print("\n=== Starting preview generation ===")
+    def schedule_preview(self):
+        """Preview edits once typing pauses, then fully re-render once the user goes idle
+
+        The quick preview composites the fields onto the template's cached
+        background; the idle one renders the whole page as the PDF will.
+        """
+        for after_id in (self.preview_after_id, self.preview_idle_id):
+            if after_id is not None:
+                self.after_cancel(after_id)
+        self.preview_after_id = self.after(
+            PREVIEW_DEBOUNCE_MS, lambda: self.generate_preview(overlay=True)
+        )
+        self.preview_idle_id = self.after(PREVIEW_IDLE_MS, self.generate_preview)
+
+    def generate_preview(self, overlay=False):
+        """Queue a preview of the current form state on the background renderer"""
+        pending = [self.preview_after_id] if overlay else [self.preview_after_id, self.preview_idle_id]
+        for after_id in pending:
+            if after_id is not None:
+                self.after_cancel(after_id)
+        self.preview_after_id = None
+        if not overlay:
+            self.preview_idle_id = None
         if not self.validate_fields():
-            print("Validation failed - returning")
+            # Don't report the same missing field again when the idle render fires
+            if self.preview_idle_id is not None:
+                self.after_cancel(self.preview_idle_id)
+                self.preview_idle_id = None
+            self.preview_renderer.cancel()
             return
-            
+
         try:
-            print("Creating temporary PDF in memory...")
-            buffer = BytesIO()
-            template_func = self.templates[self.template_var.get()]
-            print(f"Using template: {self.template_var.get()}")
-            
-            print("Generating PDF content...")
-            template_func(buffer, preview=True)
-            
-            # Save the buffer to a temporary file
-            temp_pdf = "temp_preview.pdf"
-            print(f"Saving temporary PDF to {temp_pdf}...")
-            with open(temp_pdf, "wb") as f:
-                f.write(buffer.getvalue())
-            
-            # Convert first page of PDF to image
-            print("Converting PDF to image...")
-            from pdf2image import convert_from_path
-            try:
-                images = convert_from_path(temp_pdf, dpi=100)
-                if not images:
-                    raise ValueError("Failed to convert PDF to image - no images returned")
-                print("PDF conversion successful")
-            except Exception as e:
-                print(f"PDF conversion failed: {str(e)}")
-                raise
-                
-            img = images[0]  # Get first page
-            print(f"Original image dimensions: {img.width}x{img.height}")
-            print(f"Current zoom level: {self.preview_zoom}")
-            
-            # Safely calculate new dimensions as integers
-            try:
-                new_width = int(round(img.width * float(self.preview_zoom)))
-                new_height = int(round(img.height * float(self.preview_zoom)))
-                print(f"Calculated dimensions: {new_width}x{new_height}")
-            except (TypeError, ValueError) as e:
-                print(f"Dimension calculation error: {str(e)} - using original dimensions")
-                new_width = img.width
-                new_height = img.height
-                self.preview_zoom = 1.0
-                self.zoom_label.configure(text="100%")
-            
-            # Ensure reasonable dimensions
-            new_width = max(10, min(new_width, 5000))  # Between 10 and 5000 pixels
-            new_height = max(10, min(new_height, 5000))
-            print(f"Final dimensions after constraints: {new_width}x{new_height}")
-            
-            # Resize the image with error handling
-            try:
-                print("Attempting image resize...")
-                img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                print("Image resize successful")
-            except Exception as e:
-                print(f"Image resize failed: {str(e)}")
-                raise ValueError(f"Image resize failed: {str(e)}")
-            
-            try:
-                print("Creating PhotoImage...")
-                photo = ImageTk.PhotoImage(img)
-                print("PhotoImage created successfully")
-            except Exception as e:
-                print(f"PhotoImage creation failed: {str(e)}")
-                raise
-                
-            # Update preview canvas
-            print("Updating canvas...")
+            zoom = float(self.preview_zoom)
+        except (TypeError, ValueError) as e:
+            logger.warning("Zoom level error: %s - using 100%%", e)
+            zoom = 1.0
+            self.preview_zoom = 1.0
+            self.zoom_label.configure(text="100%")
+
+        self.preview_renderer.submit(PreviewRequest(
+            record=self.current_record(),
+            template=self.template_var.get(),
+            assets=self.current_assets(),
+            zoom=zoom,
+            overlay=overlay,
+        ))
+        self.status_bar.configure(text="Rendering preview...")
+        if not self.preview_polling:
+            self.preview_polling = True
+            self.after(PREVIEW_POLL_MS, self.poll_preview)
+
+    def poll_preview(self):
+        """Show the newest finished preview; keep polling while renders are outstanding"""
+        result = self.preview_renderer.poll()
+        if result is not None:
+            if result.error is not None:
+                logger.error("Preview generation failed: %s", result.error)
+                messagebox.showerror("Error", f"Failed to generate preview: {str(result.error)}")
+                self.status_bar.configure(text="Preview generation failed")
+            else:
+                self.show_preview_image(result.image)
+        if self.preview_renderer.busy:
+            self.after(PREVIEW_POLL_MS, self.poll_preview)
+        else:
+            self.preview_polling = False
+
+    def show_preview_image(self, img):
+        """Put a rendered preview image on the canvas, centred"""
+        with timed("canvas_update"):
+            photo = ImageTk.PhotoImage(img)
+
             self.preview_canvas.delete("all")
             img_width = photo.width()
             img_height = photo.height()
             canvas_width = self.preview_canvas.winfo_width()
             canvas_height = self.preview_canvas.winfo_height()
-            
+
             # Calculate centered position
             x = max(0, (canvas_width - img_width) // 2)
             y = max(0, (canvas_height - img_height) // 2)
-            
+
             self.preview_canvas.create_image(x, y, anchor=tk.NW, image=photo)
             self.preview_canvas.image = photo  # Keep reference
-            
-            # Update scroll region
-            print("Updating scroll region...")
             self.preview_canvas.configure(
                 scrollregion=self.preview_canvas.bbox("all")
             )
-            
-            # Clean up
-            try:
-                print("Cleaning up temporary files...")
-                os.remove(temp_pdf)
-                print("Temporary files removed")
-            except Exception as e:
-                print(f"Error removing temp file: {str(e)}")
-                
-            print("Preview generation complete")
-            self.status_bar.configure(text="Preview generated successfully")
-            
-        except Exception as e:
-            print(f"!!! ERROR in preview generation: {str(e)}")
-            messagebox.showerror("Error", f"Failed to generate preview: {str(e)}")
-            self.status_bar.configure(text="Preview generation failed")
-        print("=== Preview generation process ended ===\n")
+        self.status_bar.configure(text="Preview generated successfully")
     
     def generate_pdf(self):
         """Generate the final PDF certificate(s)"""
@@ -646,9 +719,15 @@ class CertificateGenerator(ctk.CTk):
             
         if output_path:
             try:
-                template_func = self.templates[self.template_var.get()]
+                from accredify import render_certificate
+                record = self.current_record()
+                template = self.template_var.get()
+                pdf = render_certificate(record, template=template, assets=self.current_assets())
                 with open(output_path, 'wb') as f:
-                    template_func(f)
+                    f.write(pdf)
+                with VerificationRegistry() as registry:
+                    registry.add(verification_id(record), record, template, output_hash(pdf),
+                                 os.path.basename(output_path))
                 messagebox.showinfo("Success", f"Certificate saved to:\n{output_path}")
                 self.status_bar.configure(text=f"Certificate saved: {os.path.basename(output_path)}")
             except Exception as e:
@@ -662,229 +741,286 @@ class CertificateGenerator(ctk.CTk):
             self.status_bar.configure(text="Error: No batch file selected")
             return
             
+        # The batch engine and roster reader (pandas) are loaded on first use
+        from accredify.batch import render_batch, render_batch_archive, render_batch_document
+        from accredify.preflight import describe_issue, preflight_roster
+        from accredify.roster import missing_columns, open_roster
+
         try:
-            # Read the batch file
-            if self.batch_file_path.endswith('.csv'):
-                df = pd.read_csv(self.batch_file_path)
-            else:  # Excel
-                df = pd.read_excel(self.batch_file_path)
+            # Open the batch file; rows are streamed to the renderer as it goes
+            roster = open_roster(self.batch_file_path)
                 
             # Validate required columns
-            required_cols = ['Name', 'Course', 'Date']
-            missing_cols = [col for col in required_cols if col not in df.columns]
+            missing_cols = missing_columns(roster)
             if missing_cols:
                 messagebox.showerror("Error", f"Missing required columns: {', '.join(missing_cols)}")
                 self.status_bar.configure(text=f"Error: Missing columns {', '.join(missing_cols)}")
                 return
                 
-            # Select output directory
-            output_dir = filedialog.askdirectory(
-                title="Select Output Directory for Batch Certificates")
-            if not output_dir:
+            # Select output directory (or file, for a single multi-page PDF)
+            output_mode = self.output_mode_var.get()
+            single_file = output_mode == "Single multi-page PDF"
+            archive = output_mode == "ZIP archive"
+            if single_file:
+                output_path = filedialog.asksaveasfilename(
+                    defaultextension=".pdf",
+                    filetypes=[("PDF Files", "*.pdf")],
+                    initialfile="Certificates.pdf",
+                    title="Save Batch Certificates As")
+            elif archive:
+                output_path = filedialog.asksaveasfilename(
+                    defaultextension=".zip",
+                    filetypes=[("ZIP Archives", "*.zip")],
+                    initialfile="Certificates.zip",
+                    title="Save Batch Archive As")
+            else:
+                output_path = filedialog.askdirectory(
+                    title="Select Output Directory for Batch Certificates")
+            if not output_path:
                 self.status_bar.configure(text="Batch processing cancelled")
                 return
                 
-            # Process each row
-            template_func = self.templates[self.template_var.get()]
-            success_count = 0
-            total_rows = len(df)
-            
-            # Create progress window
-            progress_window = ctk.CTkToplevel(self)
-            progress_window.title("Batch Processing")
-            progress_window.geometry("400x150")
-            progress_window.resizable(False, False)
-            
-            ctk.CTkLabel(
-                progress_window, 
-                text="Generating Certificates...",
-                font=ctk.CTkFont(weight="bold")
-            ).pack(pady=10)
-            
-            progress_var = ctk.DoubleVar()
-            progress_bar = ctk.CTkProgressBar(
-                progress_window,
-                variable=progress_var,
-                orientation="horizontal"
-            )
-            progress_bar.pack(fill="x", padx=20, pady=5)
-            progress_bar.set(0)
-            
-            status_label = ctk.CTkLabel(progress_window, text="Starting...")
-            status_label.pack(pady=5)
-            
-            # Force update the progress window
-            progress_window.update()
-            
-            for idx, row in df.iterrows():
-                try:
-                    # Update fields from CSV
-                    self.name_var.set(row['Name'])
-                    self.course_var.set(row.get('Course', ''))
-                    self.date_var.set(row.get('Date', ''))
-                    self.desc_var.set(row.get('Description', ''))
-                    
-                    # Generate PDF
-                    filename = f"Certificate_{row['Name'].replace(' ', '_')}.pdf"
-                    output_path = os.path.join(output_dir, filename)
-                    with open(output_path, 'wb') as f:
-                        template_func(f)
-                    success_count += 1
-                    
-                    # Update progress
-                    progress_var.set((idx + 1) / total_rows)
-                    status_label.configure(text=f"Processing {idx + 1} of {total_rows}: {row['Name']}")
-                    progress_window.update()
-                    
-                except Exception as e:
-                    print(f"Error processing {row['Name']}: {str(e)}")
-                    
-            progress_window.destroy()
-            
-            messagebox.showinfo("Batch Complete", 
-                             f"Successfully generated {success_count} of {total_rows} certificates.")
-            self.status_bar.configure(text=f"Batch complete: {success_count}/{total_rows} certificates generated")
-                              
+            # Check the output path template before any work starts
+            paths = OutputPaths(self.path_template_var.get().strip() or DEFAULT_PATH_TEMPLATE,
+                                int(self.shard_fanout_var.get()))
         except Exception as e:
             messagebox.showerror("Error", f"Batch processing failed: {str(e)}")
             self.status_bar.configure(text="Batch processing failed")
-    
-    # Certificate template generation functions remain the same as original
-    def generate_classic_certificate(self, output, preview=False):
-        """Generate a classic-style certificate"""
-        # Get field values
-        name = self.name_var.get()
-        course = self.course_var.get()
-        try:
-            raw_date = self.date_var.get()
-            date_obj = datetime.strptime(raw_date, "%Y-%m-%d")
-            date = date_obj.strftime("%B %d, %Y")
-        except ValueError:
-            date = raw_date
-        description = self.desc_var.get()
-        
-        # Create PDF canvas
-        c = canvas.Canvas(output, pagesize=landscape(A4))
-        width, height = landscape(A4)
-        
-        # Background design with subtle texture
-        c.setFillColor(HexColor("#F9F5E8"))
-        c.rect(0, 0, width, height, fill=True, stroke=False)
-        
-        # Add decorative border elements
-        border_color = HexColor("#8B7355")
-        c.setStrokeColor(border_color)
-        c.setLineWidth(10)
-        c.roundRect(30, 30, width-60, height-60, radius=10, fill=False, stroke=True)
-        
-        # Add subtle watermark
-        c.setFillColor(HexColor("#F0E6D2"))
-        c.setFont("Helvetica-Bold", 120)
-        c.drawCentredString(width//2, height//2-60, "CERTIFICATE")
-        c.setFillColor(HexColor("#333333"))
-        
-        # Header with elegant typography
-        c.setFont("Helvetica-Bold", 42)
-        c.setFillColor(HexColor("#2C3E50"))
-        c.drawCentredString(width//2, height-120, "CERTIFICATE OF ACHIEVEMENT")
-        
-        # Decorative line with accent
-        c.setStrokeColor(HexColor("#E74C3C"))
-        c.setLineWidth(3)
-        c.line(width//2-180, height-150, width//2+180, height-150)
-        
-        # Main content
-        c.setFont("Helvetica", 20)
-        c.drawCentredString(width//2, height-200, "This is to certify that")
-        
-        # Recipient name with elegant styling
-        c.setFont("Times-BoldItalic", 36)
-        c.setFillColor(HexColor("#8B7355"))
-        c.drawCentredString(width//2, height-260, name.upper())
-        
-        # Course description
-        c.setFont("Helvetica", 18)
-        c.setFillColor(HexColor("#333333"))
-        
-        text = f"has successfully completed the course of study in"
-        p = Paragraph(text, ParagraphStyle(name="Normal", fontSize=18, leading=22, alignment=1))
-        p.wrapOn(c, width-200, 50)
-        p.drawOn(c, 100, height-320)
-        
-        c.setFont("Helvetica-Bold", 22)
-        c.setFillColor(HexColor("#2C3E50"))
-        c.drawCentredString(width//2, height-360, f"«{course}»")
-        
-        if description:
-            c.setFont("Helvetica", 16)
-            c.setFillColor(HexColor("#555555"))
-            p = Paragraph(description, ParagraphStyle(name="Normal", fontSize=16, leading=20, alignment=1))
-            p.wrapOn(c, width-200, 100)
-            p.drawOn(c, 100, height-400)
-        
-        # Date
-        c.setFont("Helvetica-Oblique", 16)
-        c.drawCentredString(width//2, height-450, f"Awarded this {date}")
-        
-        # Logo and signature area
-        y_pos = height-550
-        if self.logo_path:
+            return
+
+        template = self.template_var.get()
+        assets = self.current_assets()
+        workers = self.batch_workers()
+        resume = self.resume_var.get()
+        cancel = threading.Event()
+        updates = queue.Queue()
+        # Rows in the roster, as counted by the pre-flight pass on the worker thread
+        total_rows = None
+
+        # Create progress window
+        progress_window = ctk.CTkToplevel(self)
+        progress_window.title("Batch Processing")
+        progress_window.geometry("400x200")
+        progress_window.resizable(False, False)
+
+        ctk.CTkLabel(
+            progress_window,
+            text="Generating Certificates...",
+            font=ctk.CTkFont(weight="bold")
+        ).pack(pady=10)
+
+        progress_var = ctk.DoubleVar()
+        progress_bar = ctk.CTkProgressBar(
+            progress_window,
+            variable=progress_var,
+            orientation="horizontal"
+        )
+        progress_bar.pack(fill="x", padx=20, pady=5)
+        progress_bar.set(0)
+
+        status_label = ctk.CTkLabel(progress_window, text="Checking roster...")
+        status_label.pack(pady=5)
+
+        rate_label = ctk.CTkLabel(progress_window, text="")
+        rate_label.pack(pady=5)
+
+        def cancel_batch():
+            cancel.set()
+            cancel_button.configure(state="disabled")
+            status_label.configure(text="Cancelling after the certificates in progress...")
+
+        cancel_button = ctk.CTkButton(progress_window, text="Cancel", command=cancel_batch)
+        cancel_button.pack(pady=5)
+        progress_window.protocol("WM_DELETE_WINDOW", cancel_batch)
+
+        def run_batch(check=True, total=None):
+            # Runs on a worker thread: the UI only hears from it through updates
+            def update_progress(done, total, record):
+                updates.put(("progress", (done, total, record.name)))
+
             try:
-                logo = ImageReader(self.logo_path)
-                c.drawImage(logo, 100, y_pos, width=150, height=100, preserveAspectRatio=True, mask='auto')
-                c.setStrokeColor(border_color)
-                c.setLineWidth(0.5)
-                c.line(100, y_pos-10, 250, y_pos-10)
-                c.setFont("Helvetica", 10)
-                c.drawString(100, y_pos-25, "Official Seal")
+                # Check the whole roster before rendering anything, so a bad
+                # row is found in seconds rather than partway through the batch.
+                # The check reads every row anyway, so it also gives the total
+                if check:
+                    report = preflight_roster(roster, template)
+                    total = report.rows
+                    updates.put(("total", total))
+                    if report.issues:
+                        updates.put(("preflight", report))
+                        return
+                updates.put(("rendering", time.monotonic()))
+                # Every issued certificate is recorded for later verification;
+                # the registry is opened here because SQLite connections stay on their thread
+                with VerificationRegistry() as registry:
+                    if single_file:
+                        # One document: logo, signature and static layer are embedded once
+                        result = render_batch_document(
+                            roster,
+                            output_path,
+                            template=template,
+                            assets=assets,
+                            on_progress=update_progress,
+                            total=total,
+                            registry=registry,
+                            cancel=cancel,
+                        )
+                    elif archive:
+                        # Rendered in worker processes and streamed into one archive
+                        result = render_batch_archive(
+                            roster,
+                            output_path,
+                            template=template,
+                            assets=assets,
+                            workers=workers,
+                            on_progress=update_progress,
+                            total=total,
+                            registry=registry,
+                            cancel=cancel,
+                            paths=paths,
+                        )
+                    else:
+                        # Render across worker processes; results come back in row order
+                        result = render_batch(
+                            roster,
+                            output_path,
+                            template=template,
+                            assets=assets,
+                            workers=workers,
+                            on_progress=update_progress,
+                            total=total,
+                            resume=resume,
+                            registry=registry,
+                            cancel=cancel,
+                            paths=paths,
+                        )
+                updates.put(("done", result))
             except Exception as e:
-                print(f"Error loading logo: {str(e)}")
-                
-        if self.signature_path:
+                updates.put(("error", e))
+
+        started = time.monotonic()
+
+        def poll_batch():
+            nonlocal started, total_rows
+            # Only the newest progress update is worth drawing
+            latest = outcome = None
             try:
-                signature = ImageReader(self.signature_path)
-                c.drawImage(signature, width-250, y_pos, width=150, height=80, preserveAspectRatio=True, mask='auto')
-                c.setStrokeColor(border_color)
-                c.setLineWidth(0.5)
-                c.line(width-250, y_pos-10, width-100, y_pos-10)
-                c.setFont("Helvetica", 10)
-                c.drawCentredString(width-175, y_pos-25, "Authorized Signature")
-            except Exception as e:
-                print(f"Error loading signature: {str(e)}")
-
-        # Generate verification data
-        verification_data = f"""
-        Certificate Verification
-        Name: {name}
-        Course: {course}
-        Date: {date}
-        ID: {datetime.now().strftime('%Y%m%d')}-{hash(name) % 10000:04d}
-        """
-        
-        # Generate and add QR code
-        qr_img = self.generate_qr_code(verification_data, size=80)
-        if qr_img:
-            # Save QR code to a temporary buffer
-            qr_buffer = BytesIO()
-            qr_img.save(qr_buffer, format='PNG')
-            qr_buffer.seek(0)
-            
-            # Add QR code to PDF
-            qr_reader = ImageReader(qr_buffer)
-            c.drawImage(qr_reader, width-120, 50, width=80, height=80, preserveAspectRatio=True, mask='auto')
-        
-        # Footer
-        c.setFont("Helvetica", 10)
-        c.setFillColor(HexColor("#666666"))
-        c.drawCentredString(width//2, 50, "This certificate is awarded as recognition of professional achievement")
-        
-        if preview:
-            c.showPage()
-            c.save()
-            return output
-        
-        c.save()
-    
+                while True:
+                    kind, payload = updates.get_nowait()
+                    if kind == "progress":
+                        latest = payload
+                    elif kind == "total":
+                        total_rows = payload
+                    elif kind == "rendering":
+                        # Rate and ETA count from the end of the pre-flight check
+                        started = payload
+                        status_label.configure(text="Starting...")
+                    else:
+                        outcome = (kind, payload)
+            except queue.Empty:
+                pass
+
+            if latest is not None and not cancel.is_set():
+                done, total, name = latest
+                total = max(total or done, done)
+                progress_var.set(done / total)
+                status_label.configure(text=f"Processing {done} of {total}: {name}")
+                elapsed = time.monotonic() - started
+                if elapsed > 0:
+                    rate = done / elapsed
+                    eta = format_duration((total - done) / rate) if rate else "--:--"
+                    rate_label.configure(text=f"{rate:.1f} certificates/sec, {eta} remaining")
+
+            if outcome is None:
+                self.after(BATCH_POLL_MS, poll_batch)
+            else:
+                finish_batch(*outcome)
+
+        def confirm_preflight(report):
+            # Some rows will not render cleanly: list them and let the user decide
+            rows = len({issue.row for issue in report.issues})
+            shown = "\n".join(describe_issue(issue) for issue in report.issues[:PREFLIGHT_SHOWN])
+            more = len(report.issues) - PREFLIGHT_SHOWN
+            if more > 0:
+                shown += f"\n...and {more} more"
+            for issue in report.issues:
+                logger.warning("Pre-flight: %s", describe_issue(issue))
+            return messagebox.askyesno(
+                "Roster Problems",
+                f"{rows} of {report.rows} rows will not render cleanly:\n\n{shown}\n\n"
+                "Generate the certificates anyway?",
+                parent=progress_window)
+
+        def finish_batch(kind, payload):
+            if kind == "preflight":
+                if confirm_preflight(payload):
+                    threading.Thread(target=run_batch, args=(False, payload.rows), daemon=True).start()
+                    self.after(BATCH_POLL_MS, poll_batch)
+                    return
+                progress_window.destroy()
+                self.generate_pdf_btn.configure(state="normal")
+                self.status_bar.configure(text="Batch cancelled: fix the roster problems and try again")
+                return
+
+            progress_window.destroy()
+            self.generate_pdf_btn.configure(state="normal")
+            if kind == "error":
+                messagebox.showerror("Error", f"Batch processing failed: {str(payload)}")
+                self.status_bar.configure(text="Batch processing failed")
+                return
+
+            result = payload
+            for idx, name, error in result.failures:
+                logger.error("Error processing row %d (%s): %s", idx + 1, name, error)
+            timings_path = os.environ.get(TIMINGS_ENV)
+            if timings_path:
+                stage_timers.write(timings_path)
+                logger.info("Stage timings saved: %s", timings_path)
+            if result.cancelled:
+                messagebox.showinfo("Batch Cancelled",
+                                    f"Batch cancelled after {result.total} of {total_rows} rows.")
+                self.status_bar.configure(text="Batch cancelled")
+                return
+
+            success_count = result.success_count
+            messagebox.showinfo("Batch Complete",
+                                f"Successfully generated {success_count} of {total_rows} certificates.")
+            self.status_bar.configure(text=f"Batch complete: {success_count}/{total_rows} certificates generated")
+
+        self.generate_pdf_btn.configure(state="disabled")
+        self.status_bar.configure(text="Batch processing...")
+        threading.Thread(target=run_batch, daemon=True).start()
+        self.after(BATCH_POLL_MS, poll_batch)
+
+    # Certificate templates live in the headless engine; these wrappers feed it the UI state
+    def current_record(self):
+        """Snapshot the form fields as a certificate record"""
+        with timed("field_read"):
+            return CertificateRecord(
+                name=self.name_var.get(),
+                course=self.course_var.get(),
+                date=self.date_var.get(),
+                description=self.desc_var.get(),
+            )
+
+    def current_assets(self):
+        """Snapshot the uploaded logo and signature paths"""
+        return RenderAssets(logo_path=self.logo_path, signature_path=self.signature_path)
+
+    def render_template(self, template_name, output):
+        """Render the current form state with the named template into output"""
+        from accredify import render_certificate
+        output.write(render_certificate(
+            self.current_record(),
+            template=template_name,
+            assets=self.current_assets(),
+        ))
+        return output
+
+    def generate_classic_certificate(self, output, preview=False):
+        """Generate a classic-style certificate"""
+        return self.render_template("Classic Elegance", output)
+
     # def generate_minimalist_certificate(self, output, preview=False):
     #     """Generate a minimalist-style certificate with customizable elements"""
     #     # Get field values
@@ -1670,488 +1806,21 @@ class CertificateGenerator(ctk.CTk):
 
     def generate_modern_certificate(self, output, preview=False):
         """Generate a modern-style certificate"""
-        # Get field values
-        name = self.name_var.get()
-        course = self.course_var.get()
-        try:
-            raw_date = self.date_var.get()
-            date_obj = datetime.strptime(raw_date, "%Y-%m-%d")
-            date = date_obj.strftime("%B %d, %Y")
-        except ValueError:
-            date = raw_date
-        description = self.desc_var.get()
-        
-        # Create PDF canvas
-        c = canvas.Canvas(output, pagesize=A4)
-        width, height = A4
-        
-        # Convert all dimensions to integers
-        width = int(width)
-        height = int(height)
-        
-        # Modern gradient background
-        c.linearGradient(
-            x0=0, y0=0, 
-            x1=width, y1=height,
-            colors=[HexColor("#FFFFFF"), HexColor("#F8F9FA")],
-            positions=[0, 1]
-        )
-        
-        # Header with color block - ensure integer dimensions
-        header_height = 150
-        c.setFillColor(HexColor("#2C3E50"))
-        c.rect(0, height-header_height, width, header_height, fill=True, stroke=False)
-        
-        # Decorative accent
-        c.setFillColor(HexColor("#E74C3C"))
-        c.rect(0, height-header_height, width, 8, fill=True, stroke=False)
-        
-        # Title with modern typography
-        c.setFont("Helvetica-Bold", 34)
-        c.setFillColor(HexColor("#FFFFFF"))
-        c.drawCentredString(width//2, height-80, "CERTIFICATE")
-        
-        # Subtitle
-        c.setFont("Helvetica", 14)
-        c.setFillColor(HexColor("#BDC3C7"))
-        c.drawCentredString(width//2, height-110, "OF PROFESSIONAL ACHIEVEMENT")
-        
-        # Main content area with subtle shadow - ensure integer dimensions
-        content_x = 40
-        content_y = 180
-        content_width = width-80
-        content_height = height-380
-        c.setFillColor(HexColor("#FFFFFF"))
-        c.rect(content_x, content_y, content_width, content_height, fill=True, stroke=False)
-        
-        # Recipient name
-        c.setFillColor(HexColor("#2C3E50"))
-        c.setFont("Helvetica-Bold", 28)
-        c.drawCentredString(width//2, height-200, name)
-        
-        # Course description
-        c.setFont("Helvetica", 16)
-        c.setFillColor(HexColor("#333333"))
-        
-        text = f"has successfully completed the {course} program"
-        if description:
-            text += f" with demonstrated excellence in {description}"
-            
-        p = Paragraph(text, ParagraphStyle(
-            name="Normal", 
-            fontSize=16, 
-            leading=22,
-            alignment=1
-        ))
-        p.wrapOn(c, width-200, 100)
-        p.drawOn(c, 100, height-280)
-        
-        # Achievement statement
-        c.setFont("Helvetica", 14)
-        c.setFillColor(HexColor("#7F8C8D"))
-        c.drawCentredString(width//2, height-350, "in recognition of outstanding performance and dedication")
-        
-        # Date
-        c.setFont("Helvetica-Bold", 14)
-        c.setFillColor(HexColor("#E74C3C"))
-        c.drawCentredString(width//2, height-390, f"Completed on: {date}")
-        
-        # Logo and signature
-        y_pos = height-480
-        if self.logo_path:
-            try:
-                logo = ImageReader(self.logo_path)
-                c.drawImage(logo, 100, y_pos, width=120, height=80, preserveAspectRatio=True, mask='auto')
-                c.setStrokeColor(HexColor("#BDC3C7"))
-                c.setLineWidth(0.5)
-                c.line(100, y_pos-10, 220, y_pos-10)
-                c.setFont("Helvetica", 10)
-                c.drawString(100, y_pos-25, "Issuing Organization")
-            except Exception as e:
-                print(f"Error loading logo: {str(e)}")
-                
-        if self.signature_path:
-            try:
-                signature = ImageReader(self.signature_path)
-                c.drawImage(signature, width-250, y_pos, width=150, height=60, preserveAspectRatio=True, mask='auto')
-                c.setStrokeColor(HexColor("#BDC3C7"))
-                c.setLineWidth(0.5)
-                c.line(width-250, y_pos-10, width-100, y_pos-10)
-                c.setFont("Helvetica", 10)
-                c.drawCentredString(width-175, y_pos-25, "Authorized Signatory")
-            except Exception as e:
-                print(f"Error loading signature: {str(e)}")
-        
-        # Verification ID
-        c.setFont("Helvetica", 8)
-        c.setFillColor(HexColor("#95A5A6"))
-        verification_id = f"ID: {datetime.now().strftime('%Y%m%d')}-{hash(name) % 10000:04d}"
-        c.drawRightString(width-40, 40, verification_id)
-
-        # Generate verification data
-        verification_data = f"""
-        Certificate Verification
-        Name: {name}
-        Course: {course}
-        Date: {date}
-        ID: {datetime.now().strftime('%Y%m%d')}-{hash(name) % 10000:04d}
-        """
-        
-        # Generate and add QR code
-        qr_img = self.generate_qr_code(verification_data, size=100)
-        if qr_img:
-            # Save QR code to a temporary buffer
-            qr_buffer = BytesIO()
-            qr_img.save(qr_buffer, format='PNG')
-            qr_buffer.seek(0)
-            
-            # Add QR code to PDF
-            qr_reader = ImageReader(qr_buffer)
-            c.drawImage(qr_reader, width-120, 50, width=80, height=80, preserveAspectRatio=True, mask='auto')
-        
-        # Footer
-        c.setFont("Helvetica", 9)
-        c.setFillColor(HexColor("#7F8C8D"))
-        c.drawCentredString(width//2, 30, "© " + datetime.now().strftime("%Y") + " Professional Certification Board. All rights reserved.")
-        
-        if preview:
-            c.showPage()
-            c.save()
-            return output
-        
-        c.save()
+        return self.render_template("Modern Professional", output)
 
     def generate_academic_diploma(self, output, preview=False):
         """Generate an academic diploma-style certificate"""
-        name = self.name_var.get()
-        course = self.course_var.get()
-        try:
-            raw_date = self.date_var.get()
-            date_obj = datetime.strptime(raw_date, "%Y-%m-%d")
-            date = date_obj.strftime("%B %d, %Y")
-        except ValueError:
-            date = raw_date
-        description = self.desc_var.get()
-        
-        # Create PDF canvas
-        c = canvas.Canvas(output, pagesize=landscape(A4))
-        width, height = landscape(A4)
-        
-        # Parchment-style background
-        c.setFillColor(HexColor("#FDF5E6"))
-        c.rect(0, 0, width, height, fill=True, stroke=False)
-        
-        # Add subtle texture
-        c.setFillColor(HexColor("#FAEBD7"))
-        for i in range(0, width, 3):
-            for j in range(0, height, 3):
-                if (i + j) % 6 == 0:
-                    c.rect(i, j, 2, 2, fill=True, stroke=False)
-        
-        # Ornate border
-        border_color = HexColor("#8B4513")
-        c.setStrokeColor(border_color)
-        c.setLineWidth(8)
-        c.roundRect(40, 40, width-80, height-80, radius=15, fill=False, stroke=True)
-        
-        # University-style seal at top
-        c.setFillColor(HexColor("#8B4513"))
-        c.circle(width//2, height-100, 50, fill=True, stroke=False)
-        c.setFillColor(HexColor("#FDF5E6"))
-        c.setFont("Times-Bold", 16)
-        c.drawCentredString(width//2, height-100, "SEAL")
-        
-        # Title with academic styling
-        c.setFillColor(HexColor("#8B4513"))
-        c.setFont("Times-Bold", 36)
-        c.drawCentredString(width//2, height-180, "DIPLOMA")
-        
-        # Latin motto
-        c.setFont("Times-Italic", 12)
-        c.drawCentredString(width//2, height-210, "Scientia est potentia")
-        
-        # Main content
-        c.setFont("Times-Roman", 18)
-        c.setFillColor(HexColor("#000000"))
-        c.drawCentredString(width//2, height-270, "This certifies that")
-        
-        c.setFont("Times-Bold", 28)
-        c.setFillColor(HexColor("#8B4513"))
-        c.drawCentredString(width//2, height-320, name.upper())
-        
-        c.setFont("Times-Roman", 18)
-        c.setFillColor(HexColor("#000000"))
-        text = f"has satisfactorily completed all requirements for"
-        p = Paragraph(text, ParagraphStyle(name="Normal", fontSize=18, leading=22, alignment=1))
-        p.wrapOn(c, width-200, 50)
-        p.drawOn(c, 100, height-370)
-        
-        c.setFont("Times-Bold", 22)
-        c.drawCentredString(width//2, height-410, course)
-        
-        if description:
-            c.setFont("Times-Roman", 16)
-            p = Paragraph(description, ParagraphStyle(name="Normal", fontSize=16, leading=20, alignment=1))
-            p.wrapOn(c, width-200, 100)
-            p.drawOn(c, 100, height-450)
-        
-        # Date and signatures
-        c.setFont("Times-Roman", 16)
-        c.drawCentredString(width//2, height-500, f"Given this {date}")
-        
-        # Signature lines
-        c.setStrokeColor(border_color)
-        c.setLineWidth(1)
-        c.line(width//4, height-550, width//4+200, height-550)
-        c.line(3*width//4-200, height-550, 3*width//4, height-550)
-        
-        c.setFont("Times-Roman", 12)
-        c.drawCentredString(width//4+100, height-570, "Dean of Studies")
-        c.drawCentredString(3*width//4-100, height-570, "University President")
-        
-        # Generate verification data
-        verification_data = f"""
-        Diploma Verification
-        Name: {name}
-        Program: {course}
-        Date: {date}
-        ID: {datetime.now().strftime('%Y%m%d')}-{hash(name) % 10000:04d}
-        """
-        
-        # Generate and add QR code
-        qr_img = self.generate_qr_code(verification_data, size=80)
-        if qr_img:
-            qr_buffer = BytesIO()
-            qr_img.save(qr_buffer, format='PNG')
-            qr_buffer.seek(0)
-            qr_reader = ImageReader(qr_buffer)
-            c.drawImage(qr_reader, width-120, 50, width=80, height=80, preserveAspectRatio=True, mask='auto')
-
-        if preview:
-            c.showPage()
-            c.save()
-            return output
-        
-        c.save()
+        return self.render_template("Academic Diploma", output)
 
     def generate_corporate_certificate(self, output, preview=False):
         """Generate a corporate training certificate"""
-        name = self.name_var.get()
-        course = self.course_var.get()
-        try:
-            raw_date = self.date_var.get()
-            date_obj = datetime.strptime(raw_date, "%Y-%m-%d")
-            date = date_obj.strftime("%B %d, %Y")
-        except ValueError:
-            date = raw_date
-        description = self.desc_var.get()
-        
-        # Create PDF canvas
-        c = canvas.Canvas(output, pagesize=A4)
-        width, height = A4
-        
-        # Corporate blue background
-        c.setFillColor(HexColor("#E6F2FF"))
-        c.rect(0, 0, width, height, fill=True, stroke=False)
-        
-        # Header with company branding
-        c.setFillColor(HexColor("#003366"))
-        c.rect(0, height-100, width, 100, fill=True, stroke=False)
-        
-        # Logo area
-        if self.logo_path:
-            try:
-                logo = ImageReader(self.logo_path)
-                c.drawImage(logo, width-150, height-90, width=120, height=80, preserveAspectRatio=True, mask='auto')
-            except Exception as e:
-                print(f"Error loading logo: {str(e)}")
-        
-        c.setFont("Helvetica-Bold", 24)
-        c.setFillColor(HexColor("#FFFFFF"))
-        c.drawString(50, height-60, "CORPORATE TRAINING CERTIFICATION")
-        
-        # Certificate number
-        c.setFont("Helvetica", 10)
-        cert_id = f"CERT-{datetime.now().strftime('%Y%m%d')}-{hash(name) % 10000:04d}"
-        c.drawRightString(width-50, height-70, cert_id)
-        
-        # Main content
-        c.setFillColor(HexColor("#000000"))
-        c.setFont("Helvetica", 16)
-        c.drawCentredString(width//2, height-180, "This is to certify that")
-        
-        c.setFont("Helvetica-Bold", 24)
-        c.setFillColor(HexColor("#003366"))
-        c.drawCentredString(width//2, height-230, name.upper())
-        
-        c.setFont("Helvetica", 16)
-        c.setFillColor(HexColor("#000000"))
-        text = f"has successfully completed the corporate training program:"
-        p = Paragraph(text, ParagraphStyle(name="Normal", fontSize=16, leading=20, alignment=1))
-        p.wrapOn(c, width-200, 50)
-        p.drawOn(c, 100, height-280)
-        
-        c.setFont("Helvetica-Bold", 20)
-        c.drawCentredString(width//2, height-320, course)
-        
-        if description:
-            c.setFont("Helvetica", 14)
-            p = Paragraph(description, ParagraphStyle(name="Normal", fontSize=14, leading=18, alignment=1))
-            p.wrapOn(c, width-200, 100)
-            p.drawOn(c, 100, height-360)
-        
-        # Completion details
-        c.setFont("Helvetica", 14)
-        c.drawCentredString(width//2, height-420, f"Date of Completion: {date}")
-        
-        # Signature area
-        c.setStrokeColor(HexColor("#003366"))
-        c.setLineWidth(1)
-        c.line(width//3, height-480, width//3+200, height-480)
-        c.line(2*width//3-200, height-480, 2*width//3, height-480)
-        
-        c.setFont("Helvetica", 12)
-        c.drawCentredString(width//3+100, height-500, "Training Manager")
-        c.drawCentredString(2*width//3-100, height-500, "HR Director")
-        
-        # Generate verification data
-        verification_data = f"""
-        Corporate Certification
-        Name: {name}
-        Training: {course}
-        Completed: {date}
-        ID: {datetime.now().strftime('%Y%m%d')}-{hash(name) % 10000:04d}
-        """
-        
-        # Generate and add QR code
-        qr_img = self.generate_qr_code(verification_data, size=80)
-        if qr_img:
-            qr_buffer = BytesIO()
-            qr_img.save(qr_buffer, format='PNG')
-            qr_buffer.seek(0)
-            qr_reader = ImageReader(qr_buffer)
-            c.drawImage(qr_reader, width-120, 50, width=80, height=80, preserveAspectRatio=True, mask='auto')
-
-        # Footer
-        c.setFont("Helvetica", 10)
-        c.setFillColor(HexColor("#666666"))
-        c.drawCentredString(width//2, 50, "This certificate verifies completion of required training hours")
-        c.drawCentredString(width//2, 30, "and demonstration of competency in the subject matter.")
-        
-        if preview:
-            c.showPage()
-            c.save()
-            return output
-        
-        c.save()
+        return self.render_template("Corporate Achievement", output)
 
     def generate_workshop_certificate(self, output, preview=False):
         """Generate a workshop participation certificate"""
-        name = self.name_var.get()
-        course = self.course_var.get()
-        try:
-            raw_date = self.date_var.get()
-            date_obj = datetime.strptime(raw_date, "%Y-%m-%d")
-            date = date_obj.strftime("%B %d, %Y")
-        except ValueError:
-            date = raw_date
-        description = self.desc_var.get()
-        
-        # Create PDF canvas
-        c = canvas.Canvas(output, pagesize=A4)
-        width, height = A4
-        
-        # Colorful modern background
-        colors = [HexColor("#FF9AA2"), HexColor("#FFB7B2"), HexColor("#FFDAC1"), 
-                 HexColor("#E2F0CB"), HexColor("#B5EAD7"), HexColor("#C7CEEA")]
-        
-        for i in range(6):
-            c.setFillColor(colors[i])
-            c.rect(0, height//6*i, width, height//6, fill=True, stroke=False)
-        
-        # White content area
-        c.setFillColor(HexColor("#FFFFFF"))
-        c.setStrokeColor(HexColor("#DDDDDD"))
-        c.setLineWidth(1)
-        c.roundRect(40, 40, width-80, height-80, 10, fill=True, stroke=True)
-        
-        # Title
-        c.setFillColor(HexColor("#333333"))
-        c.setFont("Helvetica-Bold", 28)
-        c.drawCentredString(width//2, height-100, "WORKSHOP PARTICIPATION")
-        
-        # Main content
-        c.setFont("Helvetica", 16)
-        c.drawCentredString(width//2, height-160, "This certificate is presented to")
-        
-        c.setFont("Helvetica-Bold", 24)
-        c.setFillColor(HexColor("#FF6B6B"))
-        c.drawCentredString(width//2, height-210, name)
-        
-        c.setFont("Helvetica", 16)
-        c.setFillColor(HexColor("#333333"))
-        text = f"for active participation in the workshop:"
-        p = Paragraph(text, ParagraphStyle(name="Normal", fontSize=16, leading=20, alignment=1))
-        p.wrapOn(c, width-200, 50)
-        p.drawOn(c, 100, height-260)
-        
-        c.setFont("Helvetica-Bold", 20)
-        c.drawCentredString(width//2, height-300, course)
-        
-        if description:
-            c.setFont("Helvetica", 14)
-            p = Paragraph(description, ParagraphStyle(name="Normal", fontSize=14, leading=18, alignment=1))
-            p.wrapOn(c, width-200, 100)
-            p.drawOn(c, 100, height-340)
-        
-        # Date and location
-        c.setFont("Helvetica", 14)
-        c.drawCentredString(width//2, height-390, f"Completed on {date}")
-        
-        # Signature area
-        if self.signature_path:
-            try:
-                signature = ImageReader(self.signature_path)
-                c.drawImage(signature, width//2-75, height-450, width=150, height=60, preserveAspectRatio=True, mask='auto')
-            except Exception as e:
-                print(f"Error loading signature: {str(e)}")
-        
-        c.setStrokeColor(HexColor("#AAAAAA"))
-        c.setLineWidth(0.5)
-        c.line(width//2-100, height-450, width//2+100, height-450)
-        c.setFont("Helvetica", 12)
-        c.drawCentredString(width//2, height-480, "Workshop Facilitator")
-        
-        # Verification QR code placeholder
-        c.setFillColor(HexColor("#EEEEEE"))
-        c.rect(width-100, 50, 80, 80, fill=True, stroke=False)
-        c.setFillColor(HexColor("#999999"))
-        c.setFont("Helvetica", 8)
-        c.drawCentredString(width-60, 70, "VERIFICATION")
-        c.drawCentredString(width-60, 60, "QR CODE")
-
-        # Generate and add actual QR code
-        verification_data = f"""
-        Workshop Certificate Verification
-        Name: {name}
-        Workshop: {course}
-        Date: {date}
-        """
-        qr_img = self.generate_qr_code(verification_data, size=80)
-        if qr_img:
-            qr_buffer = BytesIO()
-            qr_img.save(qr_buffer, format='PNG')
-            qr_buffer.seek(0)
-            qr_reader = ImageReader(qr_buffer)
-            c.drawImage(qr_reader, width-100, 50, width=80, height=80, preserveAspectRatio=True, mask='auto')
-        
-        if preview:
-            c.showPage()
-            c.save()
-            return output
-        
-        c.save()
+        return self.render_template("Workshop Completion", output)
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
     app = CertificateGenerator()
     app.mainloop()
\ No newline at end of file
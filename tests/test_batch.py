@@ -0,0 +1,84 @@
+import json
+import os
+
+import pytest
+
+from accredify.batch import page_index_path, render_batch, render_batch_archive, render_batch_document
+from accredify.preflight import preflight_roster
+from accredify.records import CertificateRecord
+from accredify.registry import VerificationRegistry
+from accredify.roster import RosterStream, open_roster
+
+
+ROWS = 5
+
+
+@pytest.fixture
+def roster(tmp_path, monkeypatch):
+    """A streamed roster that counts how often the file is read"""
+    path = tmp_path / "roster.csv"
+    lines = ["Name,Course,Date"] + [f"Person {i},Course {i % 2},2024-05-0{i + 1}" for i in range(ROWS)]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    reads = []
+    raw_frames = RosterStream._raw_frames
+
+    def counted(self):
+        reads.append("rows")
+        return raw_frames(self)
+
+    monkeypatch.setattr(RosterStream, "_raw_frames", counted)
+    stream = open_roster(str(path), chunksize=2)
+    stream.reads = reads
+    return stream
+
+
+def test_render_batch_reads_the_roster_once(roster, tmp_path):
+    out = tmp_path / "out"
+    out.mkdir()
+    result = render_batch(roster, str(out), workers=1, resume=True)
+    assert result.success_count == ROWS
+    assert len(os.listdir(out)) == ROWS + 1  # and the manifest
+    assert roster.reads == ["rows"]
+
+
+def test_render_batch_document_reads_the_roster_once(roster, tmp_path):
+    result = render_batch_document(roster, str(tmp_path / "all.pdf"))
+    assert result.success_count == ROWS
+    assert roster.reads == ["rows"]
+
+
+def test_render_batch_archive_reads_the_roster_once(roster, tmp_path):
+    result = render_batch_archive(roster, str(tmp_path / "all.zip"), workers=1)
+    assert result.success_count == ROWS
+    assert roster.reads == ["rows"]
+
+
+def test_preflight_counts_rows_in_its_single_pass(roster):
+    report = preflight_roster(roster)
+    assert report.rows == ROWS
+    assert roster.reads == ["rows"]
+
+
+@pytest.mark.parametrize("with_registry", [False, True])
+def test_archive_index_is_the_same_with_or_without_a_registry(roster, tmp_path, with_registry):
+    archive = tmp_path / "all.zip"
+    registry = VerificationRegistry(":memory:") if with_registry else None
+    render_batch_archive(roster, str(archive), workers=1, registry=registry)
+    with open(page_index_path(str(archive)), encoding="utf-8") as f:
+        index = json.load(f)
+    assert len(index["members"]) == ROWS
+    assert all(set(entry) == {"member", "name", "id"} for entry in index["members"])
+    if registry is not None:
+        assert len(registry.lookup(index["members"][0]["id"])) == 1
+        registry.close()
+
+
+def test_document_and_archive_of_one_name_keep_separate_indexes(tmp_path):
+    records = [CertificateRecord(name="Jane Doe", course="Python 101", date="2024-05-01")]
+    render_batch_document(records, str(tmp_path / "all.pdf"))
+    render_batch_archive(records, str(tmp_path / "all.zip"), workers=1)
+    with open(tmp_path / "all.pdf.index.json", encoding="utf-8") as f:
+        assert "pages" in json.load(f)
+    with open(tmp_path / "all.zip.index.json", encoding="utf-8") as f:
+        assert "members" in json.load(f)
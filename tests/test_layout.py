@@ -0,0 +1,75 @@
+from accredify.layout import MIN_FIT_RATIO, FitBox, ParagraphBox, fit_text, text_width, wrap_text
+
+
+FONT = "Helvetica-Bold"
+
+
+def widest(lines, size):
+    return max(text_width(line, FONT, size) for line in lines)
+
+
+def test_text_that_fits_is_kept_at_size():
+    assert fit_text("Jane Doe", FONT, 24, 400) == (24, ("Jane Doe",))
+
+
+def test_text_just_too_wide_is_shrunk_onto_one_line():
+    text = "Jane Doe " * 4
+    size, lines = fit_text(text.strip(), FONT, 24, 300)
+    assert lines == (text.strip(),)
+    assert 24 * MIN_FIT_RATIO <= size < 24
+    assert widest(lines, size) <= 300 + 1e-6
+
+
+def test_long_text_is_wrapped_at_the_minimum_size():
+    text = "Maximiliana Evangelina Bartholomew Featherstonehaugh Wolfe"
+    size, lines = fit_text(text, FONT, 24, 300)
+    assert size == 24 * MIN_FIT_RATIO
+    assert len(lines) == 2
+    assert widest(lines, size) <= 300 + 1e-6
+
+
+def test_unbreakable_word_is_shrunk_to_the_width():
+    size, lines = fit_text("X" * 60, FONT, 36, 641)
+    assert lines == ("X" * 60,)
+    assert size < 36 * MIN_FIT_RATIO
+    assert widest(lines, size) <= 641 + 1e-6
+
+
+def test_long_word_among_others_is_shrunk_to_the_width():
+    text = "Jane " + "X" * 60 + " Doe"
+    size, lines = fit_text(text, FONT, 36, 641)
+    assert len(lines) <= 2
+    assert widest(lines, size) <= 641 + 1e-6
+
+
+def test_wrap_text_keeps_lines_within_width():
+    lines = wrap_text("one two three four five six seven", FONT, 12, 60)
+    assert " ".join(lines) == "one two three four five six seven"
+    assert all(text_width(line, FONT, 12) <= 60 + 1e-6 for line in lines)
+
+
+def test_fit_box_accepts_text_that_wraps_at_the_minimum_size():
+    box = FitBox(("name",), lambda r: r.name, FONT, 24, 300)
+    assert not box.overflows("Jane Doe")
+    assert not box.overflows("Maximiliana Evangelina Bartholomew Featherstonehaugh Wolfe")
+
+
+def test_fit_box_flags_text_that_needs_more_lines():
+    box = FitBox(("name",), lambda r: r.name, FONT, 24, 300)
+    assert box.overflows("Maximiliana Evangelina " * 6)
+
+
+def test_fit_box_flags_an_unbreakable_word():
+    box = FitBox(("name",), lambda r: r.name, FONT, 36, 641)
+    assert box.overflows("X" * 60)
+
+
+def test_fit_box_flags_a_word_too_wide_even_at_one_point():
+    box = FitBox(("name",), lambda r: r.name, FONT, 2, 50, min_size=0.5)
+    assert box.overflows("X" * 200)
+
+
+def test_paragraph_box_flags_an_unbreakable_word():
+    box = ParagraphBox(("description",), lambda r: r.description, "Helvetica", 16, 20, 400, 40)
+    assert not box.overflows("A short description of the course.")
+    assert box.overflows("X" * 100)
@@ -0,0 +1,103 @@
+import os
+import threading
+
+import pytest
+
+from accredify import records as records_module
+from accredify.batch import render_batch
+from accredify.manifest import BatchManifest, atomic_write
+from accredify.records import CertificateRecord
+
+
+def write(path, data=b"%PDF-1.4 test"):
+    path.write_bytes(data)
+    return len(data)
+
+
+def test_resume_finds_every_copy_of_a_repeated_row(tmp_path):
+    first, second = tmp_path / "Certificate_Jane_Doe.pdf", tmp_path / "Certificate_Jane_Doe_2.pdf"
+    with BatchManifest(str(tmp_path)) as manifest:
+        manifest.record(0, "same-hash", str(first), write(first))
+        manifest.record(1, "same-hash", str(second), write(second))
+
+    with BatchManifest(str(tmp_path), resume=True) as manifest:
+        assert manifest.is_done("same-hash", str(first))
+        assert manifest.is_done("same-hash", str(second))
+        assert not manifest.is_done("other-hash", str(first))
+
+
+def test_resume_redoes_a_file_that_changed(tmp_path):
+    path = tmp_path / "Certificate_Jane_Doe.pdf"
+    with BatchManifest(str(tmp_path)) as manifest:
+        manifest.record(0, "hash", str(path), write(path))
+    write(path, b"%PDF-1.4 truncat")
+
+    with BatchManifest(str(tmp_path), resume=True) as manifest:
+        assert not manifest.is_done("hash", str(path))
+
+
+def test_resume_redoes_a_file_rewritten_at_the_same_size(tmp_path):
+    path = tmp_path / "Certificate_Jane_Doe.pdf"
+    with BatchManifest(str(tmp_path)) as manifest:
+        manifest.record(0, "hash", str(path), write(path))
+    recorded = os.stat(path).st_mtime_ns
+    write(path, b"%PDF-1.4 TEST")
+    os.utime(path, ns=(recorded + 10**9, recorded + 10**9))
+
+    with BatchManifest(str(tmp_path), resume=True) as manifest:
+        assert not manifest.is_done("hash", str(path))
+
+
+def test_rows_written_before_an_error_are_recorded(tmp_path, monkeypatch):
+    jane = CertificateRecord(name="Jane Doe", course="Python 101", date="2024-05-01")
+    batch = [jane._replace(name=f"Person {i}") for i in range(4)] + [jane]
+    identity_digests = records_module._identity_digests
+
+    def clash_with_first_row(records, key):
+        digests = identity_digests(records, key)
+        first = identity_digests([batch[0]], key)[0]
+        # Jane Doe gets row 1's ID from a different digest: a collision
+        return [first[:8] + bytes(8) if record.name == "Jane Doe" else digest
+                for record, digest in zip(records, digests)]
+
+    monkeypatch.setattr(records_module, "_identity_digests", clash_with_first_row)
+    with pytest.raises(ValueError, match="collision"):
+        render_batch(batch, str(tmp_path), workers=1, chunksize=1)
+    monkeypatch.undo()
+
+    again = render_batch(batch, str(tmp_path), workers=1, chunksize=1, resume=True)
+    assert again.skipped == 4
+    assert again.success_count == 5
+
+
+def test_resumed_batch_skips_repeated_rows(tmp_path):
+    records = [CertificateRecord(name="Jane Doe", course="Python 101", date="2024-05-01")] * 3
+    first = render_batch(records, str(tmp_path), workers=1)
+    assert first.success_count == 3 and first.skipped == 0
+
+    again = render_batch(records, str(tmp_path), workers=1, resume=True)
+    assert again.success_count == 3
+    assert again.skipped == 3
+
+
+def test_threads_writing_one_path_do_not_share_a_temporary_file(tmp_path):
+    path = str(tmp_path / "Certificate_Jane_Doe.pdf")
+    payloads = [bytes([n]) * 200_000 for n in range(8)]
+    errors = []
+
+    def write_many(data):
+        try:
+            for _ in range(20):
+                atomic_write(path, data)
+        except OSError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write_many, args=(data,)) for data in payloads]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    with open(path, 'rb') as f:
+        assert f.read() in payloads
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["Certificate_Jane_Doe.pdf"]
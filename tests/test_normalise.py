@@ -0,0 +1,54 @@
+import pandas as pd
+
+from accredify.normalise import FilenameAllocator
+
+
+def test_repeated_names_are_numbered_in_order():
+    allocator = FilenameAllocator()
+    assert [allocator.name("Certificate_Jane_Doe") for _ in range(3)] == [
+        "Certificate_Jane_Doe.pdf", "Certificate_Jane_Doe_2.pdf", "Certificate_Jane_Doe_3.pdf",
+    ]
+
+
+def test_names_differing_only_in_case_collide():
+    allocator = FilenameAllocator()
+    assert allocator.name("Certificate_Jane_Doe") == "Certificate_Jane_Doe.pdf"
+    assert allocator.name("Certificate_JANE_DOE") == "Certificate_JANE_DOE_2.pdf"
+
+
+def test_a_given_name_that_looks_numbered_is_not_reused():
+    allocator = FilenameAllocator()
+    names = [allocator.name(stem) for stem in
+             ("Certificate_Jane_Doe", "Certificate_Jane_Doe_2", "Certificate_Jane_Doe")]
+    assert names == ["Certificate_Jane_Doe.pdf", "Certificate_Jane_Doe_2.pdf", "Certificate_Jane_Doe_3.pdf"]
+
+
+def test_allocate_matches_name_one_at_a_time():
+    stems = ["Certificate_Jane_Doe", "Certificate_Jane_Doe_2", "Certificate_jane_doe",
+             "Certificate_Jane_Doe", "Certificate_Jane_Doe_3", "Certificate_Ali"]
+    one_by_one = FilenameAllocator()
+    expected = [one_by_one.name(stem) for stem in stems]
+
+    allocated = FilenameAllocator().allocate(pd.Series(stems)).tolist()
+    assert allocated == expected
+    assert len({name.lower() for name in allocated}) == len(stems)
+
+
+def test_collisions_are_caught_across_chunks():
+    allocator = FilenameAllocator()
+    first = allocator.allocate(pd.Series(["Certificate_Jane_Doe", "Certificate_Jane_Doe_2"])).tolist()
+    second = allocator.allocate(pd.Series(["Certificate_Jane_Doe", "Certificate_JANE_DOE"])).tolist()
+    assert first == ["Certificate_Jane_Doe.pdf", "Certificate_Jane_Doe_2.pdf"]
+    assert second == ["Certificate_Jane_Doe_3.pdf", "Certificate_JANE_DOE_4.pdf"]
+
+
+def test_names_do_not_depend_on_chunking():
+    stems = ["Certificate_Jane_Doe", "Certificate_Jane_Doe_2", "Certificate_jane_doe", "Certificate_Ali",
+             "Certificate_Jane_Doe", "Certificate_Ali_2", "Certificate_ALI", "Certificate_Jane_Doe_4"]
+    results = []
+    for size in (1, 2, 3, len(stems)):
+        allocator = FilenameAllocator()
+        results.append([name for start in range(0, len(stems), size)
+                        for name in allocator.allocate(pd.Series(stems[start:start + size])).tolist()])
+    assert all(result == results[0] for result in results)
+    assert len({name.lower() for name in results[0]}) == len(stems)
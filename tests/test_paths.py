@@ -0,0 +1,77 @@
+import pytest
+
+from accredify.paths import OutputPaths
+from accredify.records import CertificateRecord, verification_id
+
+
+JANE = CertificateRecord(name="Jane Doe", course="Data/Science: 101", date="2024-05-01")
+
+
+def paths_for(paths, records):
+    return [path for _, _, path in paths.assign(records)]
+
+
+def test_default_template_is_the_usual_file_name():
+    assert paths_for(OutputPaths(), [JANE]) == ["Certificate_Jane_Doe.pdf"]
+
+
+def test_fields_dates_and_slices():
+    paths = OutputPaths("{course}/{date:%Y}/{id[:2]}/{name}.pdf")
+    cert_id = verification_id(JANE)
+    assert paths_for(paths, [JANE]) == [f"DataScience_101/2024/{cert_id[:2]}/Jane_Doe.pdf"]
+
+
+def test_pdf_extension_is_added():
+    assert paths_for(OutputPaths("{course}/{name}"), [JANE]) == ["DataScience_101/Jane_Doe.pdf"]
+
+
+def test_unreadable_date_is_used_as_typed():
+    record = JANE._replace(date="sometime")
+    assert paths_for(OutputPaths("{date:%Y}/{file}"), [record]) == ["sometime/Certificate_Jane_Doe.pdf"]
+
+
+def test_empty_field_gets_a_placeholder_directory():
+    assert paths_for(OutputPaths("{description}/{file}"), [JANE]) == ["_/Certificate_Jane_Doe.pdf"]
+
+
+def test_paths_that_come_out_the_same_are_numbered():
+    paths = OutputPaths("{course}/{name}.pdf")
+    assert paths_for(paths, [JANE, JANE, JANE._replace(name="JANE DOE")]) == [
+        "DataScience_101/Jane_Doe.pdf", "DataScience_101/Jane_Doe_2.pdf", "DataScience_101/JANE_DOE_3.pdf",
+    ]
+
+
+def test_shard_depends_only_on_the_verification_id():
+    paths = OutputPaths("{shard}/{file}", shard_fanout=16, shard_depth=2)
+    cert_id = verification_id(JANE)
+    shard = paths.shard(cert_id)
+    assert paths_for(paths, [JANE]) == [f"{shard}/Certificate_Jane_Doe.pdf"]
+    assert OutputPaths("{shard}/{name}", shard_fanout=16, shard_depth=2).shard(cert_id) == shard
+
+
+@pytest.mark.parametrize("fanout, depth, digits", [(16, 1, 1), (256, 2, 2), (1000, 3, 3)])
+def test_shards_have_depth_levels_within_the_fanout(fanout, depth, digits):
+    paths = OutputPaths("{shard}/{file}", shard_fanout=fanout, shard_depth=depth)
+    for n in range(200):
+        levels = paths.shard(f"ID-{n}").split("/")
+        assert len(levels) == depth
+        assert all(len(level) == digits and int(level, 16) < fanout for level in levels)
+
+
+def test_shards_spread_over_the_fanout():
+    paths = OutputPaths("{shard}/{file}", shard_fanout=16)
+    assert len({paths.shard(f"ID-{n}") for n in range(500)}) == 16
+
+
+@pytest.mark.parametrize("template", [
+    "/abs/{file}", "../{file}", "{course}/../{file}", "C:/{file}", "{unknown}", "{name!r}", "{name.upper}",
+])
+def test_bad_templates_fail_up_front(template):
+    with pytest.raises(ValueError):
+        OutputPaths(template)
+
+
+@pytest.mark.parametrize("fanout, depth", [(1, 1), (16, 0)])
+def test_bad_shard_settings_fail(fanout, depth):
+    with pytest.raises(ValueError):
+        OutputPaths("{shard}/{file}", shard_fanout=fanout, shard_depth=depth)
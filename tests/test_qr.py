@@ -0,0 +1,81 @@
+from io import BytesIO
+
+import pypdfium2
+from reportlab.pdfbase.pdfdoc import BasicFonts, PDFDictionary
+from reportlab.pdfgen import canvas
+
+from accredify.qr import _build_qr, draw_qr_code, qr_code_rows, qr_modules
+
+
+DATA = "Certificate ID: M0FB-CMQS-BHA7\nRecipient: Jane Doe\nCourse: Python Programming 101"
+
+
+def dark_cells(matrix):
+    return {(col, row) for row, cells in enumerate(matrix) for col, dark in enumerate(cells) if dark}
+
+
+def test_qr_modules_cover_exactly_the_dark_modules():
+    matrix = _build_qr(DATA).get_matrix()
+    modules = list(qr_modules(matrix))
+    assert {(col, row) for col, row, _ in modules} == dark_cells(matrix)
+    assert len(modules) == len(dark_cells(matrix))
+
+
+def test_qr_modules_record_dark_neighbours():
+    matrix = _build_qr(DATA).get_matrix()
+    dark = dark_cells(matrix)
+    for col, row, neighbours in qr_modules(matrix):
+        expected = (((col, row - 1) in dark) * 1 | ((col + 1, row) in dark) * 2
+                    | ((col, row + 1) in dark) * 4 | ((col - 1, row) in dark) * 8)
+        assert neighbours == expected
+
+
+def test_qr_code_rows_place_each_module():
+    matrix = _build_qr(DATA, "logo.png").get_matrix()
+    rows = qr_code_rows(matrix)
+    assert len(rows) == len(matrix)
+    painted = {(col, row) for row, text in enumerate(rows) for col, glyph in enumerate(text) if glyph != "@"}
+    assert painted == dark_cells(matrix)
+    shapes = {(col, row): ord("A") + neighbours for col, row, neighbours in qr_modules(matrix)}
+    for (col, row), code in shapes.items():
+        assert ord(rows[row][col]) == code
+
+
+def test_module_font_is_added_to_a_document_once():
+    output = BytesIO()
+    c = canvas.Canvas(output)
+    draw_qr_code(c, DATA, 10, 10, 80)
+    c.showPage()
+    draw_qr_code(c, DATA + " (copy)", 10, 10, 80)
+    c.showPage()
+    c.save()
+    assert output.getvalue().count(b"/Subtype /Type3") == 1
+
+
+def test_reportlab_shares_one_font_dictionary_between_pages():
+    # _add_module_font relies on this: it registers the font in the
+    # document's BasicFonts dictionary, which every page's resources name
+    c = canvas.Canvas(BytesIO())
+    fonts = c._doc.idToObject[BasicFonts]
+    assert isinstance(fonts, PDFDictionary)
+    draw_qr_code(c, DATA, 10, 10, 80)
+    assert "FQRModules" in fonts.dict
+
+
+def test_every_page_paints_exactly_the_dark_modules():
+    matrix = _build_qr(DATA).get_matrix()
+    n = len(matrix)
+    scale = 4
+    output = BytesIO()
+    c = canvas.Canvas(output, pagesize=(n * 10, n * 10))
+    for _ in range(2):
+        draw_qr_code(c, DATA, 0, 0, n * 10)
+        c.showPage()
+    c.save()
+
+    document = pypdfium2.PdfDocument(output.getvalue())
+    for page in document:
+        pixels = page.render(scale=scale).to_pil().convert("L")
+        painted = {(col, row) for row in range(n) for col in range(n)
+                   if pixels.getpixel(((col * 10 + 5) * scale, (row * 10 + 5) * scale)) < 128}
+        assert painted == dark_cells(matrix)
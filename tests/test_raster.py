@@ -0,0 +1,47 @@
+import threading
+
+from accredify import raster
+from accredify.raster import rasterise_pdf, rasterise_regions
+from accredify.records import CertificateRecord
+from accredify.render import render_certificate
+
+
+PDF = render_certificate(CertificateRecord(name="Jane Doe", course="Python 101", date="2024-05-01"))
+
+
+def test_rasterisers_are_created_once_across_threads(monkeypatch):
+    created = []
+
+    class Slow(raster.PdfiumRasteriser):
+        def __init__(self):
+            created.append(self)
+            threading.Event().wait(0.05)
+            super().__init__()
+
+    monkeypatch.setitem(raster.BACKENDS, "slow", Slow)
+    monkeypatch.setattr(raster, "_rasterisers", {})
+    threads = [threading.Thread(target=raster.get_rasteriser, args=("slow",)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(created) == 1
+
+
+def test_concurrent_rasterising_matches_one_thread():
+    expected = rasterise_pdf(PDF, dpi=36).tobytes()
+    regions = [(position, image.tobytes()) for position, image in rasterise_regions(PDF, dpi=36)]
+    results = []
+
+    def work():
+        for _ in range(3):
+            results.append(rasterise_pdf(PDF, dpi=36).tobytes() == expected)
+            results.append([(position, image.tobytes())
+                            for position, image in rasterise_regions(PDF, dpi=36)] == regions)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [True] * 24
@@ -0,0 +1,92 @@
+import hashlib
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+from accredify import records
+from accredify.cli import main
+from accredify.preflight import preflight_roster
+from accredify.records import CertificateRecord, VerificationIdChecker, verification_id
+from accredify.roster import open_roster
+
+
+JANE = CertificateRecord(name="Jane Doe", course="Python 101", date="2024-05-01")
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def id_in_fresh_process(seed, key=None):
+    env = dict(os.environ, PYTHONHASHSEED=str(seed), PYTHONPATH=PACKAGE_ROOT)
+    env.pop(records.ID_KEY_ENV, None)
+    if key:
+        env[records.ID_KEY_ENV] = key
+    script = ("from accredify.records import CertificateRecord, verification_id; "
+              f"print(verification_id(CertificateRecord(*{tuple(JANE)!r})))")
+    return subprocess.run([sys.executable, "-c", script], env=env, check=True,
+                          capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def colliding_ids(monkeypatch):
+    """Every record gets the same ID, from a digest that still differs per certificate"""
+    def digests(batch, key):
+        return [bytes(8) + hashlib.blake2b(repr(tuple(record[:3])).encode(), digest_size=8).digest()
+                for record in batch]
+    monkeypatch.setattr(records, "_identity_digests", digests)
+
+
+def test_ids_are_crockford_base32_in_three_groups():
+    group = "[0-9A-HJKMNP-TV-Z]{4}"
+    assert re.fullmatch(f"{group}-{group}-{group}", verification_id(JANE))
+
+
+def test_ids_are_stable_across_processes(monkeypatch):
+    monkeypatch.delenv(records.ID_KEY_ENV, raising=False)
+    expected = verification_id(JANE)
+    assert id_in_fresh_process(0) == expected
+    assert id_in_fresh_process(12345) == expected
+
+
+def test_ids_depend_on_the_key(monkeypatch):
+    monkeypatch.delenv(records.ID_KEY_ENV, raising=False)
+    default = verification_id(JANE)
+    assert verification_id(JANE, key="another key") != default
+    assert verification_id(JANE, key=records.DEFAULT_ID_KEY) == default
+
+    monkeypatch.setenv(records.ID_KEY_ENV, "another key")
+    assert verification_id(JANE) == verification_id(JANE, key="another key")
+    assert id_in_fresh_process(1, key="another key") == verification_id(JANE)
+
+
+def test_ids_follow_name_course_and_date_only():
+    assert verification_id(JANE._replace(description="With honours")) == verification_id(JANE)
+    for field in ("name", "course", "date"):
+        assert verification_id(JANE._replace(**{field: "other"})) != verification_id(JANE)
+
+
+def test_checker_returns_the_first_row_for_a_repeated_certificate():
+    checker = VerificationIdChecker()
+    assert checker.check(0, JANE) is None
+    assert checker.check(1, JANE._replace(name="Ali")) is None
+    assert checker.check(2, JANE) == 0
+
+
+def test_checker_raises_on_a_collision(colliding_ids):
+    checker = VerificationIdChecker()
+    checker.check(0, JANE)
+    with pytest.raises(ValueError, match="rows 1 and 2"):
+        checker.check(1, JANE._replace(name="Ali"))
+
+
+def test_collision_is_found_before_any_output(colliding_ids, tmp_path):
+    roster = tmp_path / "roster.csv"
+    roster.write_text("Name,Course,Date\nJane Doe,Python 101,2024-05-01\nAli,Python 101,2024-05-01\n",
+                      encoding="utf-8")
+    with pytest.raises(ValueError, match="collision"):
+        preflight_roster(open_roster(str(roster)))
+
+    out = tmp_path / "out"
+    assert main(["batch", str(roster), "-o", str(out), "-j", "1", "--preflight", "--no-registry"]) == 1
+    assert not out.exists()
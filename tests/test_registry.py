@@ -0,0 +1,72 @@
+import pytest
+
+from accredify.records import CertificateRecord, verification_id
+from accredify.registry import VerificationRegistry, default_registry_path, output_hash
+
+
+JANE = CertificateRecord(name="Jane Doe", course="Python 101", date="2024-05-01")
+ALI = CertificateRecord(name="Ali Khan", course="Python 101", date="2024-05-01")
+
+
+@pytest.fixture
+def registry():
+    with VerificationRegistry(":memory:") as registry:
+        yield registry
+
+
+def test_lookup_by_id(registry):
+    registry.add(verification_id(JANE), JANE, "Classic Elegance", output_hash(b"pdf"), "Jane.pdf")
+    registry.add(verification_id(ALI), ALI, "Classic Elegance", output_hash(b"other"), "Ali.pdf")
+    [entry] = registry.lookup(verification_id(JANE))
+    assert (entry.cert_id, entry.name, entry.course, entry.date) == (
+        verification_id(JANE), "Jane Doe", "Python 101", "2024-05-01")
+    assert (entry.template, entry.output_hash, entry.output) == (
+        "Classic Elegance", output_hash(b"pdf"), "Jane.pdf")
+    assert entry.issued_at
+    assert registry.lookup("0000-0000-0000") == []
+
+
+def test_find_by_name(registry):
+    registry.add(verification_id(JANE), JANE, "Classic Elegance", "h1")
+    registry.add(verification_id(ALI), ALI, "Classic Elegance", "h2")
+    other_course = JANE._replace(course="Data 201")
+    registry.add(verification_id(other_course), other_course, "Classic Elegance", "h3")
+    assert [entry.course for entry in registry.find_by_name("Jane Doe")] == ["Python 101", "Data 201"]
+    assert registry.find_by_name("Nobody") == []
+
+
+def test_reissued_id_keeps_every_issue_in_order(registry):
+    cert_id = verification_id(JANE)
+    registry.add(cert_id, JANE, "Classic Elegance", "first", "run1/Certificate_Jane_Doe.pdf")
+    registry.add(cert_id, JANE, "Modern Professional", "second", "run2/Certificate_Jane_Doe.pdf")
+    entries = registry.lookup(cert_id)
+    assert [(entry.template, entry.output_hash) for entry in entries] == [
+        ("Classic Elegance", "first"), ("Modern Professional", "second")]
+
+
+def test_entries_are_buffered_until_a_batch_fills(tmp_path):
+    path = str(tmp_path / "registry.db")
+    with VerificationRegistry(path, batch_size=2) as writer, VerificationRegistry(path) as reader:
+        writer.add(verification_id(JANE), JANE, "Classic Elegance", "h1")
+        assert reader.lookup(verification_id(JANE)) == []
+        writer.add(verification_id(ALI), ALI, "Classic Elegance", "h2")
+        assert len(reader.lookup(verification_id(JANE))) == 1
+
+
+def test_reopening_a_database_keeps_its_entries(tmp_path):
+    path = str(tmp_path / "nested" / "registry.db")
+    with VerificationRegistry(path) as registry:
+        registry.add(verification_id(JANE), JANE, "Classic Elegance", "h1")
+    with VerificationRegistry(path) as registry:
+        assert [entry.name for entry in registry.lookup(verification_id(JANE))] == ["Jane Doe"]
+        registry.add(verification_id(ALI), ALI, "Classic Elegance", "h2")
+    with VerificationRegistry(path) as registry:
+        assert len(registry.find_by_name("Ali Khan")) == 1
+        assert len(registry.find_by_name("Jane Doe")) == 1
+
+
+def test_default_path_follows_the_environment(monkeypatch, tmp_path):
+    monkeypatch.setenv("ACCREDIFY_REGISTRY", str(tmp_path / "custom.db"))
+    assert default_registry_path() == str(tmp_path / "custom.db")
+    monkeypatch.delenv("ACCREDIFY_REGISTRY")
+    assert default_registry_path().endswith("registry.db")
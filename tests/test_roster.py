@@ -0,0 +1,21 @@
+from accredify.roster import missing_columns, open_roster
+
+
+def test_csv_extension_is_matched_ignoring_case(tmp_path):
+    path = tmp_path / "ROSTER.CSV"
+    path.write_text('Name,Course,Date\n jane  doe ,Python 101,"May 1, 2024"\n', encoding="utf-8")
+    roster = open_roster(str(path))
+    assert missing_columns(roster) == []
+    [record] = list(roster)
+    assert (record.name, record.course, record.date) == ("jane doe", "Python 101", "2024-05-01")
+    assert record.filename == "Certificate_jane_doe.pdf"
+
+
+def test_rows_stream_in_order_across_chunks(tmp_path):
+    path = tmp_path / "roster.csv"
+    path.write_text("Name,Course,Date,Description\n"
+                    + "".join(f"Person {i},Course,2024-05-01,\n" for i in range(7))
+                    + "Person 0,Course,2024-05-01,\n", encoding="utf-8")
+    records = list(open_roster(str(path), chunksize=3))
+    assert [record.name for record in records] == [f"Person {i}" for i in range(7)] + ["Person 0"]
+    assert records[-1].filename == "Certificate_Person_0_2.pdf"
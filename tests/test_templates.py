@@ -0,0 +1,25 @@
+import pypdfium2
+import pytest
+from PIL import Image
+
+from accredify import CertificateRecord, RenderAssets, render_certificate
+
+
+JANE = CertificateRecord(name="Jane Doe", course="Python 101", date="2024-05-01")
+
+
+@pytest.mark.parametrize("description, colour", [("", (44, 62, 80)), ("With honours", (85, 85, 85))])
+def test_classic_captions_take_the_date_colour(tmp_path, description, colour):
+    logo = tmp_path / "logo.png"
+    Image.new("RGB", (60, 40), (200, 160, 40)).save(logo)
+    pdf = render_certificate(JANE._replace(description=description), template="Classic Elegance",
+                             assets=RenderAssets(logo_path=str(logo)))
+    page = pypdfium2.PdfDocument(pdf)[0]
+    scale = 4
+    image = page.render(scale=scale).to_pil().convert("RGB")
+    # "Official Seal", drawn 25pt below the logo area at y = height - 550
+    top = page.get_height() - 31
+    caption = image.crop((100 * scale, round(top * scale), 170 * scale, round((top + 13) * scale)))
+    dark = [(count, pixel) for count, pixel in caption.getcolors(caption.width * caption.height)
+            if sum(pixel) < 300]
+    assert max(dark)[1] == colour